@@ -1,6 +1,7 @@
 from flask import Flask
 from .config import config
-from . import extensions, api, models
+from . import extensions, api, models, commands
+from .services import tempos, metricas
 
 def create_app(config_name='default'):
     """
@@ -21,6 +22,15 @@ def create_app(config_name='default'):
     # Registrar blueprints
     api.init_app(app)
     
+    # Registrar comandos da CLI
+    commands.init_app(app)
+    
+    # Medição das fases de cada requisição (Server-Timing), se ligada
+    tempos.init_app(app, extensions.db)
+    
+    # Endpoint /metrics do Prometheus, se ligado
+    metricas.init_app(app, extensions.db)
+    
     # Configurar tratamento de erros
     configure_error_handlers(app)
     
@@ -1,18 +1,34 @@
 from flask import Blueprint
 from flask_restful import Api
+from flask_restful.representations.json import output_json
+from ..services.tempos import medir
 from .resources import (
     ImovelResource,
     ImoveisResource,
+    ImoveisBatchResource,
+    ImovelBuscaResource,
+    ImovelEstatisticasResource,
     ImovelTipoResource,
-    ImovelCidadeResource
+    ImovelCidadeResource,
+    CacheResource,
+    PoolResource
 )
 
 # Criar um Blueprint para a API
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 api = Api(api_bp)
 
+@api.representation('application/json')
+def output_json_medido(data, code, headers=None):
+    """Codificação JSON padrão do Flask-RESTful, medida na fase json."""
+    with medir('json'):
+        return output_json(data, code, headers)
+
 # Registrar os endpoints
 api.add_resource(ImoveisResource, '/imoveis', endpoint='list_imoveis')
+api.add_resource(ImoveisBatchResource, '/imoveis/batch', endpoint='create_imoveis_batch')
+api.add_resource(ImovelBuscaResource, '/imoveis/busca', endpoint='search_imoveis')
+api.add_resource(ImovelEstatisticasResource, '/imoveis/estatisticas', endpoint='stats_imoveis')
 api.add_resource(ImovelResource, '/imoveis/<int:id>', 
                  endpoint='get_imovel',
                  resource_class_kwargs={'endpoint': 'get_imovel'})
@@ -24,6 +40,8 @@ api.add_resource(ImovelResource, '/imoveis/<int:id>',
                  resource_class_kwargs={'endpoint': 'delete_imovel'})
 api.add_resource(ImovelTipoResource, '/imoveis/tipo/<string:tipo>', endpoint='list_imoveis_by_tipo')
 api.add_resource(ImovelCidadeResource, '/imoveis/cidade/<string:cidade>', endpoint='list_imoveis_by_cidade')
+api.add_resource(CacheResource, '/cache', endpoint='cache_stats')
+api.add_resource(PoolResource, '/pool', endpoint='pool_stats')
 
 def init_app(app):
     """Inicializa a API com a aplicação Flask."""
@@ -1,13 +1,23 @@
 from .imoveis import (
     ImovelResource,
     ImoveisResource,
+    ImoveisBatchResource,
+    ImovelBuscaResource,
+    ImovelEstatisticasResource,
     ImovelTipoResource,
     ImovelCidadeResource
 )
+from .cache import CacheResource
+from .pool import PoolResource
 
 __all__ = [
     'ImovelResource',
     'ImoveisResource',
+    'ImoveisBatchResource',
+    'ImovelBuscaResource',
+    'ImovelEstatisticasResource',
     'ImovelTipoResource',
-    'ImovelCidadeResource'
+    'ImovelCidadeResource',
+    'CacheResource',
+    'PoolResource'
 ]
@@ -0,0 +1,9 @@
+from flask_restful import Resource
+from ...extensions import response_cache
+
+class CacheResource(Resource):
+    """Recurso com as estatísticas do cache de respostas."""
+    
+    def get(self):
+        """Obter os contadores de acertos e falhas do cache deste worker."""
+        return response_cache.stats(), 200
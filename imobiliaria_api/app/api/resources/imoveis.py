@@ -1,36 +1,364 @@
-from flask import request, current_app
+import functools
+import json
+from flask import request, current_app, abort, url_for
 from flask_restful import Resource
 from marshmallow import ValidationError
-from ...extensions import db
+from sqlalchemy import select
+from ...extensions import db, response_cache
 from ...models.imovel import Imovel
+from ...services.versionamento import versao_tabela, versao_imovel, registrar_alteracao
+from ...services.imoveis import inserir_em_lote, atualizar_em_lote, remover_em_lote
+from ...services.busca import montar_consulta_fts, consulta_busca
+from ...services.estatisticas import AGRUPAMENTOS, estatisticas_valor
+from ...services.tempos import medir
 from ..schemas.imovel_schema import ImovelSchema
+from ..schemas.row_serializer import RowSerializer
 from ..utils.hypermedia import HypermediaBuilder
+from ..utils.pagination import parse_pagination_args, paginate_query, extra_query_args
+from ..utils.streaming import parse_stream_mode, iter_partitions, stream_response, NDJSON_MIMETYPE
+from ..utils.etag import make_etag, not_modified, etag_headers
+from ..utils.filters import parse_filters, parse_ids, parse_group_by
+from ..utils.routing import read_replica
+from ..utils.fieldsets import parse_fields
 
 # Instanciar schemas
 imovel_schema = ImovelSchema()
 imoveis_schema = ImovelSchema(many=True)
+imovel_batch_schema = ImovelSchema(load_instance=False)
+imovel_patch_schema = ImovelSchema(load_instance=False, partial=True)
+
+# Serializador compilado para as coleções (mesma saída do imoveis_schema)
+imoveis_row_serializer = RowSerializer(imovel_schema, Imovel)
+
+@functools.lru_cache(maxsize=128)
+def sparse_serializer(campos):
+    """
+    Serializador compilado para um conjunto de campos pedido em ?fields=.
+    
+    O schema (``only=campos``) e o serializador são montados uma única vez
+    por conjunto de campos.
+    
+    Args:
+        campos (tuple): Campos de saída, em ordem alfabética (ver parse_fields)
+        
+    Returns:
+        RowSerializer: Serializador que seleciona apenas as colunas dos campos
+    """
+    return RowSerializer(ImovelSchema(only=campos), Imovel)
+
+def parse_projection():
+    """
+    Lê os campos (?fields=) e o modo de links (?links=) das coleções.
+    
+    Returns:
+        tuple: (RowSerializer, modo de links dos itens)
+        
+    Raises:
+        ValidationError: Se algum campo ou o modo de links for inválido
+    """
+    campos = parse_fields(imovel_schema)
+    modo_links = HypermediaBuilder.parse_links_mode()
+    if campos is None:
+        return imoveis_row_serializer, modo_links
+    # Sem _links entre os campos pedidos, os itens vêm sem links
+    if '_links' not in campos and modo_links == 'full':
+        modo_links = 'none'
+    return sparse_serializer(campos), modo_links
+
+# Acima desta quantidade de imóveis, escritas em lote limpam o cache inteiro
+BULK_INVALIDATION_LIMIT = 1000
+
+def cache_groups(*imoveis):
+    """
+    Grupos do cache afetados pela escrita de imóveis.
+    
+    Args:
+        *imoveis (dict): Estados do imóvel (antes e/ou depois da escrita)
+        
+    Returns:
+        list: A coleção completa e os grupos de cada ID, tipo e cidade
+    """
+    grupos = ['imoveis']
+    for imovel in imoveis:
+        grupos += [f"imovel:{imovel['id']}", f"tipo:{imovel['tipo']}", f"cidade:{imovel['cidade']}"]
+    return grupos
+
+def invalidate_bulk(estados, dados=None):
+    """
+    Invalida o cache após uma escrita em lote.
+    
+    Args:
+        estados (list): Estados anteriores dos imóveis alterados
+        dados (dict, optional): Campos alterados (para os novos grupos de tipo/cidade)
+    """
+    if len(estados) > BULK_INVALIDATION_LIMIT:
+        # Muitos grupos: limpar tudo é mais barato que invalidar um a um
+        response_cache.clear()
+        return
+    novos = [dict(estado, **{k: v for k, v in (dados or {}).items() if k in ('tipo', 'cidade')})
+             for estado in estados]
+    response_cache.invalidate(*cache_groups(*estados, *novos))
+
+def cache_state(imovel):
+    """Campos do imóvel que definem seus grupos no cache."""
+    return {'id': imovel.id, 'tipo': imovel.tipo, 'cidade': imovel.cidade}
+
+def collection_body(rows, modo_links, links, serializer=imoveis_row_serializer):
+    """
+    Serializa as linhas de uma página e monta o corpo da coleção.
+    
+    Args:
+        rows (list): Linhas com as colunas do serializador compilado
+        modo_links (str): Modo do parâmetro ?links=
+        links (dict): Links próprios da coleção
+        serializer (RowSerializer): Serializador das linhas (ver parse_projection)
+        
+    Returns:
+        dict: Coleção com itens, contagem e links HATEOAS
+    """
+    with medir('dump'):
+        result = serializer.dump_many(rows)
+    
+    # Adicionar links HATEOAS para cada imóvel
+    if modo_links == 'full':
+        with medir('links'):
+            for item in result:
+                item = HypermediaBuilder.add_links(item, item['id'], 'imoveis')
+    
+    collection = {
+        "count": len(result),
+        "items": result,
+        "_links": links
+    }
+    
+    # Links dos itens como um único bloco de modelos
+    if modo_links == 'collection':
+        with medir('links'):
+            HypermediaBuilder.add_templates(collection)
+    
+    return collection
+
+def build_collection(criteria, endpoint, links, **url_args):
+    """
+    Monta a resposta paginada de uma coleção de imóveis.
+    
+    A consulta seleciona apenas as colunas do schema (ou as pedidas em
+    ?fields=) e as linhas são convertidas pelo serializador compilado, sem
+    instanciar o ORM nem passar pelo marshmallow.
+    
+    Args:
+        criteria (list): Condições de filtro da coleção
+        endpoint (str): Endpoint da coleção (usado nos links de paginação)
+        links (dict): Links próprios da coleção ('self', 'create', 'all'...)
+        **url_args: Argumentos de rota do endpoint
+        
+    Returns:
+        dict: Coleção com itens, contagem e links HATEOAS
+        
+    Raises:
+        ValidationError: Se os parâmetros de paginação ou de links forem inválidos
+    """
+    paginacao = parse_pagination_args()
+    serializer, modo_links = parse_projection()
+    stmt = select(*serializer.columns).where(*criteria)
+    pagina = paginate_query(stmt, Imovel.id, paginacao)
+    return finish_collection(pagina, paginacao, serializer, modo_links, links, endpoint, **url_args)
+
+def finish_collection(pagina, paginacao, serializer, modo_links, links, endpoint, **url_args):
+    """
+    Monta o corpo de uma coleção a partir da página já lida do banco.
+    
+    Args:
+        pagina (Pagina): Linhas e indicadores de navegação (ver paginate_query)
+        paginacao (Paginacao): Parâmetros de paginação
+        serializer (RowSerializer): Serializador das linhas (ver parse_projection)
+        modo_links (str): Modo do parâmetro ?links=
+        links (dict): Links próprios da coleção
+        endpoint (str): Endpoint da coleção (usado nos links de paginação)
+        **url_args: Argumentos de rota do endpoint
+        
+    Returns:
+        dict: Coleção com itens, contagem e links HATEOAS
+    """
+    collection = collection_body(pagina.items, modo_links, links, serializer)
+    result = collection['items']
+    
+    # Adicionar links de paginação preservando filtros da query string
+    params = dict(extra_query_args(), **url_args)
+    if paginacao.modo == 'offset':
+        collection.update(total=pagina.total, page=paginacao.page, per_page=paginacao.limit)
+        HypermediaBuilder.add_pagination_links(
+            collection, endpoint, paginacao.page, paginacao.limit, pagina.total, **params)
+    else:
+        HypermediaBuilder.add_cursor_links(
+            collection, endpoint, paginacao.limit,
+            next_after=result[-1]['id'] if result and pagina.has_next else None,
+            prev_before=result[0]['id'] if result and pagina.has_prev else None,
+            **params)
+    
+    return collection
+
+def stream_collection(criteria, links, modo):
+    """
+    Envia a coleção completa em streaming, lendo as linhas em lotes.
+    
+    A paginação não se aplica (apenas ``after``, para retomar a leitura).
+    
+    Args:
+        criteria (list): Condições de filtro da coleção
+        links (dict): Links próprios da coleção
+        modo (str): 'ndjson' ou 'json'
+        
+    Returns:
+        Response: Resposta em streaming
+    """
+    paginacao = parse_pagination_args()
+    serializer, modo_links = parse_projection()
+    
+    stmt = select(*serializer.columns).where(*criteria)
+    if paginacao.after is not None:
+        stmt = stmt.where(Imovel.id > paginacao.after)
+    stmt = stmt.order_by(Imovel.id)
+    
+    def serialize(rows):
+        items = serializer.dump_many(rows)
+        if modo_links == 'full':
+            for item in items:
+                HypermediaBuilder.add_links(item, item['id'], 'imoveis')
+        return items
+    
+    envelope = {"_links": links}
+    if modo_links == 'collection':
+        HypermediaBuilder.add_templates(envelope)
+    
+    partitions = iter_partitions(stmt, current_app.config['API_STREAM_CHUNK_SIZE'])
+    return stream_response(partitions, serialize, modo, envelope)
+
+def build_search(consulta, criteria, links):
+    """
+    Monta a resposta paginada de uma busca por endereço.
+    
+    Os resultados são ordenados por relevância (bm25), por isso a busca é
+    paginada por página (``?page=&per_page=``); ``?limit=`` define o
+    tamanho da primeira página.
+    
+    Args:
+        consulta (str): Consulta FTS5 (ver montar_consulta_fts)
+        criteria (list): Filtros adicionais da query string
+        links (dict): Links próprios da coleção
+        
+    Returns:
+        dict: Coleção com itens, total e links HATEOAS
+        
+    Raises:
+        ValidationError: Se os parâmetros de paginação ou de links forem inválidos
+    """
+    paginacao = parse_pagination_args()
+    if paginacao.modo == 'cursor':
+        if paginacao.after is not None or paginacao.before is not None:
+            raise ValidationError({'after': ['A busca é paginada por página: use page e per_page.']})
+        paginacao = paginacao._replace(modo='offset', page=1)
+    serializer, modo_links = parse_projection()
+    
+    stmt, relevancia = consulta_busca(serializer.columns, consulta, criteria)
+    pagina = paginate_query(stmt, Imovel.id, paginacao, order_by=(relevancia, Imovel.id))
+    
+    collection = collection_body(pagina.items, modo_links, links, serializer)
+    collection.update(total=pagina.total, page=paginacao.page, per_page=paginacao.limit)
+    HypermediaBuilder.add_pagination_links(
+        collection, 'api.search_imoveis', paginacao.page, paginacao.limit, pagina.total,
+        **extra_query_args())
+    return collection
+
+def list_response(criteria, endpoint, links, cache_group, **url_args):
+    """
+    Responde a um GET de coleção, paginado ou em streaming.
+    
+    Args:
+        criteria (list): Condições de filtro da coleção
+        endpoint (str): Endpoint da coleção
+        links (dict): Links próprios da coleção
+        cache_group (str): Grupo do cache da coleção ('imoveis', 'tipo:casa'...)
+        **url_args: Argumentos de rota do endpoint
+        
+    Returns:
+        tuple | Response: Resposta do recurso
+    """
+    # Responder 304 antes de consultar a tabela, se nada mudou
+    etag = make_etag('imoveis', versao_tabela())
+    response = not_modified(etag)
+    if response is not None:
+        return response
+    
+    try:
+        criteria = list(criteria) + parse_filters()
+        modo_stream = parse_stream_mode()
+        if modo_stream:
+            response = stream_collection(criteria, links, modo_stream)
+            response.set_etag(etag)
+            return response
+        return response_cache.cached(
+            cache_group,
+            lambda: (build_collection(criteria, endpoint, links, **url_args), 200),
+            etag_headers(etag))
+    except ValidationError as err:
+        return {"message": "Erro de validação", "errors": err.messages}, 400
 
 class ImovelResource(Resource):
     """Recurso para operações em um imóvel específico."""
     
+    # Leituras em uma réplica; escritas no banco principal
+    method_decorators = {'get': [read_replica]}
+    
     def __init__(self, **kwargs):
         """Inicializa o recurso com parâmetros opcionais."""
         self.endpoint = kwargs.get('endpoint', None)
     
     def get(self, id):
         """Obter um imóvel pelo ID."""
-        imovel = Imovel.query.get_or_404(id)
-        result = imovel_schema.dump(imovel)
+        # Responder 304 antes de carregar o imóvel, se nada mudou
+        versao = versao_imovel(id)
+        if versao is None:
+            abort(404)
+        etag = make_etag('imovel', id, versao)
+        response = not_modified(etag)
+        if response is not None:
+            return response
         
-        # Adicionar links HATEOAS
-        result = HypermediaBuilder.add_links(result, id, 'imoveis')
+        try:
+            campos = parse_fields(imovel_schema)
+        except ValidationError as err:
+            return {"message": "Erro de validação", "errors": err.messages}, 400
+        
+        def build():
+            if campos is None:
+                imovel = Imovel.query.get_or_404(id)
+                with medir('dump'):
+                    result = imovel_schema.dump(imovel)
+            else:
+                # Apenas as colunas dos campos pedidos
+                serializer = sparse_serializer(campos)
+                row = db.session.execute(
+                    select(*serializer.columns).where(Imovel.id == id)).first()
+                if row is None:
+                    abort(404)
+                with medir('dump'):
+                    result = serializer.dump(row)
+            
+            # Adicionar links HATEOAS
+            if campos is None or '_links' in campos:
+                with medir('links'):
+                    result = HypermediaBuilder.add_links(result, id, 'imoveis')
+            
+            return result, 200
         
-        return result, 200
+        return response_cache.cached(f'imovel:{id}', build, etag_headers(etag))
     
     def put(self, id):
         """Atualizar um imóvel existente."""
         imovel = Imovel.query.get_or_404(id)
         json_data = request.get_json() or {}
+        antes = cache_state(imovel)
         
         try:
             # Validar dados com marshmallow
@@ -38,12 +366,16 @@ class ImovelResource(Resource):
             
             # Salvar imóvel atualizado
             db.session.add(data)
+            registrar_alteracao(data)
             db.session.commit()
+            response_cache.invalidate(*cache_groups(antes, cache_state(data)))
             
-            result = imovel_schema.dump(data)
+            with medir('dump'):
+                result = imovel_schema.dump(data)
             
             # Adicionar links HATEOAS
-            result = HypermediaBuilder.add_links(result, id, 'imoveis')
+            with medir('links'):
+                result = HypermediaBuilder.add_links(result, id, 'imoveis')
             
             return result, 200
             
@@ -54,40 +386,35 @@ class ImovelResource(Resource):
         """Remover um imóvel."""
         imovel = Imovel.query.get_or_404(id)
         
+        antes = cache_state(imovel)
+        
         db.session.delete(imovel)
+        registrar_alteracao()
         db.session.commit()
+        response_cache.invalidate(*cache_groups(antes))
         
         return "", 204
 
 class ImoveisResource(Resource):
     """Recurso para operações na coleção de imóveis."""
     
+    # Leituras em uma réplica; escritas no banco principal
+    method_decorators = {'get': [read_replica]}
+    
     def get(self):
-        """Listar todos os imóveis."""
-        imoveis = Imovel.query.all()
-        result = imoveis_schema.dump(imoveis)
-        
-        # Adicionar links HATEOAS para cada imóvel
-        for item in result:
-            item = HypermediaBuilder.add_links(item, item['id'], 'imoveis')
-        
-        # Adicionar links para a coleção
-        collection = {
-            "count": len(result),
-            "items": result,
-            "_links": {
-                "self": {
-                    "href": request.url,
-                    "method": "GET"
-                },
-                "create": {
-                    "href": request.url,
-                    "method": "POST"
-                }
+        """Listar os imóveis, paginados por cursor ou em streaming."""
+        links = {
+            "self": {
+                "href": request.url,
+                "method": "GET"
+            },
+            "create": {
+                "href": request.url,
+                "method": "POST"
             }
         }
         
-        return collection, 200
+        return list_response([], 'api.list_imoveis', links, 'imoveis')
     
     def post(self):
         """Criar um novo imóvel."""
@@ -99,74 +426,310 @@ class ImoveisResource(Resource):
             
             # Salvar novo imóvel
             db.session.add(imovel)
+            registrar_alteracao(imovel)
             db.session.commit()
+            response_cache.invalidate(*cache_groups(cache_state(imovel)))
             
-            result = imovel_schema.dump(imovel)
+            with medir('dump'):
+                result = imovel_schema.dump(imovel)
             
             # Adicionar links HATEOAS
-            result = HypermediaBuilder.add_links(result, imovel.id, 'imoveis')
+            with medir('links'):
+                result = HypermediaBuilder.add_links(result, imovel.id, 'imoveis')
             
             return result, 201
             
         except ValidationError as err:
             return {"message": "Erro de validação", "errors": err.messages}, 400
 
-class ImovelTipoResource(Resource):
-    """Recurso para filtrar imóveis por tipo."""
+    def _bulk_criteria(self, json_data):
+        """
+        Condições de uma escrita em lote: IDs e/ou filtros da query string.
+        
+        Raises:
+            ValidationError: Se nenhum ID nem filtro for informado
+        """
+        maximo = current_app.config['API_BATCH_MAX_ITEMS']
+        criteria = parse_filters()
+        ids = json_data.get('ids', request.args.get('ids'))
+        if ids is not None:
+            criteria.append(Imovel.id.in_(parse_ids(ids, maximo)))
+        if not criteria:
+            raise ValidationError({'_schema': ['Informe uma lista de IDs ou ao menos um filtro.']})
+        return criteria
     
-    def get(self, tipo):
-        """Listar imóveis por tipo."""
-        imoveis = Imovel.query.filter_by(tipo=tipo).all()
-        result = imoveis_schema.dump(imoveis)
-        
-        # Adicionar links HATEOAS para cada imóvel
-        for item in result:
-            item = HypermediaBuilder.add_links(item, item['id'], 'imoveis')
-        
-        # Adicionar links para a coleção
-        collection = {
-            "count": len(result),
-            "items": result,
+    def _bulk_result(self, count):
+        """Resposta das escritas em lote."""
+        return {
+            "count": count,
+            "_links": {
+                "collection": {
+                    "href": url_for('api.list_imoveis', _external=True),
+                    "method": "GET"
+                }
+            }
+        }, 200
+    
+    def patch(self):
+        """
+        Atualizar vários imóveis de uma vez.
+        
+        O corpo traz os campos em ``dados`` e, opcionalmente, ``ids``; os
+        imóveis também podem ser escolhidos pelos filtros da listagem.
+        """
+        json_data = request.get_json(silent=True)
+        if not isinstance(json_data, dict):
+            json_data = {}
+        
+        try:
+            criteria = self._bulk_criteria(json_data)
+            dados = imovel_patch_schema.load(json_data.get('dados') or {})
+            if not dados:
+                raise ValidationError({'dados': ['Informe ao menos um campo a ser alterado.']})
+        except ValidationError as err:
+            return {"message": "Erro de validação", "errors": err.messages}, 400
+        
+        count, estados = atualizar_em_lote(criteria, dados)
+        db.session.commit()
+        invalidate_bulk(estados, dados)
+        
+        return self._bulk_result(count)
+    
+    def delete(self):
+        """Remover vários imóveis de uma vez, por IDs ou pelos filtros da listagem."""
+        json_data = request.get_json(silent=True)
+        if not isinstance(json_data, dict):
+            json_data = {}
+        
+        try:
+            criteria = self._bulk_criteria(json_data)
+        except ValidationError as err:
+            return {"message": "Erro de validação", "errors": err.messages}, 400
+        
+        count, estados = remover_em_lote(criteria)
+        db.session.commit()
+        invalidate_bulk(estados)
+        
+        return self._bulk_result(count)
+
+class ImoveisBatchResource(Resource):
+    """Recurso para criar vários imóveis em uma única requisição."""
+    
+    MODOS = ('atomico', 'parcial')
+    
+    @staticmethod
+    def _read_items():
+        """
+        Lê os itens do corpo: lista JSON, objeto com 'items' ou NDJSON.
+        
+        Returns:
+            tuple: (lista de itens, dict de erros de leitura por índice)
+        """
+        if request.mimetype == NDJSON_MIMETYPE:
+            items, errors = [], {}
+            linhas = [linha for linha in request.get_data(as_text=True).splitlines() if linha.strip()]
+            for index, linha in enumerate(linhas):
+                try:
+                    items.append(json.loads(linha))
+                except ValueError:
+                    items.append(None)
+                    errors[index] = {'_schema': ['JSON inválido.']}
+            return items, errors
+        
+        json_data = request.get_json(silent=True)
+        if isinstance(json_data, dict):
+            json_data = json_data.get('items')
+        if not isinstance(json_data, list):
+            raise ValidationError({'_schema': ['Envie uma lista de imóveis ou NDJSON.']})
+        return json_data, {}
+    
+    def post(self):
+        """
+        Criar vários imóveis de uma vez.
+        
+        No modo ``atomico`` (padrão) nada é gravado se algum item for
+        inválido; no modo ``parcial`` os itens válidos são gravados e os
+        erros são informados por índice.
+        """
+        modo = request.args.get('modo', 'atomico')
+        
+        try:
+            if modo not in self.MODOS:
+                raise ValidationError({'modo': [f"Deve ser um de: {', '.join(self.MODOS)}."]})
+            items, errors = self._read_items()
+            if not items:
+                raise ValidationError({'_schema': ['A lista de imóveis está vazia.']})
+            maximo = current_app.config['API_BATCH_MAX_ITEMS']
+            if len(items) > maximo:
+                raise ValidationError({'_schema': [f'O lote deve ter no máximo {maximo} imóveis.']})
+        except ValidationError as err:
+            return {"message": "Erro de validação", "errors": err.messages}, 400
+        
+        # Validar cada item com o mesmo schema do POST unitário
+        validos, indices = [], []
+        for index, item in enumerate(items):
+            if index in errors:
+                continue
+            try:
+                if not isinstance(item, dict):
+                    raise ValidationError({'_schema': ['Cada item deve ser um objeto.']})
+                validos.append(imovel_batch_schema.load(item))
+                indices.append(index)
+            except ValidationError as err:
+                errors[index] = err.messages
+        
+        if errors and (modo == 'atomico' or not validos):
+            return {"message": "Erro de validação", "errors": errors}, 400
+        
+        # Gravar todos os itens válidos em uma única transação
+        ids = inserir_em_lote(validos)
+        db.session.commit()
+        response_cache.invalidate(*cache_groups(*(
+            {'id': id, 'tipo': item.get('tipo'), 'cidade': item.get('cidade')}
+            for id, item in zip(ids, validos)
+        )))
+        
+        templates = HypermediaBuilder.link_templates()
+        href, method = templates['self']
+        created = [
+            {"index": index, "id": id,
+             "_links": {"self": {"href": href.replace('{id}', str(id)), "method": method}}}
+            for index, id in zip(indices, ids)
+        ]
+        
+        return {
+            "count": len(created),
+            "created": created,
+            "errors": errors,
             "_links": {
                 "self": {
                     "href": request.url,
-                    "method": "GET"
+                    "method": "POST"
                 },
-                "all": {
-                    "href": request.url_root + "api/imoveis",
+                "collection": {
+                    "href": url_for('api.list_imoveis', _external=True),
                     "method": "GET"
                 }
             }
+        }, 201
+
+class ImovelBuscaResource(Resource):
+    """Recurso para a busca de imóveis por endereço."""
+    
+    method_decorators = {'get': [read_replica]}
+    
+    def get(self):
+        """Buscar imóveis por endereço (?q=), ordenados por relevância."""
+        if db.session.get_bind().dialect.name != 'sqlite':
+            return {"message": "Busca por endereço indisponível neste banco de dados"}, 501
+        
+        # A busca depende de todos os imóveis: mesmo ETag e grupo da coleção
+        etag = make_etag('imoveis', versao_tabela())
+        response = not_modified(etag)
+        if response is not None:
+            return response
+        
+        links = {
+            "self": {
+                "href": request.url,
+                "method": "GET"
+            },
+            "all": {
+                "href": request.url_root + "api/imoveis",
+                "method": "GET"
+            }
+        }
+        
+        try:
+            consulta = montar_consulta_fts(request.args.get('q'))
+            if consulta is None:
+                raise ValidationError({'q': ['Informe ao menos uma palavra para a busca.']})
+            criteria = parse_filters()
+            return response_cache.cached(
+                'imoveis',
+                lambda: (build_search(consulta, criteria, links), 200),
+                etag_headers(etag))
+        except ValidationError as err:
+            return {"message": "Erro de validação", "errors": err.messages}, 400
+
+class ImovelEstatisticasResource(Resource):
+    """Recurso para as estatísticas de valor dos imóveis."""
+    
+    method_decorators = {'get': [read_replica]}
+    
+    def get(self):
+        """Quantidade, soma, mínimo, máximo e média de valor (?agrupar=cidade,tipo)."""
+        # As estatísticas mudam com qualquer escrita: mesmo ETag e grupo da coleção
+        etag = make_etag('imoveis', versao_tabela())
+        response = not_modified(etag)
+        if response is not None:
+            return response
+        
+        try:
+            agrupar = parse_group_by(AGRUPAMENTOS)
+        except ValidationError as err:
+            return {"message": "Erro de validação", "errors": err.messages}, 400
+        # Apenas os filtros por cidade e tipo são atendidos pelo resumo
+        filtros = {nome: request.args[nome] for nome in AGRUPAMENTOS if nome in request.args}
+        
+        def build():
+            items = estatisticas_valor(agrupar, filtros)
+            return {
+                "agrupar": agrupar,
+                "count": len(items),
+                "items": items,
+                "_links": {
+                    "self": {
+                        "href": request.url,
+                        "method": "GET"
+                    },
+                    "all": {
+                        "href": request.url_root + "api/imoveis",
+                        "method": "GET"
+                    }
+                }
+            }, 200
+        
+        return response_cache.cached('imoveis', build, etag_headers(etag))
+
+class ImovelTipoResource(Resource):
+    """Recurso para filtrar imóveis por tipo."""
+    
+    method_decorators = {'get': [read_replica]}
+    
+    def get(self, tipo):
+        """Listar imóveis por tipo, paginados por cursor ou em streaming."""
+        links = {
+            "self": {
+                "href": request.url,
+                "method": "GET"
+            },
+            "all": {
+                "href": request.url_root + "api/imoveis",
+                "method": "GET"
+            }
         }
         
-        return collection, 200
+        return list_response([Imovel.tipo == tipo], 'api.list_imoveis_by_tipo', links,
+                             f'tipo:{tipo}', tipo=tipo)
 
 class ImovelCidadeResource(Resource):
     """Recurso para filtrar imóveis por cidade."""
     
+    method_decorators = {'get': [read_replica]}
+    
     def get(self, cidade):
-        """Listar imóveis por cidade."""
-        imoveis = Imovel.query.filter_by(cidade=cidade).all()
-        result = imoveis_schema.dump(imoveis)
-        
-        # Adicionar links HATEOAS para cada imóvel
-        for item in result:
-            item = HypermediaBuilder.add_links(item, item['id'], 'imoveis')
-        
-        # Adicionar links para a coleção
-        collection = {
-            "count": len(result),
-            "items": result,
-            "_links": {
-                "self": {
-                    "href": request.url,
-                    "method": "GET"
-                },
-                "all": {
-                    "href": request.url_root + "api/imoveis",
-                    "method": "GET"
-                }
+        """Listar imóveis por cidade, paginados por cursor ou em streaming."""
+        links = {
+            "self": {
+                "href": request.url,
+                "method": "GET"
+            },
+            "all": {
+                "href": request.url_root + "api/imoveis",
+                "method": "GET"
             }
         }
         
-        return collection, 200 
\ No newline at end of file
+        return list_response([Imovel.cidade == cidade], 'api.list_imoveis_by_cidade', links,
+                             f'cidade:{cidade}', cidade=cidade)
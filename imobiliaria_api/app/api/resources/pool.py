@@ -0,0 +1,17 @@
+from flask_restful import Resource
+from ...extensions import db, replicas
+from ...services.pool import pool_stats
+
+class PoolResource(Resource):
+    """Recurso com as estatísticas do pool de conexões."""
+    
+    def get(self):
+        """Obter a ocupação e os tempos de espera do pool deste worker."""
+        stats = {
+            bind or 'default': pool_stats(engine)
+            for bind, engine in db.engines.items()
+        }
+        # Saúde e leituras de cada réplica
+        for replica in replicas.info():
+            stats[replica.pop('bind')].update(replica)
+        return stats, 200
@@ -1,3 +1,4 @@
 from .imovel_schema import ImovelSchema
+from .row_serializer import RowSerializer
 
-__all__ = ['ImovelSchema']
+__all__ = ['ImovelSchema', 'RowSerializer']
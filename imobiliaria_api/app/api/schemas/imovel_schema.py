@@ -8,6 +8,8 @@ class ImovelSchema(ma.SQLAlchemyAutoSchema):
     class Meta:
         model = Imovel
         load_instance = True
+        # Colunas de controle interno, fora do contrato da API
+        exclude = ('versao', 'cep_digitos')
     
     # Campos explicitamente definidos para adicionar validação
     id = fields.Integer(dump_only=True)
@@ -18,7 +20,7 @@ class ImovelSchema(ma.SQLAlchemyAutoSchema):
     cidade = fields.String(required=True, validate=validate.Length(min=2, max=50))
     cep = fields.String(validate=validate.Length(max=10))
     valor = fields.Float(validate=validate.Range(min=0))
-    data_aquisicao = fields.String(validate=validate.Length(max=10))
+    data_aquisicao = fields.Date()  # AAAA-MM-DD
     
     # Campo para links HATEOAS
     _links = fields.Dict(dump_only=True) 
\ No newline at end of file
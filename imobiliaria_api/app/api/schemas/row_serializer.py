@@ -0,0 +1,66 @@
+from datetime import date
+from marshmallow import fields
+
+# Conversões equivalentes ao _serialize dos campos simples do marshmallow
+_CONVERSOES = {
+    fields.Integer: 'int',
+    fields.Float: 'float',
+    fields.String: 'str',
+    fields.Date: '_isoformat',
+}
+
+
+class RowSerializer:
+    """
+    Serializador de linhas do SQLAlchemy Core gerado a partir de um schema.
+
+    A lista de campos de saída do schema é traduzida, uma única vez, para uma
+    função Python que converte uma tupla de colunas em dict sem passar pelo
+    marshmallow. O resultado é idêntico ao de ``schema.dump`` para os campos
+    que correspondem a colunas do modelo.
+    """
+
+    def __init__(self, schema, model):
+        """
+        Compila o serializador.
+
+        Args:
+            schema (Schema): Instância do schema de referência
+            model (Model): Modelo cujas colunas serão selecionadas
+        """
+        self.columns = []
+        linhas = []
+        namespace = {'_isoformat': date.isoformat}
+
+        for nome, field in schema.dump_fields.items():
+            atributo = field.attribute or nome
+            coluna = getattr(model, atributo, None)
+            if coluna is None or not hasattr(coluna, 'expression'):
+                # Campos sem coluna (ex.: _links) não aparecem no dump
+                continue
+
+            indice = len(self.columns)
+            self.columns.append(coluna)
+            chave = field.data_key or nome
+            conversao = _CONVERSOES.get(type(field))
+            if conversao is None or getattr(field, 'as_string', False) \
+                    or getattr(field, 'format', None) not in (None, 'iso'):
+                # Campos sem conversão conhecida usam o próprio marshmallow
+                namespace[f'_f{indice}'] = field
+                valor = f'_f{indice}._serialize(r[{indice}], {atributo!r}, None)'
+            else:
+                valor = f'{conversao}(r[{indice}])'
+            linhas.append(f'{chave!r}: None if r[{indice}] is None else {valor},')
+
+        codigo = 'def row_to_dict(r):\n    return {\n        %s\n    }\n' % '\n        '.join(linhas)
+        exec(compile(codigo, f'<row_serializer {type(schema).__name__}>', 'exec'), namespace)
+        self._row_to_dict = namespace['row_to_dict']
+
+    def dump(self, row):
+        """Converte uma linha em dict."""
+        return self._row_to_dict(row)
+
+    def dump_many(self, rows):
+        """Converte uma lista de linhas em uma lista de dicts."""
+        row_to_dict = self._row_to_dict
+        return [row_to_dict(row) for row in rows]
@@ -0,0 +1,40 @@
+import hashlib
+from flask import Response, request
+from ...services.cache import chave_representacao
+
+def make_etag(*partes):
+    """
+    Gera um ETag forte para a representação pedida.
+    
+    Além das partes informadas (ex.: versão da tabela), o ETag considera a
+    URL, os parâmetros e o cabeçalho Accept, que também mudam a
+    representação, normalizados como na chave do cache de respostas.
+    
+    Args:
+        *partes: Valores que identificam o estado dos dados
+        
+    Returns:
+        str: ETag sem aspas
+    """
+    chave = '|'.join([*map(str, partes), chave_representacao()])
+    return hashlib.sha1(chave.encode('utf-8')).hexdigest()
+
+def not_modified(etag):
+    """
+    Retorna uma resposta 304 se o cliente já tem a representação atual.
+    
+    Args:
+        etag (str): ETag atual da representação
+        
+    Returns:
+        Response: Resposta 304, ou None se o conteúdo deve ser enviado
+    """
+    if request.if_none_match.contains(etag):
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
+    return None
+
+def etag_headers(etag):
+    """Cabeçalhos a incluir nas respostas com ETag."""
+    return {'ETag': f'"{etag}"'}
@@ -0,0 +1,36 @@
+from flask import request
+from marshmallow import ValidationError
+
+# Campos sempre presentes na resposta (cursores e links dependem do ID)
+CAMPOS_OBRIGATORIOS = ('id',)
+
+
+def parse_fields(schema, args=None):
+    """
+    Lê o parâmetro ?fields= (campos separados por vírgulas).
+
+    Args:
+        schema (Schema): Schema cujos campos de saída podem ser pedidos
+        args (MultiDict, optional): Parâmetros a serem lidos (padrão: request.args)
+
+    Returns:
+        tuple: Campos pedidos mais os obrigatórios, em ordem alfabética, ou
+        None se o parâmetro não foi informado (todos os campos)
+
+    Raises:
+        ValidationError: Se algum campo não existir no schema
+    """
+    if args is None:
+        args = request.args
+    valor = args.get('fields')
+    if valor is None or not valor.strip():
+        return None
+
+    pedidos = {parte.strip() for parte in valor.split(',') if parte.strip()}
+    disponiveis = sorted(schema.dump_fields)
+    invalidos = sorted(pedidos.difference(disponiveis))
+    if invalidos:
+        raise ValidationError({'fields': [
+            f"Campo inválido: {', '.join(invalidos)}. Use: {', '.join(disponiveis)}."]})
+    pedidos.update(CAMPOS_OBRIGATORIOS)
+    return tuple(sorted(pedidos))
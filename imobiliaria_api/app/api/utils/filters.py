@@ -0,0 +1,154 @@
+import operator
+import re
+from flask import request
+from marshmallow import ValidationError, fields, validate
+from ...models.imovel import Imovel
+
+# Filtros por igualdade aceitos na query string das coleções
+FILTROS_IGUALDADE = {
+    'tipo': Imovel.tipo,
+    'cidade': Imovel.cidade,
+    'bairro': Imovel.bairro,
+}
+
+# Filtros por prefixo: parâmetro -> coluna normalizada (só dígitos)
+FILTROS_PREFIXO = {
+    'cep_prefixo': Imovel.cep_digitos,
+}
+
+# Filtros por faixa (limites inclusivos): parâmetro -> (coluna, comparação, campo)
+FILTROS_FAIXA = {
+    'valor_min': (Imovel.valor, operator.ge, fields.Float(validate=validate.Range(min=0))),
+    'valor_max': (Imovel.valor, operator.le, fields.Float(validate=validate.Range(min=0))),
+    'adquirido_de': (Imovel.data_aquisicao, operator.ge, fields.Date()),
+    'adquirido_ate': (Imovel.data_aquisicao, operator.le, fields.Date()),
+}
+
+# Pares de limites que não podem estar invertidos
+_FAIXAS = (('valor_min', 'valor_max'), ('adquirido_de', 'adquirido_ate'))
+
+
+def parse_filters(args=None):
+    """
+    Converte os filtros da query string em condições SQL.
+
+    Args:
+        args (MultiDict, optional): Parâmetros a serem lidos (padrão: request.args)
+
+    Returns:
+        list: Condições a serem aplicadas com ``where``
+
+    Raises:
+        ValidationError: Se algum filtro for inválido
+    """
+    if args is None:
+        args = request.args
+
+    criteria = []
+    for nome, coluna in FILTROS_IGUALDADE.items():
+        valor = args.get(nome)
+        if valor is not None:
+            criteria.append(coluna == valor)
+    
+    # Filtros por faixa: convertidos com o campo do marshmallow correspondente
+    limites = {}
+    errors = {}
+    for nome, (coluna, comparacao, campo) in FILTROS_FAIXA.items():
+        valor = args.get(nome)
+        if valor is None or valor == '':
+            continue
+        try:
+            limites[nome] = campo.deserialize(valor)
+        except ValidationError as err:
+            errors[nome] = err.messages
+            continue
+        criteria.append(comparacao(coluna, limites[nome]))
+    
+    for nome, coluna in FILTROS_PREFIXO.items():
+        valor = args.get(nome)
+        if valor is None or valor == '':
+            continue
+        prefixo = re.sub(r'[-. ]', '', valor)
+        if not re.fullmatch(r'\d{1,8}', prefixo):
+            errors[nome] = ['Deve conter de 1 a 8 dígitos.']
+            continue
+        criteria += prefix_range(coluna, prefixo)
+    
+    for inicio, fim in _FAIXAS:
+        if inicio in limites and fim in limites and limites[inicio] > limites[fim]:
+            errors[fim] = [f'Deve ser maior ou igual a {inicio}.']
+    if errors:
+        raise ValidationError(errors)
+    return criteria
+
+
+def prefix_range(coluna, prefixo):
+    """
+    Condições de "começa com" como intervalo, para usar o índice da coluna.
+    
+    ``coluna LIKE '801%'`` vira ``coluna >= '801' AND coluna < '802'``.
+    
+    Args:
+        coluna (Column): Coluna de texto indexada
+        prefixo (str): Prefixo de dígitos
+        
+    Returns:
+        list: Condições a serem aplicadas com ``where``
+    """
+    criteria = [coluna >= prefixo]
+    # Próximo prefixo: incrementa o último dígito que não é 9 ('0199' -> '02')
+    base = prefixo.rstrip('9')
+    if base:
+        criteria.append(coluna < base[:-1] + str(int(base[-1]) + 1))
+    return criteria
+
+
+def parse_ids(valor, maximo):
+    """
+    Valida uma lista de IDs (lista JSON ou texto separado por vírgulas).
+
+    Args:
+        valor (list | str): IDs informados pelo cliente
+        maximo (int): Quantidade máxima de IDs
+
+    Returns:
+        list: IDs sem repetição, na ordem informada
+
+    Raises:
+        ValidationError: Se a lista for inválida
+    """
+    if isinstance(valor, str):
+        valor = [parte for parte in valor.split(',') if parte.strip()]
+    if not isinstance(valor, list) or not valor:
+        raise ValidationError({'ids': ['Deve ser uma lista não vazia de IDs.']})
+    try:
+        ids = list(dict.fromkeys(int(id) for id in valor))
+    except (TypeError, ValueError):
+        raise ValidationError({'ids': ['Todos os IDs devem ser números inteiros.']})
+    if len(ids) > maximo:
+        raise ValidationError({'ids': [f'Informe no máximo {maximo} IDs.']})
+    return ids
+
+
+def parse_group_by(permitidos, args=None):
+    """
+    Lê as colunas de agrupamento de ``?agrupar=`` (separadas por vírgulas).
+
+    Args:
+        permitidos (tuple): Colunas aceitas
+        args (MultiDict, optional): Parâmetros a serem lidos (padrão: request.args)
+
+    Returns:
+        list: Colunas sem repetição, na ordem informada (vazia para os totais gerais)
+
+    Raises:
+        ValidationError: Se alguma coluna não for aceita
+    """
+    if args is None:
+        args = request.args
+    colunas = [parte.strip() for parte in args.get('agrupar', '').split(',') if parte.strip()]
+    invalidas = [coluna for coluna in colunas if coluna not in permitidos]
+    if invalidas:
+        raise ValidationError({'agrupar': [
+            f"Coluna inválida: {', '.join(invalidas)}. Use: {', '.join(permitidos)}."]})
+    return list(dict.fromkeys(colunas))
@@ -1,4 +1,12 @@
-from flask import url_for, request
+from flask import url_for, request, g, current_app
+from marshmallow import ValidationError
+from werkzeug.routing import UnicodeConverter
+
+# Valor sentinela usado para gerar os modelos de URL com url_for
+_ID_SENTINELA = 987654321
+
+# Modos aceitos pelo parâmetro ?links= das coleções
+LINK_MODES = ('full', 'collection', 'none')
 
 class HypermediaBuilder:
     """
@@ -6,6 +14,75 @@ class HypermediaBuilder:
     às respostas da API.
     """
     
+    @staticmethod
+    def link_templates():
+        """
+        Retorna os modelos de URL dos links de imóveis.
+        
+        Os modelos são montados com url_for uma única vez por requisição
+        (os links são absolutos e dependem do host) e depois preenchidos por
+        substituição de texto, evitando várias chamadas a url_for por item.
+        
+        Returns:
+            dict: Mapeamento rel -> (modelo de URL, método HTTP)
+        """
+        templates = g.get('_hypermedia_templates')
+        if templates is not None:
+            return templates
+        
+        def _modelo(endpoint, **values):
+            href = url_for(endpoint, _external=True, **values)
+            return href.replace(str(_ID_SENTINELA), '{id}') \
+                       .replace('%7Btipo%7D', '{tipo}') \
+                       .replace('%7Bcidade%7D', '{cidade}')
+        
+        templates = {
+            'self': (_modelo('api.get_imovel', id=_ID_SENTINELA), 'GET'),
+            'update': (_modelo('api.update_imovel', id=_ID_SENTINELA), 'PUT'),
+            'delete': (_modelo('api.delete_imovel', id=_ID_SENTINELA), 'DELETE'),
+            'collection': (_modelo('api.list_imoveis'), 'GET'),
+            'filtrar_por_tipo': (_modelo('api.list_imoveis_by_tipo', tipo='{tipo}'), 'GET'),
+            'filtrar_por_cidade': (_modelo('api.list_imoveis_by_cidade', cidade='{cidade}'), 'GET'),
+        }
+        g._hypermedia_templates = templates
+        return templates
+    
+    @staticmethod
+    def parse_links_mode(args=None):
+        """
+        Lê o parâmetro ?links= das coleções.
+        
+        - ``full`` (padrão): cada item traz seus próprios ``_links``
+        - ``collection``: os links dos itens vão para um único bloco ``_templates``
+        - ``none``: sem links nos itens
+        
+        Raises:
+            ValidationError: Se o modo for desconhecido
+        """
+        if args is None:
+            args = request.args
+        modo = args.get('links') or 'full'
+        if modo not in LINK_MODES:
+            raise ValidationError({'links': [f"Deve ser um de: {', '.join(LINK_MODES)}."]})
+        return modo
+    
+    @staticmethod
+    def add_templates(collection):
+        """
+        Adiciona à coleção o bloco HAL ``_templates`` com os links dos itens.
+        
+        Args:
+            collection (dict): A coleção a ser enriquecida
+            
+        Returns:
+            dict: A coleção com os modelos de links
+        """
+        collection['_templates'] = {
+            rel: {'href': href, 'method': method, 'templated': True}
+            for rel, (href, method) in HypermediaBuilder.link_templates().items()
+        }
+        return collection
+    
     @staticmethod
     def add_links(resource, resource_id=None, resource_type=None):
         """
@@ -25,55 +102,46 @@ class HypermediaBuilder:
         # Adicionar _links ao recurso
         if '_links' not in resource:
             resource['_links'] = {}
-            
+        links = resource['_links']
+        templates = HypermediaBuilder.link_templates()
+        
         # Adicionar link self
         if resource_id:
-            resource['_links']['self'] = {
-                'href': url_for('api.get_imovel', id=resource_id, _external=True),
-                'method': 'GET'
-            }
+            href, method = templates['self']
+            links['self'] = {'href': href.replace('{id}', str(resource_id)), 'method': method}
             
         # Adicionar outros links específicos por tipo de recurso
         if resource_type == 'imoveis':
             if resource_id:
                 # Links para o próprio recurso
-                resource['_links']['update'] = {
-                    'href': url_for('api.update_imovel', id=resource_id, _external=True),
-                    'method': 'PUT'
-                }
-                resource['_links']['delete'] = {
-                    'href': url_for('api.delete_imovel', id=resource_id, _external=True),
-                    'method': 'DELETE'
-                }
+                for rel in ('update', 'delete'):
+                    href, method = templates[rel]
+                    links[rel] = {'href': href.replace('{id}', str(resource_id)), 'method': method}
             
             # Links relacionados à coleção
-            resource['_links']['collection'] = {
-                'href': url_for('api.list_imoveis', _external=True),
-                'method': 'GET'
-            }
+            href, method = templates['collection']
+            links['collection'] = {'href': href, 'method': method}
             
             if resource_id is None:  # É uma coleção
-                resource['_links']['create'] = {
+                links['create'] = {
                     'href': url_for('api.create_imovel', _external=True),
                     'method': 'POST'
                 }
             
-            # Adicionar links para filtragem
-            if 'tipo' in resource:
-                resource['_links']['filtrar_por_tipo'] = {
-                    'href': url_for('api.list_imoveis_by_tipo', tipo=resource['tipo'], _external=True),
-                    'method': 'GET'
-                }
-            if 'cidade' in resource:
-                resource['_links']['filtrar_por_cidade'] = {
-                    'href': url_for('api.list_imoveis_by_cidade', cidade=resource['cidade'], _external=True),
-                    'method': 'GET'
-                }
+            # Adicionar links para filtragem (valores escapados como no url_for)
+            converter = UnicodeConverter(current_app.url_map)
+            for campo in ('tipo', 'cidade'):
+                if resource.get(campo) is not None:
+                    href, method = templates['filtrar_por_' + campo]
+                    links['filtrar_por_' + campo] = {
+                        'href': href.replace('{%s}' % campo, converter.to_url(resource[campo])),
+                        'method': method
+                    }
                 
         return resource
         
     @staticmethod
-    def add_pagination_links(collection, endpoint, page, per_page, total):
+    def add_pagination_links(collection, endpoint, page, per_page, total, **params):
         """
         Adiciona links de paginação à coleção.
         
@@ -83,6 +151,7 @@ class HypermediaBuilder:
             page (int): Página atual
             per_page (int): Itens por página
             total (int): Total de itens
+            **params: Argumentos de rota e filtros a preservar nos links
             
         Returns:
             dict: A coleção com links de paginação adicionados
@@ -92,38 +161,79 @@ class HypermediaBuilder:
             collection['_links'] = {}
             
         # Adicionar links de paginação
-        total_pages = (total // per_page) + (1 if total % per_page > 0 else 0)
+        total_pages = max((total // per_page) + (1 if total % per_page > 0 else 0), 1)
         
         # Link para a página atual
         collection['_links']['self'] = {
-            'href': url_for(endpoint, page=page, per_page=per_page, _external=True),
+            'href': url_for(endpoint, page=page, per_page=per_page, _external=True, **params),
             'method': 'GET'
         }
         
         # Link para a primeira página
         collection['_links']['first'] = {
-            'href': url_for(endpoint, page=1, per_page=per_page, _external=True),
+            'href': url_for(endpoint, page=1, per_page=per_page, _external=True, **params),
             'method': 'GET'
         }
         
         # Link para a última página
         collection['_links']['last'] = {
-            'href': url_for(endpoint, page=total_pages, per_page=per_page, _external=True),
+            'href': url_for(endpoint, page=total_pages, per_page=per_page, _external=True, **params),
             'method': 'GET'
         }
         
         # Link para a próxima página
         if page < total_pages:
             collection['_links']['next'] = {
-                'href': url_for(endpoint, page=page+1, per_page=per_page, _external=True),
+                'href': url_for(endpoint, page=page+1, per_page=per_page, _external=True, **params),
                 'method': 'GET'
             }
             
         # Link para a página anterior
         if page > 1:
             collection['_links']['prev'] = {
-                'href': url_for(endpoint, page=page-1, per_page=per_page, _external=True),
+                'href': url_for(endpoint, page=page-1, per_page=per_page, _external=True, **params),
+                'method': 'GET'
+            }
+            
+        return collection
+        
+    @staticmethod
+    def add_cursor_links(collection, endpoint, limit, next_after=None, prev_before=None, **params):
+        """
+        Adiciona links de paginação por cursor (keyset) à coleção.
+        
+        Args:
+            collection (dict): A coleção a ser enriquecida com links
+            endpoint (str): O endpoint base
+            limit (int): Itens por página
+            next_after (int, optional): Cursor da próxima página (último ID da página)
+            prev_before (int, optional): Cursor da página anterior (primeiro ID da página)
+            **params: Argumentos de rota e filtros a preservar nos links
+            
+        Returns:
+            dict: A coleção com links de paginação adicionados
+        """
+        if '_links' not in collection:
+            collection['_links'] = {}
+            
+        # Link para a primeira página
+        collection['_links']['first'] = {
+            'href': url_for(endpoint, limit=limit, _external=True, **params),
+            'method': 'GET'
+        }
+        
+        # Link para a próxima página
+        if next_after is not None:
+            collection['_links']['next'] = {
+                'href': url_for(endpoint, limit=limit, after=next_after, _external=True, **params),
+                'method': 'GET'
+            }
+            
+        # Link para a página anterior
+        if prev_before is not None:
+            collection['_links']['prev'] = {
+                'href': url_for(endpoint, limit=limit, before=prev_before, _external=True, **params),
                 'method': 'GET'
             }
             
-        return collection 
\ No newline at end of file
+        return collection
@@ -0,0 +1,156 @@
+from collections import namedtuple
+from flask import request, current_app
+from marshmallow import ValidationError
+from sqlalchemy import select, func
+from ...extensions import db
+
+# Parâmetros de query string reservados para a paginação
+PAGINATION_ARGS = ('limit', 'after', 'before', 'page', 'per_page')
+
+Paginacao = namedtuple('Paginacao', ['modo', 'limit', 'after', 'before', 'page'])
+Pagina = namedtuple('Pagina', ['items', 'has_next', 'has_prev', 'total'])
+
+
+def _parse_int(args, nome, minimo, errors):
+    """Converte um parâmetro inteiro da query string, registrando erros."""
+    valor = args.get(nome)
+    if valor is None or valor == '':
+        return None
+    try:
+        valor = int(valor)
+    except (TypeError, ValueError):
+        errors[nome] = ['Deve ser um número inteiro.']
+        return None
+    if valor < minimo:
+        errors[nome] = [f'Deve ser maior ou igual a {minimo}.']
+        return None
+    return valor
+
+
+def parse_pagination_args(args=None):
+    """
+    Lê os parâmetros de paginação da requisição.
+
+    O modo padrão é por cursor (``?limit=&after=`` ou ``?limit=&before=``),
+    ordenado por ``id``. Clientes antigos podem usar o modo por deslocamento
+    (``?page=&per_page=``). O tamanho da página é sempre limitado por
+    ``API_PAGE_SIZE_MAX``.
+
+    Args:
+        args (MultiDict, optional): Parâmetros a serem lidos (padrão: request.args)
+
+    Returns:
+        Paginacao: Parâmetros de paginação normalizados
+
+    Raises:
+        ValidationError: Se algum parâmetro for inválido
+    """
+    if args is None:
+        args = request.args
+
+    default = current_app.config['API_PAGE_SIZE_DEFAULT']
+    maximo = current_app.config['API_PAGE_SIZE_MAX']
+    errors = {}
+
+    if 'page' in args or 'per_page' in args:
+        page = _parse_int(args, 'page', 1, errors) or 1
+        per_page = _parse_int(args, 'per_page', 1, errors) or default
+        if errors:
+            raise ValidationError(errors)
+        return Paginacao('offset', min(per_page, maximo), None, None, page)
+
+    limit = _parse_int(args, 'limit', 1, errors) or default
+    after = _parse_int(args, 'after', 0, errors)
+    before = _parse_int(args, 'before', 1, errors)
+    if after is not None and before is not None:
+        errors['before'] = ['Não pode ser usado junto com after.']
+    if errors:
+        raise ValidationError(errors)
+    return Paginacao('cursor', min(limit, maximo), after, before, None)
+
+
+def paginate_query(stmt, id_column, paginacao, order_by=None):
+    """
+    Aplica a paginação a uma consulta e a executa.
+
+    No modo por cursor é feita uma busca por faixa na chave primária
+    (``id > after``), sem ``OFFSET`` nem ``COUNT``; uma linha extra é lida
+    apenas para saber se existe uma próxima página.
+
+    Args:
+        stmt (Select): Consulta já filtrada
+        id_column (Column): Coluna usada como cursor
+        paginacao (Paginacao): Parâmetros de paginação
+        order_by (tuple, optional): Ordenação do modo por deslocamento
+            (padrão: ``id_column``), ex.: relevância de uma busca
+
+    Returns:
+        Pagina: Linhas da página e indicadores de navegação
+    """
+    consulta, contagem = paginate_statements(stmt, id_column, paginacao, order_by)
+    total = db.session.execute(contagem).scalar() if contagem is not None else None
+    return page_from_rows(db.session.execute(consulta).all(), total, paginacao)
+
+
+def paginate_statements(stmt, id_column, paginacao, order_by=None):
+    """
+    Monta, sem executar, as consultas de uma página (ver paginate_query).
+
+    Returns:
+        tuple: (consulta das linhas, consulta do total ou None no modo por cursor)
+    """
+    limit = paginacao.limit
+
+    if paginacao.modo == 'offset':
+        contagem = select(func.count()).select_from(stmt.order_by(None).subquery())
+        consulta = (
+            stmt.order_by(*(order_by if order_by is not None else (id_column,)))
+            .offset((paginacao.page - 1) * limit)
+            .limit(limit)
+        )
+        return consulta, contagem
+
+    if paginacao.before is not None:
+        consulta = (
+            stmt.where(id_column < paginacao.before)
+            .order_by(id_column.desc())
+            .limit(limit + 1)
+        )
+        return consulta, None
+
+    if paginacao.after is not None:
+        stmt = stmt.where(id_column > paginacao.after)
+    return stmt.order_by(id_column).limit(limit + 1), None
+
+
+def page_from_rows(rows, total, paginacao):
+    """
+    Monta a página a partir das linhas lidas com paginate_statements.
+
+    Args:
+        rows (list): Linhas da consulta da página
+        total (int): Resultado da consulta do total (modo por deslocamento)
+        paginacao (Paginacao): Parâmetros de paginação
+
+    Returns:
+        Pagina: Linhas da página e indicadores de navegação
+    """
+    limit = paginacao.limit
+
+    if paginacao.modo == 'offset':
+        return Pagina(rows, paginacao.page * limit < total, paginacao.page > 1, total)
+
+    if paginacao.before is not None:
+        has_prev = len(rows) > limit
+        rows = list(reversed(rows[:limit]))
+        return Pagina(rows, True, has_prev, None)
+
+    has_next = len(rows) > limit
+    return Pagina(rows[:limit], has_next, paginacao.after is not None, None)
+
+
+def extra_query_args(args=None):
+    """Retorna os parâmetros da query string que não são de paginação."""
+    if args is None:
+        args = request.args
+    return {k: v for k, v in args.items() if k not in PAGINATION_ARGS}
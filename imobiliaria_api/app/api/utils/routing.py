@@ -0,0 +1,22 @@
+from functools import wraps
+from flask import g
+from ...extensions import replicas
+
+def read_replica(f):
+    """
+    Executa as consultas do método em uma réplica de leitura.
+    
+    A réplica vale até o fim da requisição, inclusive para as respostas em
+    streaming, que consultam o banco depois que o método retorna.
+    
+    Args:
+        f (callable): Método somente leitura do recurso
+        
+    Returns:
+        callable: Método decorado
+    """
+    @wraps(f)
+    def wrapper(*args, **kwargs):
+        g.db_bind = replicas.escolher()
+        return f(*args, **kwargs)
+    return wrapper
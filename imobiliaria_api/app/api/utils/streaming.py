@@ -0,0 +1,106 @@
+import json
+from functools import partial
+from flask import Response, request, current_app, stream_with_context
+from marshmallow import ValidationError
+from ...extensions import db
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+# Valores aceitos por ?stream=
+_STREAM_JSON = ('1', 'true', 'json')
+_STREAM_NDJSON = ('ndjson',)
+_STREAM_OFF = ('', '0', 'false')
+
+
+def parse_stream_mode(args=None):
+    """
+    Identifica se a coleção deve ser enviada em streaming.
+
+    O modo NDJSON é escolhido com ``Accept: application/x-ndjson`` ou
+    ``?stream=ndjson``; ``?stream=1`` envia o JSON da coleção em partes.
+
+    Args:
+        args (MultiDict, optional): Parâmetros a serem lidos (padrão: request.args)
+
+    Returns:
+        str: 'ndjson', 'json' ou None quando a resposta não deve ser em streaming
+
+    Raises:
+        ValidationError: Se o valor de ?stream= for desconhecido
+    """
+    if args is None:
+        args = request.args
+
+    valor = args.get('stream')
+    if valor is None:
+        melhor = request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE])
+        return 'ndjson' if melhor == NDJSON_MIMETYPE else None
+
+    valor = valor.lower()
+    if valor in _STREAM_OFF:
+        return None
+    if valor in _STREAM_NDJSON:
+        return 'ndjson'
+    if valor in _STREAM_JSON:
+        return 'ndjson' if request.accept_mimetypes.best == NDJSON_MIMETYPE else 'json'
+    raise ValidationError({'stream': ['Deve ser 1, json ou ndjson.']})
+
+
+def iter_partitions(stmt, chunk_size):
+    """
+    Executa a consulta lendo as linhas em lotes (yield_per).
+
+    Args:
+        stmt (Select): Consulta a ser executada
+        chunk_size (int): Quantidade de linhas por lote
+
+    Yields:
+        list: Lotes de linhas
+    """
+    result = db.session.execute(stmt.execution_options(yield_per=chunk_size))
+    try:
+        for partition in result.partitions():
+            yield partition
+    finally:
+        result.close()
+
+
+def stream_response(partitions, serialize, mode, envelope):
+    """
+    Cria uma resposta HTTP que serializa a coleção à medida que é lida.
+
+    Cada lote de linhas vira um pedaço do corpo da resposta, de modo que a
+    memória usada não depende do tamanho da coleção.
+
+    Args:
+        partitions (iterable): Lotes de linhas (ver iter_partitions)
+        serialize (callable): Converte um lote de linhas em lista de dicts
+        mode (str): 'ndjson' ou 'json'
+        envelope (dict): Campos da coleção enviados após os itens no modo 'json'
+
+    Returns:
+        Response: Resposta em streaming
+    """
+    settings = dict(current_app.config.get('RESTFUL_JSON', {}))
+    settings.pop('indent', None)
+    dumps = partial(json.dumps, **settings)
+
+    def gerar_ndjson():
+        for rows in partitions:
+            yield ''.join(dumps(item) + '\n' for item in serialize(rows))
+
+    def gerar_json():
+        yield '{"items": ['
+        count = 0
+        for rows in partitions:
+            items = serialize(rows)
+            if not items:
+                continue
+            yield (',' if count else '') + ','.join(dumps(item) for item in items)
+            count += len(items)
+        # Fecha a lista e reaproveita o encoder para o restante do objeto
+        yield '], ' + dumps(dict(count=count, **envelope))[1:]
+
+    if mode == 'ndjson':
+        return Response(stream_with_context(gerar_ndjson()), mimetype=NDJSON_MIMETYPE)
+    return Response(stream_with_context(gerar_json()), mimetype='application/json')
@@ -0,0 +1,280 @@
+import io
+from flask import request
+from marshmallow import ValidationError
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from a2wsgi import WSGIMiddleware
+from a2wsgi.wsgi import build_environ
+from . import create_app
+from .extensions import db, replicas, response_cache, aplicar_pragmas_ao_conectar, \
+    configure_slow_query_log
+from .models.imovel import Imovel
+from .models.versao import VersaoTabela
+from .services.cache import json_response
+from .services.tempos import medir, observar_engine
+from .services.versionamento import TABELA_IMOVEIS
+from .api.resources.imoveis import parse_projection, sparse_serializer, \
+    imoveis_row_serializer, finish_collection
+from .api.schemas.imovel_schema import ImovelSchema
+from .api.utils.etag import make_etag, not_modified, etag_headers
+from .api.utils.filters import parse_filters
+from .api.utils.fieldsets import parse_fields
+from .api.utils.hypermedia import HypermediaBuilder
+from .api.utils.pagination import parse_pagination_args, paginate_statements, page_from_rows
+from .api.utils.streaming import parse_stream_mode
+
+# Drivers assíncronos de cada driver síncrono aceito pela aplicação
+DRIVERS_ASYNC = {
+    'sqlite': 'sqlite+aiosqlite',
+    'sqlite+pysqlite': 'sqlite+aiosqlite',
+    'mysql': 'mysql+asyncmy',
+    'mysql+pymysql': 'mysql+asyncmy',
+}
+
+_imovel_schema = ImovelSchema()
+
+
+def async_database_url(url):
+    """
+    URL do driver assíncrono equivalente (aiosqlite / asyncmy).
+
+    Args:
+        url (URL): URL do engine síncrono
+
+    Returns:
+        URL: Mesmo banco, com o driver assíncrono
+
+    Raises:
+        ValueError: Se não houver driver assíncrono para o banco
+    """
+    driver = DRIVERS_ASYNC.get(url.drivername)
+    if driver is None:
+        raise ValueError(f'Sem driver assíncrono para {url.drivername}.')
+    return url.set(drivername=driver)
+
+
+class AsgiApp:
+    """
+    Aplicação ASGI com leitura assíncrona dos imóveis.
+
+    Os GETs de ``api.list_imoveis``, ``api.get_imovel``,
+    ``api.list_imoveis_by_tipo`` e ``api.list_imoveis_by_cidade`` leem o
+    banco pelo engine assíncrono do SQLAlchemy, sem ocupar uma thread
+    durante a espera. O corpo é montado pelas mesmas funções dos recursos
+    (schemas, HypermediaBuilder, paginação), dentro de um contexto de
+    requisição do Flask.
+
+    Como na API WSGI, as leituras passam pelo cache de respostas (mesmas
+    chaves e grupos de invalidação) e são distribuídas entre as réplicas de
+    SQLALCHEMY_BINDS, cada uma com o seu engine assíncrono. Os ganchos
+    before/after_request do Flask envolvem cada leitura (Server-Timing,
+    /metrics), e os engines assíncronos têm os mesmos observadores dos
+    síncronos (tempos de SQL, log de consultas lentas).
+
+    As demais requisições (escritas, busca, estatísticas, streaming) e os
+    casos de erro fora do contrato das leituras (ex.: 404) são enviados ao
+    aplicativo Flask, executado em um pool de threads.
+    """
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_WSGI_THREADS'])
+        self.handlers = {
+            'api.list_imoveis': self.listar,
+            'api.get_imovel': self.obter,
+            'api.list_imoveis_by_tipo': self.listar_por_tipo,
+            'api.list_imoveis_by_cidade': self.listar_por_cidade,
+        }
+        with flask_app.app_context():
+            url = flask_app.config.get('ASYNC_DATABASE_URI') or async_database_url(db.engine.url)
+            self.engine = self._criar_engine(url)
+            # Engine assíncrono de cada réplica, pela chave do bind (None: principal)
+            self.engines = {None: self.engine}
+            retry = flask_app.config.get('REPLICA_RETRY_AFTER', 30)
+            for replica in flask_app.extensions['replicas']['replicas']:
+                engine = self._criar_engine(async_database_url(db.engines[replica.chave].url))
+                event.listen(engine.sync_engine, 'handle_error',
+                             replicas._ao_desconectar(replica, retry))
+                self.engines[replica.chave] = engine
+
+    def _criar_engine(self, url):
+        """Engine assíncrono com as opções de pool e os pragmas da aplicação."""
+        opcoes = {chave: valor for chave, valor
+                  in self.flask_app.config.get('SQLALCHEMY_ENGINE_OPTIONS', {}).items()
+                  if chave != 'poolclass'}
+        engine = create_async_engine(url, **opcoes)
+        pragmas = self.flask_app.config.get('SQLITE_PRAGMAS')
+        if engine.dialect.name == 'sqlite' and pragmas:
+            aplicar_pragmas_ao_conectar(engine.sync_engine, pragmas)
+        if self.flask_app.config.get('REQUEST_TIMING'):
+            observar_engine(engine.sync_engine)
+        configure_slow_query_log(self.flask_app, engine.sync_engine)
+        return engine
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] != 'http' or scope['method'] != 'GET':
+            return await self.wsgi(scope, receive, send)
+
+        ctx = self.flask_app.request_context(build_environ(scope, io.BytesIO()))
+        ctx.push()
+        try:
+            response = await self._responder()
+        finally:
+            ctx.pop()
+        if response is None:
+            return await self.wsgi(scope, receive, send)
+
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [(nome.lower().encode('latin-1'), valor.encode('latin-1'))
+                        for nome, valor in response.headers.items()],
+        })
+        await send({'type': 'http.response.body', 'body': response.get_data()})
+
+    async def _lifespan(self, receive, send):
+        while True:
+            mensagem = await receive()
+            if mensagem['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif mensagem['type'] == 'lifespan.shutdown':
+                for engine in self.engines.values():
+                    await engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _responder(self):
+        """Resposta da leitura assíncrona, ou None para usar o aplicativo Flask."""
+        regra = request.url_rule
+        handler = self.handlers.get(regra.endpoint) if regra is not None else None
+        if handler is None:
+            return None
+        try:
+            if regra.endpoint != 'api.get_imovel' and parse_stream_mode():
+                return None
+        except ValidationError:
+            return None
+
+        # Mesmos ganchos de uma requisição do Flask. Se a leitura for repassada
+        # ao Flask (None), o teardown do contexto desfaz o que os ganchos abriram
+        response = self.flask_app.preprocess_request()
+        if response is not None:
+            return self.flask_app.process_response(self.flask_app.make_response(response))
+        async with self.engines[await replicas.escolher_async(self.engines)].connect() as conn:
+            response = await handler(conn, **request.view_args)
+        if response is None:
+            return None
+        return self.flask_app.process_response(response)
+
+    async def listar(self, conn):
+        links = {
+            "self": {
+                "href": request.url,
+                "method": "GET"
+            },
+            "create": {
+                "href": request.url,
+                "method": "POST"
+            }
+        }
+        return await self._colecao(conn, [], 'api.list_imoveis', links, 'imoveis')
+
+    async def listar_por_tipo(self, conn, tipo):
+        return await self._colecao(conn, [Imovel.tipo == tipo], 'api.list_imoveis_by_tipo',
+                                   self._links_filtro(), f'tipo:{tipo}', tipo=tipo)
+
+    async def listar_por_cidade(self, conn, cidade):
+        return await self._colecao(conn, [Imovel.cidade == cidade], 'api.list_imoveis_by_cidade',
+                                   self._links_filtro(), f'cidade:{cidade}', cidade=cidade)
+
+    @staticmethod
+    def _links_filtro():
+        return {
+            "self": {
+                "href": request.url,
+                "method": "GET"
+            },
+            "all": {
+                "href": request.url_root + "api/imoveis",
+                "method": "GET"
+            }
+        }
+
+    async def _colecao(self, conn, criteria, endpoint, links, cache_group, **url_args):
+        """Mesma resposta de list_response/build_collection, com E/S assíncrona."""
+        versao = (await conn.execute(
+            select(VersaoTabela.versao).where(VersaoTabela.tabela == TABELA_IMOVEIS)
+        )).scalar()
+        etag = make_etag('imoveis', versao or 0)
+        response = not_modified(etag)
+        if response is not None:
+            return response
+
+        try:
+            criteria = list(criteria) + parse_filters()
+            paginacao = parse_pagination_args()
+            serializer, modo_links = parse_projection()
+        except ValidationError as err:
+            return json_response({"message": "Erro de validação", "errors": err.messages}, 400)
+
+        async def build():
+            stmt = select(*serializer.columns).where(*criteria)
+            consulta, contagem = paginate_statements(stmt, Imovel.id, paginacao)
+            total = (await conn.execute(contagem)).scalar() if contagem is not None else None
+            rows = (await conn.execute(consulta)).all()
+            return finish_collection(page_from_rows(rows, total, paginacao), paginacao,
+                                     serializer, modo_links, links, endpoint, **url_args), 200
+
+        return await response_cache.cached_async(cache_group, build, etag_headers(etag))
+
+    async def obter(self, conn, id):
+        """Mesma resposta de ImovelResource.get, com E/S assíncrona."""
+        # Como no recurso, o 404 e o 304 vêm antes da validação de ?fields=
+        try:
+            campos, erro = parse_fields(_imovel_schema), None
+        except ValidationError as err:
+            campos, erro = None, err
+        serializer = imoveis_row_serializer if campos is None else sparse_serializer(campos)
+
+        versao = (await conn.execute(select(Imovel.versao).where(Imovel.id == id))).scalar()
+        if versao is None:
+            # Resposta 404 do Flask-RESTful
+            return None
+        etag = make_etag('imovel', id, versao)
+        response = not_modified(etag)
+        if response is not None:
+            return response
+        if erro is not None:
+            return json_response({"message": "Erro de validação", "errors": erro.messages}, 400)
+
+        async def build():
+            row = (await conn.execute(select(*serializer.columns).where(Imovel.id == id))).first()
+            if row is None:
+                # Removido entre as duas consultas
+                raise LookupError(id)
+            with medir('dump'):
+                result = serializer.dump(row)
+            if campos is None or '_links' in campos:
+                with medir('links'):
+                    result = HypermediaBuilder.add_links(result, id, 'imoveis')
+            return result, 200
+
+        try:
+            return await response_cache.cached_async(f'imovel:{id}', build, etag_headers(etag))
+        except LookupError:
+            return None
+
+
+def create_asgi_app(config_name='default'):
+    """
+    Cria a aplicação ASGI (ver AsgiApp).
+
+    Args:
+        config_name (str): Nome da configuração a ser usada
+
+    Returns:
+        AsgiApp: Aplicação ASGI
+    """
+    return AsgiApp(create_app(config_name))
@@ -0,0 +1,151 @@
+import os
+import sys
+import click
+from flask import current_app
+from .extensions import db, response_cache
+from .models.estatisticas import DIALETOS_RESUMO
+from .services.importacao import importar, LEITORES, FORMATOS, MODOS, ErroImportacao
+from .services.busca import reconstruir_indice
+from .services.estatisticas import recalcular_estatisticas
+from .services.sintetico import gerar_imoveis
+from .services.consultas_lentas import ler_ocorrencias, resumir_ocorrencias
+
+def _arquivo_padrao():
+    """Localiza o imoveis.sql na pasta atual ou na pasta pai."""
+    for caminho in ('imoveis.sql', os.path.join('..', 'imoveis.sql')):
+        if os.path.exists(caminho):
+            return caminho
+    return 'imoveis.sql'
+
+def _formato(arquivo, formato):
+    """Deduz o formato pela extensão do arquivo quando não informado."""
+    if formato != 'auto':
+        return formato
+    extensao = os.path.splitext(arquivo)[1].lower().lstrip('.')
+    if extensao in ('jsonl', 'json'):
+        return 'ndjson'
+    return extensao if extensao in FORMATOS else 'sql'
+
+@click.command('import-data')
+@click.argument('arquivo', required=False)
+@click.option('--formato', type=click.Choice(('auto',) + FORMATOS), default='auto',
+              help='Formato da entrada (padrão: pela extensão do arquivo).')
+@click.option('--modo', type=click.Choice(MODOS), default='substituir',
+              help='substituir apaga a tabela antes; upsert atualiza pelo id.')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=5000,
+              help='Linhas gravadas por executemany.')
+@click.option('--ids-sequenciais', is_flag=True,
+              help='Usar a posição da linha no arquivo como id (reimportações idempotentes).')
+def import_data(arquivo, formato, modo, chunk_size, ids_sequenciais):
+    """Importa imóveis de um arquivo SQL, CSV ou NDJSON ('-' lê da entrada padrão)."""
+    arquivo = arquivo or _arquivo_padrao()
+    formato = _formato(arquivo, formato)
+    db.create_all()
+    
+    def progresso(importadas, taxa):
+        click.echo(f'Importados {importadas} registros ({taxa:,.0f} linhas/s)...')
+    
+    stream = sys.stdin if arquivo == '-' else open(arquivo, encoding='utf-8', newline='')
+    try:
+        click.echo(f'Importando {arquivo} ({formato}, modo {modo})...')
+        resultado = importar(LEITORES[formato](stream), modo=modo, chunk_size=chunk_size,
+                             ids_sequenciais=ids_sequenciais, progresso=progresso)
+    except ErroImportacao as err:
+        raise click.ClickException(f'Importação cancelada, nada foi gravado: {err}')
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+    
+    response_cache.clear()
+    
+    for posicao, erro in resultado['erros'][:10]:
+        click.echo(f'Linha {posicao} ignorada: {erro}', err=True)
+    click.echo(f"\nImportação concluída! {resultado['importadas']} registros importados "
+               f"em {resultado['segundos']:.2f}s ({resultado['linhas_por_segundo']:,.0f} linhas/s).")
+    if resultado['rejeitadas']:
+        click.echo(f"{resultado['rejeitadas']} linhas rejeitadas.")
+
+@click.command('rebuild-search')
+def rebuild_search():
+    """Reconstrói o índice da busca por endereço a partir da tabela imoveis."""
+    if db.engine.dialect.name != 'sqlite':
+        raise click.ClickException('A busca por endereço (FTS5) existe apenas no SQLite.')
+    db.create_all()
+    total = reconstruir_indice()
+    response_cache.clear()
+    click.echo(f'Índice de busca reconstruído: {total} imóveis indexados.')
+
+@click.command('rebuild-stats')
+def rebuild_stats():
+    """Recalcula o resumo das estatísticas de valor a partir da tabela imoveis."""
+    if db.engine.dialect.name not in DIALETOS_RESUMO:
+        raise click.ClickException(
+            'O resumo das estatísticas é mantido apenas no SQLite e no MySQL; '
+            'nos demais bancos a API agrega a tabela imoveis.')
+    db.create_all()
+    total = recalcular_estatisticas()
+    response_cache.clear()
+    click.echo(f'Estatísticas recalculadas: {total} grupos (cidade, tipo).')
+
+@click.command('seed')
+@click.option('--rows', type=click.IntRange(min=1), default=1000,
+              help='Quantidade de imóveis sintéticos.')
+@click.option('--seed', 'semente', type=int, default=42,
+              help='Semente do gerador (a mesma semente gera os mesmos imóveis).')
+@click.option('--append', is_flag=True,
+              help='Acrescentar aos imóveis existentes em vez de substituí-los.')
+@click.option('--chunk-size', type=click.IntRange(min=1), default=5000,
+              help='Linhas gravadas por executemany.')
+def seed(rows, semente, append, chunk_size):
+    """Popula a tabela imoveis com imóveis sintéticos (cidades e tipos assimétricos)."""
+    db.create_all()
+    
+    def progresso(importadas, taxa):
+        click.echo(f'Gerados {importadas} imóveis ({taxa:,.0f} linhas/s)...')
+    
+    resultado = importar(gerar_imoveis(rows, semente), modo='inserir' if append else 'substituir',
+                         chunk_size=chunk_size, progresso=progresso)
+    response_cache.clear()
+    click.echo(f"\n{resultado['importadas']} imóveis gerados "
+               f"em {resultado['segundos']:.2f}s ({resultado['linhas_por_segundo']:,.0f} linhas/s).")
+
+@click.command('slow-queries')
+@click.option('--log', 'caminho', help='Arquivo do log (padrão: SLOW_QUERY_LOG).')
+@click.option('--limit', type=click.IntRange(min=1), default=20,
+              help='Quantidade de comandos listados.')
+def slow_queries(caminho, limit):
+    """Resume o log de consultas lentas por comando (fingerprint)."""
+    caminho = caminho or current_app.config.get('SLOW_QUERY_LOG')
+    if not caminho:
+        raise click.ClickException('Informe --log ou configure SLOW_QUERY_LOG.')
+    if not os.path.exists(caminho):
+        raise click.ClickException(f'Arquivo não encontrado: {caminho}')
+    
+    resumo = resumir_ocorrencias(ler_ocorrencias(caminho))
+    if not resumo:
+        click.echo('Nenhuma consulta registrada.')
+        return
+    for grupo in resumo[:limit]:
+        avisos = []
+        if grupo['varreduras_completas']:
+            avisos.append(f"varredura completa de imoveis em {grupo['varreduras_completas']}")
+        if grupo['repeticoes']:
+            avisos.append(f"repetido (N+1) em {grupo['repeticoes']} requisições")
+        click.echo(f"{grupo['lentas']:6d} lentas  total {grupo['total_ms']:10.1f} ms  "
+                   f"média {grupo['media_ms']:8.1f} ms  máx {grupo['max_ms']:8.1f} ms")
+        click.echo(f"  {grupo['fingerprint']}")
+        if grupo['endpoints']:
+            click.echo(f"  endpoints: {', '.join(grupo['endpoints'])}")
+        if avisos:
+            click.echo(f"  atenção: {'; '.join(avisos)}")
+    if len(resumo) > limit:
+        click.echo(f'... mais {len(resumo) - limit} comandos.')
+
+def init_app(app):
+    """Registra os comandos de linha de comando da aplicação."""
+    app.cli.add_command(import_data)
+    app.cli.add_command(rebuild_search)
+    app.cli.add_command(rebuild_stats)
+    app.cli.add_command(seed)
+    app.cli.add_command(slow_queries)
+    return app
@@ -1,41 +1,219 @@
 import os
 from dotenv import load_dotenv
+from .services.pool import QueuePoolMonitorado
 
 # Carregar variáveis de ambiente do arquivo .env
 load_dotenv()
 
+def sqlite_pragmas(**padroes):
+    """
+    Perfil de pragmas do SQLite, com valores sobrescritos pelo ambiente.
+
+    Cada pragma pode ser alterado com a variável ``SQLITE_<NOME>``
+    (ex.: ``SQLITE_MMAP_SIZE=0``); um valor vazio desativa o pragma.
+
+    Args:
+        **padroes: Valores padrão de cada pragma
+
+    Returns:
+        dict: Pragma -> valor, na ordem em que devem ser aplicados
+    """
+    pragmas = {}
+    for nome, valor in padroes.items():
+        valor = os.environ.get(f'SQLITE_{nome.upper()}', valor)
+        if valor not in (None, ''):
+            pragmas[nome] = valor
+    return pragmas
+
+def _aceitar_url(db_url, dialetos):
+    """Normaliza a URL (mysql:// usa o PyMySQL) ou retorna None se não for aceita."""
+    if db_url and db_url.startswith('mysql://'):
+        db_url = 'mysql+pymysql://' + db_url[len('mysql://'):]
+    if db_url and db_url.split(':', 1)[0].split('+', 1)[0] in dialetos:
+        return db_url
+    return None
+
+def database_url(*dialetos):
+    """
+    Lê a DATABASE_URL, aceitando apenas os bancos informados.
+
+    URLs ``mysql://`` passam a usar o driver PyMySQL (``mysql+pymysql://``).
+
+    Args:
+        *dialetos: Bancos aceitos (ex.: 'sqlite', 'mysql')
+
+    Returns:
+        str: URL do banco, ou o SQLite local se a URL não for aceita
+    """
+    # Fallback para SQLite se a URL não for válida
+    return _aceitar_url(os.environ.get('DATABASE_URL'), dialetos) or 'sqlite:///imobiliaria.db'
+
+def replica_binds(*dialetos):
+    """
+    Binds das réplicas de leitura, lidos de DATABASE_REPLICA_URLS.
+
+    Args:
+        *dialetos: Bancos aceitos (ex.: 'sqlite', 'mysql')
+
+    Returns:
+        dict: 'replica_1', 'replica_2'... -> URL, na ordem informada
+
+    Raises:
+        ValueError: Se alguma URL não for de um banco aceito
+    """
+    binds = {}
+    urls = os.environ.get('DATABASE_REPLICA_URLS', '')
+    for numero, db_url in enumerate((u.strip() for u in urls.split(',') if u.strip()), start=1):
+        aceita = _aceitar_url(db_url, dialetos)
+        if aceita is None:
+            raise ValueError(f'URL de réplica não suportada: {db_url.split(":", 1)[0]}')
+        binds[f'replica_{numero}'] = aceita
+    return binds
+
+def pool_options():
+    """
+    Opções do pool de conexões, ajustáveis por variáveis DB_POOL_*.
+
+    O tamanho vale por worker: com N workers do gunicorn o banco recebe até
+    N * (DB_POOL_SIZE + DB_MAX_OVERFLOW) conexões.
+
+    Returns:
+        dict: Opções para SQLALCHEMY_ENGINE_OPTIONS
+    """
+    return {
+        'poolclass': QueuePoolMonitorado,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        # Abaixo do wait_timeout do servidor, para não usar conexões já fechadas
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': os.environ.get('DB_POOL_PRE_PING', '1').lower() not in ('0', 'false'),
+        # Segundos inteiros: o Flask-SQLAlchemy converte as opções com int()
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+    }
+
 class Config:
     """Configuração base para todas as configurações."""
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'chave-secreta-padrao'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     
     # Definir a URL do banco de dados de forma segura
-    db_url = os.environ.get('DATABASE_URL')
-    if db_url and db_url.startswith('sqlite:'):
-        # SQLite
-        SQLALCHEMY_DATABASE_URI = db_url
-    else:
-        # Fallback para SQLite se a URL não for válida
-        SQLALCHEMY_DATABASE_URI = 'sqlite:///imobiliaria.db'
+    SQLALCHEMY_DATABASE_URI = database_url('sqlite')
+    
+    # Réplicas de leitura (URLs separadas por vírgula em DATABASE_REPLICA_URLS):
+    # os GETs da API usam uma réplica em rodízio e as escritas, o banco principal
+    SQLALCHEMY_BINDS = replica_binds('sqlite')
+    REPLICA_HEALTH_INTERVAL = float(os.environ.get('REPLICA_HEALTH_INTERVAL', 5))
+    REPLICA_RETRY_AFTER = float(os.environ.get('REPLICA_RETRY_AFTER', 30))
+    # Após uma escrita, o cliente lê do principal por este tempo (ler as próprias escritas)
+    REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 5))
+    
+    # Pragmas aplicados a cada nova conexão SQLite: WAL permite leituras
+    # durante uma escrita e synchronous=NORMAL evita um fsync por commit
+    SQLITE_PRAGMAS = sqlite_pragmas(
+        journal_mode='WAL',
+        synchronous='NORMAL',
+        busy_timeout=5000,
+        cache_size=-64000,  # em KiB (64 MB)
+        temp_store='MEMORY',
+        mmap_size=256 * 1024 * 1024,
+    )
+    
+    # Aplicação ASGI (asgi.py): URL do driver assíncrono (padrão: a mesma do
+    # banco principal com aiosqlite/asyncmy) e threads para as rotas em WSGI
+    ASYNC_DATABASE_URI = os.environ.get('ASYNC_DATABASE_URL')
+    ASGI_WSGI_THREADS = int(os.environ.get('ASGI_WSGI_THREADS', 10))
     
     API_TITLE = os.environ.get('API_TITLE', 'Imobiliaria API')
     API_VERSION = os.environ.get('API_VERSION', '1.0')
     API_DESCRIPTION = os.environ.get('API_DESCRIPTION', 'API RESTful para gerenciamento de imóveis')
+    
+    # Paginação das coleções
+    API_PAGE_SIZE_DEFAULT = int(os.environ.get('API_PAGE_SIZE_DEFAULT', 50))
+    API_PAGE_SIZE_MAX = int(os.environ.get('API_PAGE_SIZE_MAX', 500))
+    
+    # Linhas lidas por lote nas respostas em streaming
+    API_STREAM_CHUNK_SIZE = int(os.environ.get('API_STREAM_CHUNK_SIZE', 1000))
+    
+    # Quantidade máxima de imóveis por requisição de criação em lote
+    API_BATCH_MAX_ITEMS = int(os.environ.get('API_BATCH_MAX_ITEMS', 5000))
+    
+    # Cache das respostas de leitura ('memory', 'file' ou 'null')
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'memory')
+    RESPONSE_CACHE_TTL = int(os.environ.get('RESPONSE_CACHE_TTL', 60))
+    RESPONSE_CACHE_MAX_ENTRIES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRIES', 1024))
+    RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+    RESPONSE_CACHE_DIR = os.environ.get('RESPONSE_CACHE_DIR')
+    # Identidade do banco nas chaves do cache (padrão: hash da URL do banco e
+    # da pasta instance/); respostas de outro banco nunca são aproveitadas
+    RESPONSE_CACHE_NAMESPACE = os.environ.get('RESPONSE_CACHE_NAMESPACE')
+    
+    # Tempos de SQL, serialização, links e JSON de cada requisição, no
+    # cabeçalho Server-Timing e no log (desligado: sem custo por requisição)
+    REQUEST_TIMING = os.environ.get('REQUEST_TIMING', '0').lower() in ('1', 'true')
+    
+    # Log de consultas lentas (JSON Lines; vazio desliga): comandos acima do
+    # limite, com o plano de execução, e comandos repetidos na requisição (N+1)
+    SLOW_QUERY_LOG = os.environ.get('SLOW_QUERY_LOG')
+    SLOW_QUERY_THRESHOLD_MS = float(os.environ.get('SLOW_QUERY_THRESHOLD_MS', 100))
+    SLOW_QUERY_REPEAT_LIMIT = int(os.environ.get('SLOW_QUERY_REPEAT_LIMIT', 5))
+    
+    # Endpoint /metrics (Prometheus). Com vários workers, PROMETHEUS_MULTIPROC_DIR
+    # deve apontar para um diretório local (o gunicorn.conf.py define um padrão)
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '0').lower() in ('1', 'true')
+    # Validade (s) da contagem de imóveis exposta em /metrics
+    METRICS_ROWS_TTL = float(os.environ.get('METRICS_ROWS_TTL', 15))
 
 class DevelopmentConfig(Config):
     """Configuração para ambiente de desenvolvimento."""
     DEBUG = True
+    
+    # Um único processo (flask run): caches menores bastam
+    SQLITE_PRAGMAS = sqlite_pragmas(
+        journal_mode='WAL',
+        synchronous='NORMAL',
+        busy_timeout=5000,
+        cache_size=-16000,  # em KiB (16 MB)
+        temp_store='MEMORY',
+        mmap_size=64 * 1024 * 1024,
+    )
 
 class TestingConfig(Config):
     """Configuração para ambiente de testes."""
     TESTING = True
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Usar banco de dados em memória para testes
+    SQLALCHEMY_BINDS = {}
+    
+    # Banco em memória: sem WAL nem mmap, e nada a sincronizar com o disco
+    SQLITE_PRAGMAS = sqlite_pragmas(
+        synchronous='OFF',
+        busy_timeout=1000,
+        temp_store='MEMORY',
+    )
 
 class ProductionConfig(Config):
     """Configuração para ambiente de produção."""
     DEBUG = False
     TESTING = False
+    
+    # MySQL (PyMySQL) ou SQLite, com pool de conexões por worker
+    SQLALCHEMY_DATABASE_URI = database_url('sqlite', 'mysql')
+    SQLALCHEMY_BINDS = replica_binds('sqlite', 'mysql')
+    SQLALCHEMY_ENGINE_OPTIONS = pool_options()
+    
+    # Cache em arquivos, compartilhado pelos workers do gunicorn
+    RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'file')
+    
+    # Vários workers disputando o mesmo arquivo: espera maior pelo lock
+    # e mais memória para o cache de páginas e o mapeamento do arquivo
+    SQLITE_PRAGMAS = sqlite_pragmas(
+        journal_mode='WAL',
+        synchronous='NORMAL',
+        busy_timeout=15000,
+        cache_size=-256000,  # em KiB (256 MB)
+        temp_store='MEMORY',
+        mmap_size=1024 * 1024 * 1024,
+    )
 
 # Dicionário de configurações disponíveis
 config = {
@@ -1,16 +1,189 @@
+import re
+import time
+from flask import current_app, has_request_context, request
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_marshmallow import Marshmallow
+from sqlalchemy import event
+from sqlalchemy.exc import SQLAlchemyError
+from .services.cache import ResponseCache
+from .services.consultas_lentas import RegistroConsultasLentas, fingerprint, plano_execucao, \
+    varredura_completa, parametros_serializaveis
+from .services.pool import monitorar_engine
+from .services.replicas import ReplicaRouter, RoutingSession
 
 # Inicializar extensões
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 migrate = Migrate()
 ma = Marshmallow()
+response_cache = ResponseCache()
+replicas = ReplicaRouter()
+
+# Valores aceitos nos pragmas (não podem ser passados como parâmetros)
+_VALOR_PRAGMA = re.compile(r'^-?\w+$')
 
 def init_app(app):
     """Inicializa as extensões com a aplicação Flask."""
+    from .models.busca import incluir_no_autogenerate
+    
     db.init_app(app)
-    migrate.init_app(app, db)
+    migrate.init_app(app, db, include_object=incluir_no_autogenerate)
     ma.init_app(app)
+    response_cache.init_app(app)
+    replicas.init_app(app)
+    
+    with app.app_context():
+        for engine in db.engines.values():
+            configure_sqlite(app, engine)
+            monitorar_engine(engine)
+            configure_slow_query_log(app, engine)
+        replicas.init_engines(app, db)
     
     return app
+
+def configure_sqlite(app, engine):
+    """
+    Aplica o perfil SQLITE_PRAGMAS a cada nova conexão do engine.
+    
+    Os valores efetivos são lidos de volta e registrados no log, já que o
+    SQLite ignora alguns pragmas sem erro (ex.: WAL em banco em memória).
+    
+    Args:
+        app (Flask): Aplicação com a configuração
+        engine (Engine): Engine a ser configurado
+    
+    Raises:
+        ValueError: Se algum pragma tiver um valor inválido
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+    
+    aplicar_pragmas_ao_conectar(engine, pragmas)
+    
+    banco = engine.url.database or ':memory:'
+    try:
+        efetivos = sqlite_pragmas_efetivos(engine, pragmas)
+    except SQLAlchemyError as err:
+        # Um banco indisponível (ex.: réplica) não impede a inicialização
+        app.logger.warning('Não foi possível ler os pragmas do SQLite (%s): %s', banco, err)
+        return
+    app.logger.info('Pragmas do SQLite (%s): %s', banco,
+                    ', '.join(f'{nome}={valor}' for nome, valor in efetivos.items()))
+    
+    # Não reaproveitar nos workers a conexão aberta pelo processo principal
+    if engine.url.database not in (None, '', ':memory:'):
+        engine.dispose()
+
+def aplicar_pragmas_ao_conectar(engine, pragmas):
+    """
+    Executa os pragmas em cada nova conexão do engine.
+    
+    Também serve para o ``sync_engine`` de um engine assíncrono (aiosqlite).
+    
+    Args:
+        engine (Engine): Engine SQLite
+        pragmas (dict): Pragma -> valor
+    
+    Raises:
+        ValueError: Se algum pragma tiver um valor inválido
+    """
+    for nome, valor in pragmas.items():
+        if not _VALOR_PRAGMA.match(str(valor)):
+            raise ValueError(f'Valor inválido para o pragma {nome}: {valor!r}')
+    
+    @event.listens_for(engine, 'connect')
+    def aplicar_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for nome, valor in pragmas.items():
+                cursor.execute(f'PRAGMA {nome} = {valor}')
+        finally:
+            cursor.close()
+
+def sqlite_pragmas_efetivos(engine, nomes):
+    """
+    Lê os valores atuais dos pragmas em uma conexão do engine.
+    
+    Args:
+        engine (Engine): Engine SQLite
+        nomes (iterable): Nomes dos pragmas
+    
+    Returns:
+        dict: Pragma -> valor informado pelo SQLite
+    """
+    with engine.connect() as conn:
+        return {nome: conn.exec_driver_sql(f'PRAGMA {nome}').scalar() for nome in nomes}
+
+def configure_slow_query_log(app, engine):
+    """
+    Registra os comandos lentos e repetidos do engine em SLOW_QUERY_LOG.
+    
+    Cada comando acima de SLOW_QUERY_THRESHOLD_MS é gravado com os
+    parâmetros, o endpoint e o recurso da requisição e o plano de execução
+    (EXPLAIN QUERY PLAN no SQLite, EXPLAIN no MySQL), indicando se a tabela
+    imoveis foi lida por inteiro. Um mesmo comando executado mais de
+    SLOW_QUERY_REPEAT_LIMIT vezes em uma requisição (padrão N+1) também é
+    gravado, uma vez por requisição. ``flask slow-queries`` resume o arquivo.
+    
+    Args:
+        app (Flask): Aplicação com a configuração
+        engine (Engine): Engine a ser observado
+    """
+    caminho = app.config.get('SLOW_QUERY_LOG')
+    if not caminho:
+        return
+    
+    limite = app.config.get('SLOW_QUERY_THRESHOLD_MS', 100) / 1000
+    repeticoes = app.config.get('SLOW_QUERY_REPEAT_LIMIT', 5)
+    registro = app.extensions.get('slow_query_log')
+    if registro is None:
+        registro = app.extensions['slow_query_log'] = RegistroConsultasLentas(caminho)
+    dialeto = engine.dialect.name
+    
+    def origem():
+        """Endpoint, recurso, método e caminho da requisição em andamento."""
+        if not has_request_context():
+            return {'endpoint': None, 'resource': None}
+        view = current_app.view_functions.get(request.endpoint)
+        classe = getattr(view, 'view_class', None)
+        return {
+            'endpoint': request.endpoint,
+            'resource': classe.__name__ if classe is not None else getattr(view, '__name__', None),
+            'method': request.method,
+            'path': request.path,
+        }
+    
+    @event.listens_for(engine, 'before_cursor_execute')
+    def iniciar_consulta(conn, cursor, statement, parameters, context, executemany):
+        context._consulta_inicio = time.perf_counter()
+    
+    @event.listens_for(engine, 'after_cursor_execute')
+    def registrar_consulta(conn, cursor, statement, parameters, context, executemany):
+        duracao = time.perf_counter() - context._consulta_inicio
+        assinatura = fingerprint(statement)
+        
+        if has_request_context():
+            # No environ: a contagem é da requisição, mesmo que o contexto
+            # da aplicação seja compartilhado (ex.: cliente de testes)
+            contagem = request.environ.setdefault('imobiliaria.consultas', {})
+            contagem[assinatura] = vezes = contagem.get(assinatura, 0) + 1
+            if vezes == repeticoes + 1:
+                registro.gravar(dict(origem(), kind='repeated', fingerprint=assinatura,
+                                     statement=statement, count=vezes))
+        
+        if duracao < limite:
+            return
+        # Conexão DBAPI do pool: a do aiosqlite/asyncmy também tem cursor() síncrono
+        plano = None if executemany else plano_execucao(
+            conn.connection, dialeto, statement, parameters)
+        ocorrencia = dict(
+            origem(), kind='slow', fingerprint=assinatura, statement=statement,
+            params=parametros_serializaveis(parameters, executemany),
+            duration_ms=round(duracao * 1000, 3), plan=plano,
+            full_scan=varredura_completa(plano, dialeto),
+        )
+        registro.gravar(ocorrencia)
+        app.logger.warning('Consulta lenta (%.1f ms%s) em %s: %s', duracao * 1000,
+                           ', varredura completa de imoveis' if ocorrencia['full_scan'] else '',
+                           ocorrencia['endpoint'], assinatura)
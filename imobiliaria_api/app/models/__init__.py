@@ -1,3 +1,6 @@
 from .imovel import Imovel
+from .versao import VersaoTabela
+from .estatisticas import EstatisticaImoveis
+from . import busca
 
-__all__ = ['Imovel']
+__all__ = ['Imovel', 'VersaoTabela', 'EstatisticaImoveis']
@@ -0,0 +1,51 @@
+from sqlalchemy import DDL, event
+from .imovel import Imovel
+
+# Índice de texto completo (FTS5) dos endereços, com conteúdo externo: o
+# texto fica apenas em imoveis e o índice é mantido pelos gatilhos abaixo
+TABELA_BUSCA = 'imoveis_busca'
+COLUNAS_BUSCA = ('logradouro', 'tipo_logradouro', 'bairro', 'cidade')
+
+_colunas = ', '.join(COLUNAS_BUSCA)
+_novos = ', '.join(f'new.{coluna}' for coluna in COLUNAS_BUSCA)
+_antigos = ', '.join(f'old.{coluna}' for coluna in COLUNAS_BUSCA)
+
+# Mesmo SQL da migração 0005
+DDL_BUSCA = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {TABELA_BUSCA} USING fts5(
+        {_colunas},
+        content='imoveis', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABELA_BUSCA}_ai AFTER INSERT ON imoveis BEGIN
+        INSERT INTO {TABELA_BUSCA} (rowid, {_colunas}) VALUES (new.id, {_novos});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABELA_BUSCA}_ad AFTER DELETE ON imoveis BEGIN
+        INSERT INTO {TABELA_BUSCA} ({TABELA_BUSCA}, rowid, {_colunas})
+        VALUES ('delete', old.id, {_antigos});
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABELA_BUSCA}_au
+    AFTER UPDATE OF {_colunas} ON imoveis BEGIN
+        INSERT INTO {TABELA_BUSCA} ({TABELA_BUSCA}, rowid, {_colunas})
+        VALUES ('delete', old.id, {_antigos});
+        INSERT INTO {TABELA_BUSCA} (rowid, {_colunas}) VALUES (new.id, {_novos});
+    END""",
+]
+
+DROP_BUSCA = [
+    f'DROP TRIGGER IF EXISTS {TABELA_BUSCA}_au',
+    f'DROP TRIGGER IF EXISTS {TABELA_BUSCA}_ad',
+    f'DROP TRIGGER IF EXISTS {TABELA_BUSCA}_ai',
+    f'DROP TABLE IF EXISTS {TABELA_BUSCA}',
+]
+
+# Criar e remover o índice junto com a tabela (create_all/drop_all, testes)
+for _sql in DDL_BUSCA:
+    event.listen(Imovel.__table__, 'after_create', DDL(_sql).execute_if(dialect='sqlite'))
+for _sql in DROP_BUSCA:
+    event.listen(Imovel.__table__, 'before_drop', DDL(_sql).execute_if(dialect='sqlite'))
+
+def incluir_no_autogenerate(objeto, nome, tipo, refletido, comparado):
+    """Ignora no autogenerate do Alembic as tabelas do FTS5 (criadas na 0005)."""
+    return not (tipo == 'table' and nome and nome.startswith(TABELA_BUSCA))
@@ -0,0 +1,185 @@
+from sqlalchemy import DDL, event
+from ..extensions import db
+from .imovel import Imovel
+
+class EstatisticaImoveis(db.Model):
+    """
+    Totais de valor dos imóveis por cidade e tipo.
+
+    No SQLite e no MySQL a tabela é mantida pelos gatilhos abaixo a cada
+    escrita em imoveis; ``flask rebuild-stats`` a recalcula do zero. Imóveis
+    sem tipo ficam no grupo de tipo ``''``.
+    """
+    __tablename__ = 'estatisticas_imoveis'
+
+    cidade = db.Column(db.String(50), primary_key=True)
+    tipo = db.Column(db.String(50), primary_key=True, default='')
+    quantidade = db.Column(db.Integer, nullable=False, default=0)
+    # Imóveis com valor informado (base da média)
+    quantidade_valor = db.Column(db.Integer, nullable=False, default=0)
+    soma_valor = db.Column(db.Float, nullable=False, default=0)
+    menor_valor = db.Column(db.Float)
+    maior_valor = db.Column(db.Float)
+
+    def __repr__(self):
+        return f'<EstatisticaImoveis {self.cidade}/{self.tipo}: {self.quantidade}>'
+
+
+TABELA_ESTATISTICAS = EstatisticaImoveis.__tablename__
+
+# Bancos em que os gatilhos mantêm o resumo
+DIALETOS_RESUMO = ('sqlite', 'mysql')
+
+
+def _adicionar(linha):
+    """Soma a linha (new) ao seu grupo, criando o grupo se preciso."""
+    return f"""
+        INSERT INTO {TABELA_ESTATISTICAS}
+            (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+        VALUES ({linha}.cidade, coalesce({linha}.tipo, ''), 1, {linha}.valor IS NOT NULL,
+                coalesce({linha}.valor, 0), {linha}.valor, {linha}.valor)
+        ON CONFLICT (cidade, tipo) DO UPDATE SET
+            quantidade = quantidade + 1,
+            quantidade_valor = quantidade_valor + excluded.quantidade_valor,
+            soma_valor = soma_valor + excluded.soma_valor,
+            menor_valor = min(coalesce(menor_valor, excluded.menor_valor),
+                              coalesce(excluded.menor_valor, menor_valor)),
+            maior_valor = max(coalesce(maior_valor, excluded.maior_valor),
+                              coalesce(excluded.maior_valor, maior_valor));"""
+
+
+def _remover(linha):
+    """
+    Subtrai a linha (old) do seu grupo.
+
+    Mínimo e máximo não podem ser desfeitos por subtração: só quando a linha
+    removida era um dos extremos o grupo é relido de imoveis. O grupo ``''``
+    reúne os imóveis com tipo vazio e sem tipo, e é relido por inteiro.
+    """
+    grupo = f"cidade = {linha}.cidade AND tipo = coalesce({linha}.tipo, '')"
+    no_grupo = (f"FROM imoveis WHERE cidade = {linha}.cidade "
+                f"AND coalesce(tipo, '') = coalesce({linha}.tipo, '')")
+    return f"""
+        UPDATE {TABELA_ESTATISTICAS} SET
+            quantidade = quantidade - 1,
+            quantidade_valor = quantidade_valor - ({linha}.valor IS NOT NULL),
+            soma_valor = soma_valor - coalesce({linha}.valor, 0)
+        WHERE {grupo};
+        UPDATE {TABELA_ESTATISTICAS} SET
+            menor_valor = (SELECT min(valor) {no_grupo}),
+            maior_valor = (SELECT max(valor) {no_grupo})
+        WHERE {grupo} AND {linha}.valor IN (menor_valor, maior_valor);
+        DELETE FROM {TABELA_ESTATISTICAS} WHERE {grupo} AND quantidade <= 0;"""
+
+
+# Mesmo SQL das migrações 0006 e 0009
+DDL_ESTATISTICAS = [
+    f"""CREATE TRIGGER IF NOT EXISTS {TABELA_ESTATISTICAS}_ai AFTER INSERT ON imoveis BEGIN
+        {_adicionar('new')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABELA_ESTATISTICAS}_ad AFTER DELETE ON imoveis BEGIN
+        {_remover('old')}
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {TABELA_ESTATISTICAS}_au
+    AFTER UPDATE OF cidade, tipo, valor ON imoveis BEGIN
+        {_remover('old')}
+        {_adicionar('new')}
+    END""",
+]
+
+DROP_ESTATISTICAS = [
+    f'DROP TRIGGER IF EXISTS {TABELA_ESTATISTICAS}_au',
+    f'DROP TRIGGER IF EXISTS {TABELA_ESTATISTICAS}_ad',
+    f'DROP TRIGGER IF EXISTS {TABELA_ESTATISTICAS}_ai',
+]
+
+# Variável de sessão do MySQL que desliga os gatilhos durante uma carga
+# (o DDL do MySQL não é transacional: os gatilhos não podem ser removidos
+# e recriados dentro da transação da importação)
+CARGA_SEM_GATILHOS = '@imoveis_carga'
+
+
+def _adicionar_mysql(linha):
+    """Versão MySQL de _adicionar (ON DUPLICATE KEY, least/greatest)."""
+    return f"""
+            INSERT INTO {TABELA_ESTATISTICAS}
+                (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+            VALUES ({linha}.cidade, coalesce({linha}.tipo, ''), 1, {linha}.valor IS NOT NULL,
+                    coalesce({linha}.valor, 0), {linha}.valor, {linha}.valor)
+            ON DUPLICATE KEY UPDATE
+                quantidade = quantidade + 1,
+                quantidade_valor = quantidade_valor + VALUES(quantidade_valor),
+                soma_valor = soma_valor + VALUES(soma_valor),
+                menor_valor = least(coalesce(menor_valor, VALUES(menor_valor)),
+                                    coalesce(VALUES(menor_valor), menor_valor)),
+                maior_valor = greatest(coalesce(maior_valor, VALUES(maior_valor)),
+                                       coalesce(VALUES(maior_valor), maior_valor));"""
+
+
+def _remover_mysql(linha):
+    """Versão MySQL de _remover."""
+    grupo = f"cidade = {linha}.cidade AND tipo = coalesce({linha}.tipo, '')"
+    no_grupo = (f"FROM imoveis WHERE cidade = {linha}.cidade "
+                f"AND coalesce(tipo, '') = coalesce({linha}.tipo, '')")
+    return f"""
+            UPDATE {TABELA_ESTATISTICAS} SET
+                quantidade = quantidade - 1,
+                quantidade_valor = quantidade_valor - ({linha}.valor IS NOT NULL),
+                soma_valor = soma_valor - coalesce({linha}.valor, 0)
+            WHERE {grupo};
+            UPDATE {TABELA_ESTATISTICAS} SET
+                menor_valor = (SELECT min(valor) {no_grupo}),
+                maior_valor = (SELECT max(valor) {no_grupo})
+            WHERE {grupo} AND {linha}.valor IN (menor_valor, maior_valor);
+            DELETE FROM {TABELA_ESTATISTICAS} WHERE {grupo} AND quantidade <= 0;"""
+
+
+# Mesmo SQL das migrações 0008 e 0009. O MySQL não tem UPDATE OF: o gatilho de
+# alteração compara as colunas do resumo
+DDL_ESTATISTICAS_MYSQL = {
+    f'{TABELA_ESTATISTICAS}_ai': f"""CREATE TRIGGER {TABELA_ESTATISTICAS}_ai
+    AFTER INSERT ON imoveis FOR EACH ROW BEGIN
+        IF {CARGA_SEM_GATILHOS} IS NULL THEN
+            {_adicionar_mysql('new')}
+        END IF;
+    END""",
+    f'{TABELA_ESTATISTICAS}_ad': f"""CREATE TRIGGER {TABELA_ESTATISTICAS}_ad
+    AFTER DELETE ON imoveis FOR EACH ROW BEGIN
+        IF {CARGA_SEM_GATILHOS} IS NULL THEN
+            {_remover_mysql('old')}
+        END IF;
+    END""",
+    f'{TABELA_ESTATISTICAS}_au': f"""CREATE TRIGGER {TABELA_ESTATISTICAS}_au
+    AFTER UPDATE ON imoveis FOR EACH ROW BEGIN
+        IF {CARGA_SEM_GATILHOS} IS NULL AND NOT (old.cidade <=> new.cidade
+                AND old.tipo <=> new.tipo AND old.valor <=> new.valor) THEN
+            {_remover_mysql('old')}
+            {_adicionar_mysql('new')}
+        END IF;
+    END""",
+}
+
+
+def _gatilho_ausente(nome):
+    """Condição do create_all no MySQL, que não tem CREATE TRIGGER IF NOT EXISTS."""
+    def verificar(ddl, target, bind, **kw):
+        return bind.dialect.name == 'mysql' and not bind.exec_driver_sql(
+            'SELECT count(*) FROM information_schema.triggers '
+            'WHERE trigger_schema = DATABASE() AND trigger_name = %s', (nome,)).scalar()
+    return verificar
+
+
+def _com_gatilhos(ddl, target, bind, **kw):
+    """Condição do drop_all: bancos em que os gatilhos do resumo existem."""
+    return bind.dialect.name in DIALETOS_RESUMO
+
+
+# Os gatilhos dependem das duas tabelas: criados depois de todo o create_all
+for _sql in DDL_ESTATISTICAS:
+    event.listen(db.metadata, 'after_create', DDL(_sql).execute_if(dialect='sqlite'))
+for _nome, _sql in DDL_ESTATISTICAS_MYSQL.items():
+    event.listen(db.metadata, 'after_create', DDL(_sql).execute_if(callable_=_gatilho_ausente(_nome)))
+
+# E removidos antes da tabela imoveis no drop_all
+for _sql in DROP_ESTATISTICAS:
+    event.listen(Imovel.__table__, 'before_drop', DDL(_sql).execute_if(callable_=_com_gatilhos))
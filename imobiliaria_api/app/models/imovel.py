@@ -1,9 +1,26 @@
 from datetime import datetime
 from ..extensions import db
 
+# Expressão da coluna cep_digitos (mesma da migração 0007)
+CEP_DIGITOS_SQL = "replace(replace(replace(cep, '-', ''), '.', ''), ' ', '')"
+
 class Imovel(db.Model):
     """Modelo para representar um imóvel no banco de dados."""
     __tablename__ = 'imoveis'
+    __table_args__ = (
+        # Índices para os filtros mais usados pela API; os índices de coluna
+        # única também atendem à paginação por cursor (filtro + ORDER BY id)
+        db.Index('ix_imoveis_cidade', 'cidade'),
+        db.Index('ix_imoveis_tipo', 'tipo'),
+        db.Index('ix_imoveis_cidade_tipo', 'cidade', 'tipo'),
+        db.Index('ix_imoveis_cidade_valor', 'cidade', 'valor'),
+        # Filtros por faixa (valor_min/valor_max, adquirido_de/adquirido_ate)
+        db.Index('ix_imoveis_valor', 'valor'),
+        db.Index('ix_imoveis_data_aquisicao', 'data_aquisicao'),
+        # Filtros por bairro e por prefixo do CEP (intervalo no índice)
+        db.Index('ix_imoveis_bairro', 'bairro'),
+        db.Index('ix_imoveis_cep_digitos', 'cep_digitos'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     logradouro = db.Column(db.String(100), nullable=False)
@@ -11,9 +28,14 @@ class Imovel(db.Model):
     bairro = db.Column(db.String(50))
     cidade = db.Column(db.String(50), nullable=False)
     cep = db.Column(db.String(10))
+    # CEP só com dígitos ('01001-000' -> '01001000'), calculado pelo banco
+    cep_digitos = db.Column(db.String(8), db.Computed(CEP_DIGITOS_SQL, persisted=False))
     tipo = db.Column(db.String(50))
     valor = db.Column(db.Float)
-    data_aquisicao = db.Column(db.String(10))
+    data_aquisicao = db.Column(db.Date)
+    
+    # Versão da linha, incrementada a cada alteração (usada nos ETags)
+    versao = db.Column(db.Integer, nullable=False, default=1, server_default='1')
     
     def __init__(self, **kwargs):
         """Inicializa o modelo com valores padrão para campos não fornecidos."""
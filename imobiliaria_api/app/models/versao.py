@@ -0,0 +1,11 @@
+from ..extensions import db
+
+class VersaoTabela(db.Model):
+    """Contador de versão de uma tabela, incrementado a cada escrita."""
+    __tablename__ = 'versoes_tabelas'
+    
+    tabela = db.Column(db.String(50), primary_key=True)
+    versao = db.Column(db.Integer, nullable=False, default=0)
+    
+    def __repr__(self):
+        return f'<VersaoTabela {self.tabela}: {self.versao}>'
@@ -0,0 +1,86 @@
+import re
+from sqlalchemy import select, func, literal_column, table, column
+from ..extensions import db
+from ..models.busca import TABELA_BUSCA
+from ..models.imovel import Imovel
+
+# Pesos do bm25 na ordem das colunas do índice
+# (logradouro, tipo_logradouro, bairro, cidade)
+PESOS_BM25 = (4.0, 1.0, 2.0, 2.0)
+
+# Palavras da busca; um * no fim pede busca por prefixo
+_TERMO = re.compile(r'(\w+)(\*?)', re.UNICODE)
+
+_busca = table(TABELA_BUSCA, column('rowid'))
+
+
+def montar_consulta_fts(texto):
+    """
+    Converte o texto digitado em uma consulta FTS5 segura.
+
+    Cada palavra vira um termo entre aspas (operadores e sintaxe do FTS5 no
+    texto são ignorados) e todos os termos precisam aparecer no endereço.
+    A última palavra é buscada por prefixo, para a busca enquanto se digita;
+    as demais apenas se terminarem com ``*``.
+
+    Args:
+        texto (str): Texto digitado pelo cliente
+
+    Returns:
+        str: Consulta FTS5, ou None se o texto não tiver palavras
+    """
+    termos = _TERMO.findall(texto or '')
+    if not termos:
+        return None
+    partes = []
+    for posicao, (palavra, asterisco) in enumerate(termos, start=1):
+        prefixo = asterisco or posicao == len(termos)
+        partes.append(f'"{palavra}"' + ('*' if prefixo else ''))
+    return ' AND '.join(partes)
+
+
+def consulta_busca(colunas, consulta_fts, criteria=()):
+    """
+    Monta o SELECT dos imóveis que casam com a consulta, com a relevância.
+
+    A busca parte do índice FTS5 e acessa ``imoveis`` pela chave primária.
+
+    Args:
+        colunas (list): Colunas de Imovel a serem selecionadas
+        consulta_fts (str): Consulta FTS5 (ver montar_consulta_fts)
+        criteria (iterable): Filtros adicionais sobre Imovel
+
+    Returns:
+        tuple: (Select, expressão de ordenação por relevância)
+    """
+    fts = literal_column(TABELA_BUSCA)
+    # bm25 devolve valores menores para os resultados mais relevantes
+    relevancia = func.bm25(fts, *PESOS_BM25)
+    stmt = (
+        select(*colunas)
+        .select_from(_busca)
+        .join(Imovel, Imovel.id == _busca.c.rowid)
+        .where(fts.op('MATCH')(consulta_fts), *criteria)
+    )
+    return stmt, relevancia
+
+
+def reindexar():
+    """Refaz o índice de busca na transação atual, sem commit."""
+    conn = db.session.connection()
+    conn.exec_driver_sql(f"INSERT INTO {TABELA_BUSCA} ({TABELA_BUSCA}) VALUES ('rebuild')")
+
+
+def reconstruir_indice():
+    """
+    Reconstrói o índice de busca a partir da tabela imoveis.
+
+    Necessário apenas para dados gravados sem os gatilhos (ex.: banco
+    restaurado de um dump sem o índice).
+
+    Returns:
+        int: Quantidade de imóveis indexados
+    """
+    reindexar()
+    db.session.commit()
+    return db.session.execute(select(func.count()).select_from(Imovel)).scalar()
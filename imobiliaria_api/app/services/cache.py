@@ -0,0 +1,402 @@
+import hashlib
+import os
+import shutil
+import struct
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+from flask import request, current_app
+from flask_restful.representations.json import output_json
+from .tempos import medir
+
+
+class MemoryBackend:
+    """
+    Backend em memória do processo, com expulsão LRU, TTL e limite de tamanho.
+
+    Cada worker do gunicorn tem sua própria cópia; use o FileBackend quando
+    houver mais de um processo servindo a API.
+    """
+
+    def __init__(self, ttl, max_entries, max_bytes):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._groups = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def get(self, grupo, chave):
+        with self._lock:
+            entry = self._entries.get((grupo, chave))
+            if entry is None:
+                return None
+            expira_em, valor = entry
+            if expira_em < time.monotonic():
+                self._remove((grupo, chave))
+                return None
+            self._entries.move_to_end((grupo, chave))
+            return valor
+
+    def set(self, grupo, chave, valor):
+        if len(valor) > self.max_bytes:
+            return
+        with self._lock:
+            if (grupo, chave) in self._entries:
+                self._remove((grupo, chave))
+            self._entries[(grupo, chave)] = (time.monotonic() + self.ttl, valor)
+            self._groups.setdefault(grupo, set()).add(chave)
+            self._bytes += len(valor)
+            # Expulsar as entradas usadas há mais tempo
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete_group(self, grupo):
+        with self._lock:
+            for chave in list(self._groups.get(grupo, ())):
+                self._remove((grupo, chave))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._groups.clear()
+            self._bytes = 0
+
+    def info(self):
+        return {'entries': len(self._entries), 'bytes': self._bytes, 'evictions': self.evictions}
+
+    def _remove(self, key):
+        _, valor = self._entries.pop(key)
+        self._bytes -= len(valor)
+        chaves = self._groups.get(key[0])
+        if chaves is not None:
+            chaves.discard(key[1])
+            if not chaves:
+                del self._groups[key[0]]
+
+
+class FileBackend:
+    """
+    Backend em arquivos locais, compartilhado entre os workers do gunicorn.
+
+    Cada grupo é um diretório e cada entrada um arquivo com o instante de
+    expiração no cabeçalho. A data de modificação marca o último uso, e as
+    entradas mais antigas são removidas quando os limites são ultrapassados.
+    """
+
+    _CABECALHO = struct.Struct('>d')
+
+    def __init__(self, diretorio, ttl, max_entries, max_bytes):
+        self.diretorio = diretorio
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evictions = 0
+        self._escritas = 0
+        os.makedirs(diretorio, exist_ok=True)
+
+    def _path(self, grupo, chave=None):
+        pasta = os.path.join(self.diretorio, hashlib.sha1(grupo.encode('utf-8')).hexdigest())
+        if chave is None:
+            return pasta
+        return os.path.join(pasta, hashlib.sha1(chave.encode('utf-8')).hexdigest())
+
+    def get(self, grupo, chave):
+        path = self._path(grupo, chave)
+        try:
+            with open(path, 'rb') as f:
+                conteudo = f.read()
+        except OSError:
+            return None
+        if len(conteudo) < self._CABECALHO.size:
+            return None
+        (expira_em,) = self._CABECALHO.unpack_from(conteudo)
+        if expira_em < time.time():
+            self._unlink(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return conteudo[self._CABECALHO.size:]
+
+    def set(self, grupo, chave, valor):
+        if len(valor) > self.max_bytes:
+            return
+        path = self._path(grupo, chave)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        except OSError:
+            # Pasta invalidada por outro worker durante a criação: a
+            # resposta só deixa de ir para o cache
+            return
+        # Escrita atômica: outro worker nunca lê um arquivo pela metade
+        fd, tmp = tempfile.mkstemp(dir=self.diretorio, prefix='.tmp-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._CABECALHO.pack(time.time() + self.ttl))
+                f.write(valor)
+            os.replace(tmp, path)
+        except OSError:
+            self._unlink(tmp)
+            return
+        self._escritas += 1
+        if self._escritas % 100 == 0:
+            self._enforce_limits()
+
+    def delete_group(self, grupo):
+        pasta = self._path(grupo)
+        # Renomear antes de remover torna a invalidação atômica para os leitores
+        lixo = f'{pasta}.del-{os.getpid()}-{threading.get_ident()}-{time.monotonic_ns()}'
+        try:
+            os.rename(pasta, lixo)
+        except OSError:
+            return
+        shutil.rmtree(lixo, ignore_errors=True)
+
+    def clear(self):
+        for nome in os.listdir(self.diretorio):
+            path = os.path.join(self.diretorio, nome)
+            if os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                self._unlink(path)
+
+    def info(self):
+        entradas = self._scan()
+        return {'entries': len(entradas), 'bytes': sum(e[1] for e in entradas),
+                'evictions': self.evictions}
+
+    def _scan(self):
+        entradas = []
+        for pasta in os.scandir(self.diretorio):
+            if not pasta.is_dir() or '.del-' in pasta.name:
+                continue
+            try:
+                # A pasta pode ter sido invalidada por outro worker depois
+                # da listagem do diretório
+                arquivos = list(os.scandir(pasta.path))
+            except OSError:
+                continue
+            for arquivo in arquivos:
+                try:
+                    stat = arquivo.stat()
+                except OSError:
+                    continue
+                entradas.append((stat.st_mtime, stat.st_size, arquivo.path))
+        return entradas
+
+    def _enforce_limits(self):
+        entradas = sorted(self._scan())
+        total = sum(e[1] for e in entradas)
+        while entradas and (len(entradas) > self.max_entries or total > self.max_bytes):
+            _, tamanho, path = entradas.pop(0)
+            self._unlink(path)
+            total -= tamanho
+            self.evictions += 1
+
+    @staticmethod
+    def _unlink(path):
+        try:
+            os.unlink(path)
+        except OSError:
+            pass
+
+
+def chave_representacao():
+    """
+    Identifica a representação pedida: URL, parâmetros e cabeçalho Accept.
+
+    Os parâmetros são ordenados pelo nome (mantendo a ordem dos valores
+    repetidos), para que ``?a=1&b=2`` e ``?b=2&a=1`` tenham a mesma chave de
+    cache e o mesmo ETag.
+
+    Returns:
+        str: Chave da representação
+    """
+    args = urlencode(sorted(request.args.items(multi=True), key=lambda item: item[0]))
+    return f"{request.base_url}?{args}|{request.headers.get('Accept', '')}"
+
+
+def json_response(data, status, headers=None):
+    """Codifica a resposta como o Flask-RESTful, com o Content-Type application/json."""
+    with medir('json'):
+        response = output_json(data, status, headers)
+    response.mimetype = 'application/json'
+    return response
+
+
+class ResponseCache:
+    """
+    Cache dos corpos já codificados das respostas de leitura.
+
+    As entradas são agrupadas pelo que as torna obsoletas (a coleção inteira,
+    um imóvel, uma cidade ou um tipo), para que cada escrita invalide apenas
+    os grupos afetados.
+
+    Cada corpo é gravado com o ETag da versão dos dados em que foi gerado, e
+    uma entrada com outro ETag conta como falha. Assim um corpo antigo nunca
+    sai com o validador novo, mesmo quando a invalidação não o alcança: um
+    leitor que grava depois da invalidação de uma escrita concorrente, uma
+    importação feita por outro processo ou uma réplica atrasada.
+    """
+
+    # Separa o ETag do corpo nas entradas do backend
+    _SEPARADOR = b'\n'
+
+    def __init__(self, app=None):
+        self.hits = 0
+        self.misses = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Cria o backend configurado em RESPONSE_CACHE_BACKEND."""
+        nome = app.config.get('RESPONSE_CACHE_BACKEND', 'memory')
+        ttl = app.config.get('RESPONSE_CACHE_TTL', 60)
+        max_entries = app.config.get('RESPONSE_CACHE_MAX_ENTRIES', 1024)
+        max_bytes = app.config.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024)
+        banco = self.identidade_banco(app)
+
+        if nome == 'memory':
+            backend = MemoryBackend(ttl, max_entries, max_bytes)
+        elif nome == 'file':
+            diretorio = app.config.get('RESPONSE_CACHE_DIR') or \
+                os.path.join(tempfile.gettempdir(), f'imobiliaria-cache-{banco}')
+            backend = FileBackend(diretorio, ttl, max_entries, max_bytes)
+        elif nome in (None, '', 'null'):
+            backend = None
+        else:
+            raise ValueError(f'Backend de cache desconhecido: {nome}')
+
+        app.extensions['response_cache'] = backend
+        app.extensions['response_cache_banco'] = banco
+
+    @staticmethod
+    def identidade_banco(app):
+        """
+        Identifica o banco da aplicação nas chaves e no diretório do cache.
+
+        Usa RESPONSE_CACHE_NAMESPACE ou, na falta dele, um hash da URL do
+        banco e da pasta instance/ (onde ficam os SQLite de caminho relativo).
+        Assim outra instância ou outro checkout no mesmo diretório não recebe
+        corpos de outro banco com um ETag que coincide (as versões de bancos
+        diferentes se repetem).
+
+        Args:
+            app (Flask): Aplicação com a configuração
+
+        Returns:
+            str: Identidade do banco
+        """
+        namespace = app.config.get('RESPONSE_CACHE_NAMESPACE')
+        if namespace:
+            return namespace
+        origem = f"{app.config.get('SQLALCHEMY_DATABASE_URI')}|{app.instance_path}"
+        return hashlib.sha1(origem.encode('utf-8')).hexdigest()[:12]
+
+    @property
+    def backend(self):
+        return current_app.extensions.get('response_cache')
+
+    @staticmethod
+    def request_key():
+        """Chave da representação pedida (a mesma do ETag), no espaço do banco."""
+        return f"{current_app.extensions['response_cache_banco']}|{chave_representacao()}"
+
+    def cached(self, grupo, builder, headers=None):
+        """
+        Devolve a resposta em cache ou a gera com ``builder``.
+
+        Args:
+            grupo (str): Grupo de invalidação da resposta
+            builder (callable): Retorna ``(dados, status)`` quando não há cache
+            headers (dict, optional): Cabeçalhos adicionais da resposta; o
+                ETag, se houver, valida a entrada em cache
+
+        Returns:
+            Response: Resposta JSON, com o cabeçalho X-Cache (HIT ou MISS)
+        """
+        headers = dict(headers or {})
+        response = self._ler(grupo, headers)
+        if response is not None:
+            return response
+        data, status = builder()
+        return self._gravar(grupo, data, status, headers)
+
+    async def cached_async(self, grupo, builder, headers=None):
+        """
+        Como ``cached``, para as leituras assíncronas do servidor ASGI.
+
+        Args:
+            grupo (str): Grupo de invalidação da resposta
+            builder (callable): Corrotina que retorna ``(dados, status)``
+            headers (dict, optional): Cabeçalhos adicionais da resposta
+
+        Returns:
+            Response: Resposta JSON, com o cabeçalho X-Cache (HIT ou MISS)
+        """
+        headers = dict(headers or {})
+        response = self._ler(grupo, headers)
+        if response is not None:
+            return response
+        data, status = await builder()
+        return self._gravar(grupo, data, status, headers)
+
+    def _ler(self, grupo, headers):
+        """Resposta em cache com o mesmo ETag de ``headers``, ou None."""
+        backend = self.backend
+        if backend is None:
+            return None
+
+        entrada = backend.get(grupo, self.request_key())
+        if entrada is not None:
+            etag_gravado, _, body = entrada.partition(self._SEPARADOR)
+            if etag_gravado == headers.get('ETag', '').encode('utf-8'):
+                self.hits += 1
+                headers['X-Cache'] = 'HIT'
+                return current_app.response_class(body, 200, headers, mimetype='application/json')
+
+        self.misses += 1
+        headers['X-Cache'] = 'MISS'
+        return None
+
+    def _gravar(self, grupo, data, status, headers):
+        """Codifica a resposta gerada e a grava no cache, se bem-sucedida."""
+        response = json_response(data, status, headers)
+        backend = self.backend
+        if backend is not None and status == 200:
+            etag = headers.get('ETag', '').encode('utf-8')
+            backend.set(grupo, self.request_key(), etag + self._SEPARADOR + response.get_data())
+        return response
+
+    def invalidate(self, *grupos):
+        """Remove todas as respostas dos grupos informados."""
+        backend = self.backend
+        if backend is None:
+            return
+        for grupo in set(grupos):
+            backend.delete_group(grupo)
+
+    def clear(self):
+        """Remove todas as respostas em cache."""
+        if self.backend is not None:
+            self.backend.clear()
+
+    def stats(self):
+        """Contadores de acertos e falhas deste processo e ocupação do backend."""
+        backend = self.backend
+        stats = {
+            'backend': type(backend).__name__ if backend is not None else None,
+            'pid': os.getpid(),
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+        if backend is not None:
+            stats.update(backend.info())
+        return stats
@@ -0,0 +1,166 @@
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+
+# Normalização dos comandos: literais viram ? e listas do IN viram (...)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMERO = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_LISTA = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_VALORES = re.compile(r'(VALUES\s*)\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+', re.IGNORECASE)
+_ESPACOS = re.compile(r'\s+')
+
+# Comandos cujo plano de execução é capturado
+_COM_PLANO = re.compile(r'^\s*(SELECT|WITH|UPDATE|DELETE)\b', re.IGNORECASE)
+
+# Parâmetros gravados por comando (executemany pode ter milhares de linhas)
+MAX_PARAMETROS = 10
+
+TABELA_VIGIADA = 'imoveis'
+
+
+def fingerprint(statement):
+    """
+    Forma normalizada de um comando SQL, para agrupar execuções iguais.
+
+    Args:
+        statement (str): Comando SQL
+
+    Returns:
+        str: Comando sem literais, com listas de parâmetros e espaços colapsados
+    """
+    texto = _STRING.sub('?', statement).replace('%s', '?')
+    texto = _NUMERO.sub('?', texto)
+    texto = _ESPACOS.sub(' ', texto).strip()
+    texto = _LISTA.sub('(...)', texto)
+    return _VALORES.sub(r'\1(...)', texto)
+
+
+def plano_execucao(dbapi_connection, dialeto, statement, parameters):
+    """
+    Plano do comando: EXPLAIN QUERY PLAN no SQLite, EXPLAIN no MySQL.
+
+    O plano é lido em um cursor próprio da conexão DBAPI, sem passar pelos
+    eventos do SQLAlchemy.
+
+    Returns:
+        list: Linhas do plano (str no SQLite, dict no MySQL), ou None se o
+        comando não tiver plano ou o EXPLAIN falhar
+    """
+    if not _COM_PLANO.match(statement):
+        return None
+    if dialeto == 'sqlite':
+        prefixo = 'EXPLAIN QUERY PLAN '
+    elif dialeto == 'mysql':
+        prefixo = 'EXPLAIN '
+    else:
+        return None
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(prefixo + statement, parameters)
+        linhas = cursor.fetchall()
+        colunas = [coluna[0] for coluna in cursor.description or ()]
+    except Exception:
+        return None
+    finally:
+        cursor.close()
+    if dialeto == 'sqlite':
+        # (id, parent, notused, detail)
+        return [linha[-1] for linha in linhas]
+    return [dict(zip(colunas, linha)) for linha in linhas]
+
+
+def varredura_completa(plano, dialeto, tabela=TABELA_VIGIADA):
+    """
+    Indica se o plano lê a tabela inteira.
+
+    No SQLite, ``SCAN <tabela>`` (sem SEARCH) percorre todas as linhas ou um
+    índice inteiro; no MySQL, o tipo de acesso ``ALL`` ou ``index``.
+    """
+    if not plano:
+        return False
+    if dialeto == 'sqlite':
+        padrao = re.compile(rf'^SCAN {tabela}\b')
+        return any(padrao.match(linha) for linha in plano)
+    return any(linha.get('table') == tabela and linha.get('type') in ('ALL', 'index')
+               for linha in plano)
+
+
+def parametros_serializaveis(parameters, executemany):
+    """Parâmetros do comando em um formato gravável em JSON."""
+    if executemany:
+        return {'rows': len(parameters), 'sample': list(parameters[:MAX_PARAMETROS])}
+    return parameters
+
+
+class RegistroConsultasLentas:
+    """Grava as ocorrências em um arquivo JSON Lines, compartilhável entre workers."""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self._lock = threading.Lock()
+        pasta = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(pasta, exist_ok=True)
+
+    def gravar(self, ocorrencia):
+        agora = datetime.now(timezone.utc).isoformat(timespec='milliseconds')
+        linha = json.dumps(dict(ocorrencia, ts=agora, pid=os.getpid()),
+                           ensure_ascii=False, default=str) + '\n'
+        # Em modo append cada escrita vai para o fim do arquivo, mesmo com vários workers
+        with self._lock:
+            with open(self.caminho, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(linha)
+
+
+def ler_ocorrencias(caminho):
+    """
+    Lê as ocorrências gravadas (linhas inválidas são ignoradas).
+
+    Yields:
+        dict: Uma ocorrência por linha
+    """
+    with open(caminho, encoding='utf-8') as arquivo:
+        for linha in arquivo:
+            try:
+                yield json.loads(linha)
+            except ValueError:
+                continue
+
+
+def resumir_ocorrencias(ocorrencias):
+    """
+    Agrupa as ocorrências pelo fingerprint do comando.
+
+    Args:
+        ocorrencias (iterable): Ocorrências lidas com ``ler_ocorrencias``
+
+    Returns:
+        list: Um dict por fingerprint com a quantidade de execuções lentas, o
+        tempo total, médio e máximo (ms), as varreduras completas, as
+        repetições (N+1) e os endpoints, do maior tempo total para o menor
+    """
+    grupos = {}
+    for ocorrencia in ocorrencias:
+        grupo = grupos.setdefault(ocorrencia.get('fingerprint', ''), {
+            'fingerprint': ocorrencia.get('fingerprint', ''),
+            'lentas': 0, 'total_ms': 0.0, 'max_ms': 0.0,
+            'varreduras_completas': 0, 'repeticoes': 0, 'endpoints': set(),
+        })
+        if ocorrencia.get('endpoint'):
+            grupo['endpoints'].add(ocorrencia['endpoint'])
+        if ocorrencia.get('kind') == 'repeated':
+            grupo['repeticoes'] += 1
+            continue
+        duracao = ocorrencia.get('duration_ms', 0.0)
+        grupo['lentas'] += 1
+        grupo['total_ms'] += duracao
+        grupo['max_ms'] = max(grupo['max_ms'], duracao)
+        grupo['varreduras_completas'] += bool(ocorrencia.get('full_scan'))
+
+    resumo = []
+    for grupo in grupos.values():
+        grupo['media_ms'] = grupo['total_ms'] / grupo['lentas'] if grupo['lentas'] else 0.0
+        grupo['endpoints'] = sorted(grupo['endpoints'])
+        resumo.append(grupo)
+    return sorted(resumo, key=lambda g: (g['total_ms'], g['repeticoes']), reverse=True)
@@ -0,0 +1,107 @@
+from sqlalchemy import select, func, delete, insert
+from ..extensions import db
+from ..models.estatisticas import EstatisticaImoveis, DIALETOS_RESUMO
+from ..models.imovel import Imovel
+
+# Colunas pelas quais as estatísticas podem ser agrupadas
+AGRUPAMENTOS = ('cidade', 'tipo')
+
+
+def _consulta_resumo(agrupar, filtros):
+    """Agrega as linhas da tabela de resumo (uma por cidade e tipo)."""
+    tabela = EstatisticaImoveis
+    chaves = [getattr(tabela, coluna).label(coluna) for coluna in agrupar]
+    condicoes = [getattr(tabela, coluna) == (valor or '') for coluna, valor in filtros.items()]
+    return select(
+        *chaves,
+        func.coalesce(func.sum(tabela.quantidade), 0).label('quantidade'),
+        func.coalesce(func.sum(tabela.quantidade_valor), 0).label('quantidade_valor'),
+        func.sum(tabela.soma_valor).label('soma_valor'),
+        func.min(tabela.menor_valor).label('menor_valor'),
+        func.max(tabela.maior_valor).label('maior_valor'),
+    ).where(*condicoes).group_by(*chaves).order_by(*chaves)
+
+
+def _consulta_direta(agrupar, filtros):
+    """Agrega diretamente a tabela imoveis (bancos sem os gatilhos do resumo)."""
+    colunas = {'cidade': Imovel.cidade, 'tipo': func.coalesce(Imovel.tipo, '')}
+    chaves = [colunas[coluna].label(coluna) for coluna in agrupar]
+    condicoes = [colunas[coluna] == (valor or '') for coluna, valor in filtros.items()]
+    return select(
+        *chaves,
+        func.count().label('quantidade'),
+        func.count(Imovel.valor).label('quantidade_valor'),
+        func.sum(Imovel.valor).label('soma_valor'),
+        func.min(Imovel.valor).label('menor_valor'),
+        func.max(Imovel.valor).label('maior_valor'),
+    ).where(*condicoes).group_by(*chaves).order_by(*chaves)
+
+
+def estatisticas_valor(agrupar=(), filtros=None):
+    """
+    Quantidade, soma, mínimo, máximo e média de ``valor`` por grupo.
+
+    No SQLite e no MySQL os totais vêm da tabela de resumo mantida pelos
+    gatilhos, sem ler os imóveis; nos demais bancos a tabela imoveis é
+    agregada.
+
+    Args:
+        agrupar (iterable): Colunas do agrupamento (subconjunto de AGRUPAMENTOS);
+            vazio para os totais gerais
+        filtros (dict, optional): Coluna de AGRUPAMENTOS -> valor exigido
+
+    Returns:
+        list: Um dict por grupo, com as colunas do agrupamento e os totais
+    """
+    agrupar = list(agrupar)
+    filtros = filtros or {}
+    if db.session.get_bind().dialect.name in DIALETOS_RESUMO:
+        stmt = _consulta_resumo(agrupar, filtros)
+    else:
+        stmt = _consulta_direta(agrupar, filtros)
+
+    grupos = []
+    for row in db.session.execute(stmt):
+        grupo = {coluna: getattr(row, coluna) for coluna in agrupar}
+        if 'tipo' in grupo:
+            grupo['tipo'] = grupo['tipo'] or None
+        com_valor = row.quantidade_valor
+        grupo.update({
+            'count': row.quantidade,
+            'sum': row.soma_valor if com_valor else None,
+            'min': row.menor_valor,
+            'max': row.maior_valor,
+            'mean': row.soma_valor / com_valor if com_valor else None,
+        })
+        grupos.append(grupo)
+    return grupos
+
+
+def recalcular_estatisticas():
+    """
+    Recalcula a tabela de resumo a partir da tabela imoveis.
+
+    Corrige desvios acumulados (ex.: arredondamento das somas) e dados
+    gravados sem os gatilhos.
+
+    Returns:
+        int: Quantidade de grupos (cidade, tipo) gravados
+    """
+    recalcular_resumo()
+    db.session.commit()
+    return db.session.execute(
+        select(func.count()).select_from(EstatisticaImoveis.__table__)).scalar()
+
+
+def recalcular_resumo():
+    """Refaz a tabela de resumo na transação atual, sem commit."""
+    tipo = func.coalesce(Imovel.tipo, '')
+    origem = select(
+        Imovel.cidade, tipo, func.count(), func.count(Imovel.valor),
+        func.coalesce(func.sum(Imovel.valor), 0), func.min(Imovel.valor), func.max(Imovel.valor),
+    ).group_by(Imovel.cidade, tipo)
+    tabela = EstatisticaImoveis.__table__
+    db.session.execute(delete(tabela))
+    db.session.execute(insert(tabela).from_select(
+        ['cidade', 'tipo', 'quantidade', 'quantidade_valor', 'soma_valor',
+         'menor_valor', 'maior_valor'], origem))
@@ -0,0 +1,108 @@
+from sqlalchemy import insert, select, update, delete, func
+from ..extensions import db
+from ..models.imovel import Imovel
+from .versionamento import incrementar_versao
+
+# Colunas preenchidas pela API (as demais têm valor padrão no modelo)
+COLUNAS_DADOS = ('logradouro', 'tipo_logradouro', 'bairro', 'cidade', 'cep',
+                 'tipo', 'valor', 'data_aquisicao')
+
+def inserir_em_lote(rows):
+    """
+    Insere vários imóveis com um único executemany na transação atual.
+    
+    Todas as linhas são completadas com as mesmas colunas, para que o
+    SQLAlchemy envie um único lote ao banco. Registra a alteração: as linhas
+    recebem a nova versão da tabela, que também identifica o lote quando o
+    banco não devolve os IDs no próprio INSERT.
+    
+    Args:
+        rows (list): Dicionários já validados com os dados dos imóveis
+        
+    Returns:
+        list: IDs gerados, na mesma ordem das linhas
+    """
+    if not rows:
+        return []
+    
+    versao = incrementar_versao()
+    rows = [{coluna: row.get(coluna) for coluna in COLUNAS_DADOS} | {'versao': versao}
+            for row in rows]
+    
+    if db.engine.dialect.insert_executemany_returning:
+        # INSERT ... VALUES (...), (...) RETURNING id em lotes. O banco atribui
+        # IDs crescentes na ordem das linhas, então ordenar os IDs devolvidos
+        # reproduz a ordem dos parâmetros (sort_by_parameter_order faria o
+        # SQLite voltar a um INSERT por linha).
+        tabela = Imovel.__table__
+        stmt = insert(tabela).returning(tabela.c.id)
+        return sorted(db.session.scalars(stmt, rows))
+    
+    # Bancos sem RETURNING em lote (ex.: MySQL, em que o executemany do
+    # PyMySQL envia INSERTs de várias linhas). Os IDs novos são maiores que o
+    # maior ID anterior, e só as linhas deste lote têm a versão recém-obtida:
+    # uma busca pela chave primária lê os IDs na ordem das linhas, qualquer
+    # que seja o innodb_autoinc_lock_mode.
+    tabela = Imovel.__table__
+    anterior = db.session.scalar(select(func.max(tabela.c.id))) or 0
+    db.session.execute(insert(tabela), rows)
+    return list(db.session.scalars(
+        select(tabela.c.id)
+        .where(tabela.c.id > anterior, tabela.c.versao == versao)
+        .order_by(tabela.c.id)
+    ))
+
+def _estados_afetados(criteria):
+    """Lê ID, tipo e cidade das linhas que uma escrita em lote vai alterar."""
+    rows = db.session.execute(
+        select(Imovel.id, Imovel.tipo, Imovel.cidade).where(*criteria)
+    ).all()
+    return [{'id': row.id, 'tipo': row.tipo, 'cidade': row.cidade} for row in rows]
+
+def atualizar_em_lote(criteria, dados):
+    """
+    Atualiza todos os imóveis que atendem às condições com um único UPDATE.
+    
+    Se houver imóveis a alterar, registra a alteração: as linhas recebem a
+    nova versão da tabela.
+    
+    Args:
+        criteria (list): Condições que selecionam os imóveis
+        dados (dict): Campos já validados a serem alterados
+        
+    Returns:
+        tuple: (quantidade alterada, estados anteriores dos imóveis alterados)
+    """
+    estados = _estados_afetados(criteria)
+    if not estados:
+        return 0, []
+    result = db.session.execute(
+        update(Imovel)
+        .where(*criteria)
+        .values(versao=incrementar_versao(), **dados)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount, estados
+
+def remover_em_lote(criteria):
+    """
+    Remove todos os imóveis que atendem às condições com um único DELETE.
+    
+    Se houver imóveis a remover, registra a alteração (nova versão da tabela).
+    
+    Args:
+        criteria (list): Condições que selecionam os imóveis
+        
+    Returns:
+        tuple: (quantidade removida, estados anteriores dos imóveis removidos)
+    """
+    estados = _estados_afetados(criteria)
+    if not estados:
+        return 0, []
+    incrementar_versao()
+    result = db.session.execute(
+        delete(Imovel)
+        .where(*criteria)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount, estados
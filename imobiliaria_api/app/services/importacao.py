@@ -0,0 +1,373 @@
+import csv
+import json
+import re
+import time
+from contextlib import suppress
+from datetime import date
+from sqlalchemy import insert, delete
+from sqlalchemy.dialects import sqlite, mysql
+from sqlalchemy.exc import SQLAlchemyError
+from ..extensions import db
+from ..models.busca import DDL_BUSCA, DROP_BUSCA
+from ..models.estatisticas import (DDL_ESTATISTICAS, DROP_ESTATISTICAS, DIALETOS_RESUMO,
+                                   CARGA_SEM_GATILHOS)
+from ..models.imovel import Imovel
+from .busca import reindexar
+from .estatisticas import recalcular_resumo
+from .imoveis import COLUNAS_DADOS
+from .versionamento import incrementar_versao
+
+MODOS = ('substituir', 'inserir', 'upsert')
+FORMATOS = ('sql', 'csv', 'ndjson')
+
+# Tokens do SQL: strings, comentários, pontuação e palavras/números
+_TOKEN = re.compile(r"""
+      (?P<string>'(?:[^'\\]|''|\\.)*')
+    | (?P<comentario>--[^\n]*(?:\n|\Z)|/\*.*?\*/)
+    | (?P<espaco>\s+)
+    | (?P<pontuacao>[(),;])
+    | (?P<palavra>[^\s'(),;]+)
+""", re.VERBOSE | re.DOTALL)
+
+_ESCAPES = {'n': '\n', 'r': '\r', 't': '\t', '0': '\0', 'Z': '\x1a'}
+
+# Pragmas do SQLite usados durante a carga e seus valores de carga
+_PRAGMAS_CARGA = {'synchronous': 'OFF', 'temp_store': 'MEMORY', 'cache_size': '-200000'}
+
+
+# Gatilhos do índice de busca e do resumo das estatísticas (SQLite)
+_DROP_GATILHOS = [sql for sql in DROP_BUSCA + DROP_ESTATISTICAS if sql.startswith('DROP TRIGGER')]
+
+
+class ErroImportacao(ValueError):
+    """Linha de entrada que não pode ser importada."""
+
+
+def _tokens(stream, tamanho_bloco=65536):
+    """
+    Lê os tokens do SQL incrementalmente, bloco a bloco.
+
+    Um token que encosta no fim do bloco (string ou comentário ainda não
+    fechados, palavra cortada) só é emitido depois da leitura do próximo
+    bloco.
+    """
+    buffer = ''
+    fim = False
+    while not fim:
+        bloco = stream.read(tamanho_bloco)
+        fim = not bloco
+        buffer += bloco
+        pos = 0
+        while pos < len(buffer):
+            match = _TOKEN.match(buffer, pos)
+            if match is None and fim:
+                raise ErroImportacao(f'SQL inválido perto de: {buffer[pos:pos + 40]!r}')
+            incompleto = match is None or match.end() == len(buffer) or (
+                # ' logo após a string: era um '' cortado no meio
+                match.lastgroup == 'string' and buffer.startswith("'", match.end())) or (
+                match.lastgroup != 'comentario' and buffer.startswith('/*', pos))
+            if incompleto and not fim:
+                break
+            pos = match.end()
+            tipo = match.lastgroup
+            if tipo not in ('espaco', 'comentario'):
+                yield tipo, match.group()
+        buffer = buffer[pos:]
+
+
+def _valor_sql(tipo, texto):
+    """Converte um literal SQL em valor Python."""
+    if tipo == 'string':
+        conteudo = texto[1:-1].replace("''", "'")
+        if '\\' in conteudo:
+            conteudo = re.sub(r'\\(.)', lambda m: _ESCAPES.get(m.group(1), m.group(1)), conteudo)
+        return conteudo
+    maiusculo = texto.upper()
+    if maiusculo == 'NULL':
+        return None
+    if maiusculo in ('TRUE', 'FALSE'):
+        return int(maiusculo == 'TRUE')
+    try:
+        return int(texto)
+    except ValueError:
+        return float(texto)
+
+
+def ler_sql(stream):
+    """
+    Extrai as linhas dos comandos ``INSERT INTO imoveis`` de um script SQL.
+
+    O script é lido em blocos, sem carregar o arquivo inteiro; os demais
+    comandos (CREATE TABLE, comentários...) são ignorados. Valores com
+    ``);`` ou aspas dentro de strings são tratados corretamente.
+
+    Yields:
+        dict: Coluna -> valor de cada linha inserida
+    """
+    comando = []
+    for tipo, texto in _tokens(stream):
+        if texto != ';':
+            comando.append((tipo, texto))
+            continue
+        yield from _linhas_insert(comando)
+        comando = []
+    yield from _linhas_insert(comando)
+
+
+def _linhas_insert(comando):
+    """Linhas de um comando INSERT INTO imoveis já separado em tokens."""
+    try:
+        yield from _parse_insert(comando)
+    except IndexError:
+        raise ErroImportacao('Comando INSERT incompleto.')
+
+
+def _parse_insert(comando):
+    """Interpreta um INSERT INTO imoveis (colunas) VALUES (...), (...)."""
+    palavras = [texto.upper() for _, texto in comando[:3]]
+    if palavras[:2] != ['INSERT', 'INTO'] or len(palavras) < 3 \
+            or palavras[2].strip('`"') != Imovel.__tablename__.upper():
+        return
+
+    # Lista de colunas entre os primeiros parênteses
+    pos = 3
+    colunas = []
+    if comando[pos][1] == '(':
+        pos += 1
+        while comando[pos][1] != ')':
+            if comando[pos][1] != ',':
+                colunas.append(comando[pos][1].strip('`"'))
+            pos += 1
+        pos += 1
+    if not colunas:
+        raise ErroImportacao('O INSERT precisa informar a lista de colunas.')
+    if comando[pos][1].upper() != 'VALUES':
+        raise ErroImportacao('Apenas INSERT ... VALUES é suportado.')
+    pos += 1
+
+    # Um ou mais grupos de valores: (...), (...)
+    valores = []
+    for tipo, texto in comando[pos:]:
+        if texto == '(':
+            valores = []
+        elif texto == ')':
+            if len(valores) != len(colunas):
+                raise ErroImportacao(f'Esperados {len(colunas)} valores, encontrados {len(valores)}.')
+            yield dict(zip(colunas, valores))
+        elif texto != ',':
+            valores.append(_valor_sql(tipo, texto))
+
+
+def ler_csv(stream):
+    """
+    Lê linhas de um CSV com cabeçalho (campos vazios viram NULL).
+
+    Yields:
+        dict: Coluna -> valor de cada linha
+    """
+    for row in csv.DictReader(stream):
+        yield {k: (v if v != '' else None) for k, v in row.items()}
+
+
+def ler_ndjson(stream):
+    """
+    Lê um objeto JSON por linha.
+
+    Yields:
+        dict: Coluna -> valor de cada linha
+    """
+    for numero, linha in enumerate(stream, start=1):
+        if not linha.strip():
+            continue
+        try:
+            row = json.loads(linha)
+        except ValueError:
+            raise ErroImportacao(f'JSON inválido na linha {numero}.')
+        if not isinstance(row, dict):
+            raise ErroImportacao(f'A linha {numero} não é um objeto JSON.')
+        yield row
+
+
+LEITORES = {'sql': ler_sql, 'csv': ler_csv, 'ndjson': ler_ndjson}
+
+
+def normalizar(row):
+    """
+    Converte uma linha lida para as colunas e tipos da tabela.
+
+    Raises:
+        ErroImportacao: Se faltar um campo obrigatório ou um valor for inválido
+    """
+    dados = {coluna: row.get(coluna) for coluna in COLUNAS_DADOS}
+    for coluna in ('logradouro', 'cidade'):
+        if not dados[coluna]:
+            raise ErroImportacao(f'Campo obrigatório ausente: {coluna}')
+    try:
+        if dados['valor'] is not None:
+            dados['valor'] = float(dados['valor'])
+        if row.get('id') is not None:
+            dados['id'] = int(row['id'])
+    except (TypeError, ValueError):
+        raise ErroImportacao('valor e id devem ser numéricos.')
+    if dados['data_aquisicao'] is not None and not isinstance(dados['data_aquisicao'], date):
+        try:
+            dados['data_aquisicao'] = date.fromisoformat(str(dados['data_aquisicao']))
+        except ValueError:
+            raise ErroImportacao('data_aquisicao deve estar no formato AAAA-MM-DD.')
+    for coluna in COLUNAS_DADOS:
+        if coluna not in ('valor', 'data_aquisicao') and dados[coluna] is not None:
+            dados[coluna] = str(dados[coluna])
+    return dados
+
+
+def _comando_upsert(dialeto):
+    """INSERT que atualiza a linha existente quando o ID já existe."""
+    tabela = Imovel.__table__
+    if dialeto == 'sqlite':
+        stmt = sqlite.insert(tabela)
+        return stmt.on_conflict_do_update(
+            index_elements=[tabela.c.id],
+            set_={coluna: stmt.excluded[coluna] for coluna in COLUNAS_DADOS + ('versao',)})
+    if dialeto == 'mysql':
+        stmt = mysql.insert(tabela)
+        return stmt.on_duplicate_key_update(
+            {coluna: stmt.inserted[coluna] for coluna in COLUNAS_DADOS + ('versao',)})
+    raise ErroImportacao(f'O modo upsert não é suportado no banco {dialeto}.')
+
+
+def importar(linhas, modo='substituir', chunk_size=5000, ids_sequenciais=False, progresso=None):
+    """
+    Importa imóveis em uma única transação, em lotes de ``chunk_size``.
+
+    Cada lote é gravado com um único executemany e valores parametrizados.
+    No SQLite, pragmas de carga em massa ficam ativos durante a importação.
+    No modo substituir, os gatilhos da busca e das estatísticas são
+    trocados por uma reconstrução única no fim (ver _desligar_gatilhos).
+
+    Args:
+        linhas (iterable): Linhas lidas (ver LEITORES)
+        modo (str): 'substituir' (apaga a tabela antes), 'inserir' ou 'upsert' (por ID)
+        chunk_size (int): Quantidade de linhas por executemany
+        ids_sequenciais (bool): Usar a posição no arquivo (1, 2, ...) como ID
+        progresso (callable, optional): Chamado com (importadas, linhas/s) a cada lote
+
+    Returns:
+        dict: Totais de linhas importadas, rejeitadas e a taxa média
+
+    Raises:
+        ErroImportacao: Se o arquivo não puder ser lido; nada é gravado
+    """
+    if modo not in MODOS:
+        raise ErroImportacao(f"Modo inválido: {modo}. Use um de: {', '.join(MODOS)}.")
+
+    conn = db.session.connection()
+    dialeto = conn.dialect.name
+    if modo == 'upsert':
+        comando = _comando_upsert(dialeto)
+    else:
+        comando = insert(Imovel.__table__)
+
+    pragmas_originais = {}
+    if dialeto == 'sqlite':
+        for nome, valor in _PRAGMAS_CARGA.items():
+            pragmas_originais[nome] = conn.exec_driver_sql(f'PRAGMA {nome}').scalar()
+            conn.exec_driver_sql(f'PRAGMA {nome} = {valor}')
+
+    sem_gatilhos = modo == 'substituir' and dialeto in DIALETOS_RESUMO
+    inicio = time.perf_counter()
+    importadas = 0
+    erros = []
+    try:
+        # Todas as linhas gravadas recebem a nova versão da tabela (ETags).
+        # O UPDATE também abre a transação que inclui o DDL dos gatilhos.
+        versao = incrementar_versao()
+        if sem_gatilhos:
+            _desligar_gatilhos(conn)
+        if modo == 'substituir':
+            conn.execute(delete(Imovel.__table__))
+
+        lote = []
+        for posicao, row in enumerate(linhas, start=1):
+            try:
+                dados = normalizar(row)
+            except ErroImportacao as err:
+                erros.append((posicao, str(err)))
+                continue
+            dados['versao'] = versao
+            if ids_sequenciais:
+                dados['id'] = posicao
+            elif modo == 'upsert' and 'id' not in dados:
+                erros.append((posicao, 'O modo upsert exige a coluna id.'))
+                continue
+            lote.append(dados)
+            if len(lote) >= chunk_size:
+                importadas += _gravar(conn, comando, lote)
+                lote = []
+                if progresso:
+                    progresso(importadas, importadas / (time.perf_counter() - inicio))
+        if lote:
+            importadas += _gravar(conn, comando, lote)
+        if sem_gatilhos:
+            _religar_gatilhos(conn)
+
+        db.session.commit()
+    except Exception:
+        if sem_gatilhos and dialeto == 'mysql':
+            # A variável é da conexão, que volta ao pool: não desfeita pelo rollback
+            with suppress(SQLAlchemyError):
+                conn.exec_driver_sql(f'SET {CARGA_SEM_GATILHOS} = NULL')
+        db.session.rollback()
+        raise
+    finally:
+        if pragmas_originais:
+            conn = db.session.connection()
+            for nome, valor in pragmas_originais.items():
+                conn.exec_driver_sql(f'PRAGMA {nome} = {valor}')
+            db.session.commit()
+
+    duracao = time.perf_counter() - inicio
+    return {
+        'importadas': importadas,
+        'rejeitadas': len(erros),
+        'erros': erros,
+        'segundos': duracao,
+        'linhas_por_segundo': importadas / duracao if duracao else 0.0,
+    }
+
+
+def _desligar_gatilhos(conn):
+    """
+    Desliga os gatilhos da busca e das estatísticas na transação da carga.
+
+    Sem gatilhos, o SQLite apaga a tabela inteira sem percorrer as linhas,
+    e cada INSERT grava só a linha e os índices. No SQLite os gatilhos são
+    removidos (o DDL é transacional: um rollback os devolve); no MySQL,
+    cujo DDL encerra a transação, eles continuam na tabela e são pulados
+    enquanto a variável de sessão CARGA_SEM_GATILHOS estiver definida.
+    """
+    if conn.dialect.name == 'sqlite':
+        for sql in _DROP_GATILHOS:
+            conn.exec_driver_sql(sql)
+    else:
+        conn.exec_driver_sql(f'SET {CARGA_SEM_GATILHOS} = 1')
+
+
+def _religar_gatilhos(conn):
+    """Religa os gatilhos e refaz o índice de busca e o resumo uma única vez."""
+    if conn.dialect.name == 'sqlite':
+        for sql in DDL_BUSCA + DDL_ESTATISTICAS:
+            conn.exec_driver_sql(sql)
+        reindexar()
+    else:
+        conn.exec_driver_sql(f'SET {CARGA_SEM_GATILHOS} = NULL')
+    recalcular_resumo()
+
+
+def _gravar(conn, comando, lote):
+    """Grava um lote de linhas, agrupando as que têm as mesmas colunas."""
+    com_id = [row for row in lote if 'id' in row]
+    sem_id = [row for row in lote if 'id' not in row]
+    for grupo in (com_id, sem_id):
+        if grupo:
+            conn.execute(comando, grupo)
+    return len(lote)
@@ -0,0 +1,203 @@
+import os
+import time
+from flask import Response, current_app, g, has_app_context, request
+from sqlalchemy.exc import SQLAlchemyError
+
+# Faixas (s) do histograma de latência das requisições
+FAIXAS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Intervalo mínimo (s) entre duas leituras do pool em um mesmo worker
+INTERVALO_POOL = 1.0
+
+# Diretório dos arquivos do modo multiprocesso do prometheus_client
+VARIAVEL_MULTIPROCESSO = 'PROMETHEUS_MULTIPROC_DIR'
+
+_metricas = None
+_registro = None
+
+
+class Metricas:
+    """
+    Métricas de requisições e do pool de conexões deste processo.
+
+    No modo multiprocesso (PROMETHEUS_MULTIPROC_DIR definido antes da
+    primeira importação do prometheus_client), cada worker grava os valores
+    em arquivos próprios no diretório e o /metrics de qualquer worker soma
+    os arquivos de todos. Os gauges usam ``livesum``: somam apenas os
+    workers vivos.
+    """
+
+    def __init__(self):
+        from prometheus_client import Counter, Gauge, Histogram
+
+        self.requisicoes = Counter(
+            'imobiliaria_http_requests_total', 'Requisições atendidas',
+            ['method', 'endpoint', 'status'])
+        self.latencia = Histogram(
+            'imobiliaria_http_request_duration_seconds', 'Duração das requisições',
+            ['method', 'endpoint'], buckets=FAIXAS_LATENCIA)
+        self.em_andamento = Gauge(
+            'imobiliaria_http_requests_in_progress', 'Requisições em andamento',
+            ['method', 'endpoint'], multiprocess_mode='livesum')
+        self.pool_conexoes = Gauge(
+            'imobiliaria_db_pool_connections', 'Conexões do pool por estado',
+            ['bind', 'state'], multiprocess_mode='livesum')
+        self.pool_tamanho = Gauge(
+            'imobiliaria_db_pool_size', 'Tamanho configurado do pool',
+            ['bind'], multiprocess_mode='livesum')
+        self.pool_timeouts = Gauge(
+            'imobiliaria_db_pool_timeouts', 'Checkouts que esgotaram o pool_timeout',
+            ['bind'], multiprocess_mode='livesum')
+
+
+class ColetorLinhas:
+    """
+    Quantidade de imóveis por tipo, lida no momento da coleta.
+
+    Usa ``estatisticas_valor`` (no SQLite, a tabela de resumo mantida pelos
+    gatilhos) e guarda o resultado por METRICS_ROWS_TTL segundos, para que
+    coletas frequentes não consultem o banco.
+    """
+
+    def describe(self):
+        # Sem consultar o banco no registro do coletor
+        return []
+
+    def collect(self):
+        from prometheus_client.core import GaugeMetricFamily
+
+        if not has_app_context():
+            return
+        from .estatisticas import estatisticas_valor
+
+        app = current_app._get_current_object()
+        expira_em, grupos = app.extensions.get('metricas_linhas', (0, None))
+        if grupos is None or expira_em < time.monotonic():
+            try:
+                grupos = [(grupo['tipo'] or '', grupo['count'])
+                          for grupo in estatisticas_valor(agrupar=['tipo'])]
+            except SQLAlchemyError:
+                app.logger.warning('Não foi possível contar os imóveis para /metrics',
+                                   exc_info=True)
+                return
+            ttl = app.config.get('METRICS_ROWS_TTL', 15)
+            app.extensions['metricas_linhas'] = (time.monotonic() + ttl, grupos)
+
+        familia = GaugeMetricFamily('imobiliaria_imoveis', 'Imóveis cadastrados por tipo',
+                                    labels=['tipo'])
+        for tipo, quantidade in grupos:
+            familia.add_metric([tipo], quantidade)
+        yield familia
+
+
+def metricas():
+    """Métricas do processo, criadas na primeira chamada."""
+    global _metricas
+    if _metricas is None:
+        _metricas = Metricas()
+    return _metricas
+
+
+def registro_coleta():
+    """
+    Registro lido pelo /metrics: os arquivos de todos os workers no modo
+    multiprocesso, ou o registro padrão do processo.
+    """
+    global _registro
+    if _registro is None:
+        from prometheus_client import REGISTRY, CollectorRegistry, multiprocess
+
+        if os.environ.get(VARIAVEL_MULTIPROCESSO):
+            _registro = CollectorRegistry()
+            multiprocess.MultiProcessCollector(_registro)
+        else:
+            _registro = REGISTRY
+        _registro.register(ColetorLinhas())
+    return _registro
+
+
+def processo_encerrado(pid):
+    """Remove dos gauges ``livesum`` os valores de um worker encerrado."""
+    if not os.environ.get(VARIAVEL_MULTIPROCESSO):
+        return
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(pid)
+
+
+def atualizar_pool(db):
+    """Copia a ocupação dos pools deste worker para os gauges."""
+    from .pool import pool_stats
+
+    m = metricas()
+    for bind, engine in db.engines.items():
+        stats = pool_stats(engine)
+        if 'size' not in stats:
+            continue
+        nome = bind or 'default'
+        m.pool_conexoes.labels(nome, 'in_use').set(stats['checked_out'])
+        m.pool_conexoes.labels(nome, 'idle').set(stats['checked_in'])
+        m.pool_conexoes.labels(nome, 'overflow').set(stats['overflow'])
+        m.pool_tamanho.labels(nome).set(stats['size'])
+        if 'timeouts' in stats:
+            m.pool_timeouts.labels(nome).set(stats['timeouts'])
+
+
+def init_app(app, db):
+    """
+    Expõe /metrics no formato de texto do Prometheus quando METRICS_ENABLED.
+
+    Cada requisição conta no total por método, endpoint e status, no
+    histograma de latência e no gauge de requisições em andamento. A
+    ocupação do pool é copiada para os gauges ao fim do contexto da
+    aplicação (já com as conexões devolvidas), no máximo uma vez por segundo
+    em cada worker, e a cada coleta no worker que a atende.
+
+    Args:
+        app (Flask): Aplicação
+        db (SQLAlchemy): Extensão com os engines dos pools
+    """
+    if not app.config.get('METRICS_ENABLED'):
+        return
+    m = metricas()
+    registro = registro_coleta()
+    ultima_leitura_pool = [0.0]
+
+    def rotulos():
+        return request.method, request.endpoint or 'sem_rota'
+
+    @app.before_request
+    def iniciar_requisicao():
+        g._metricas_inicio = time.perf_counter()
+        g._metricas_rotulos = rotulos()
+        m.em_andamento.labels(*g._metricas_rotulos).inc()
+
+    @app.after_request
+    def registrar_requisicao(response):
+        inicio = g.pop('_metricas_inicio', None)
+        if inicio is not None:
+            metodo, endpoint = rotulos()
+            m.latencia.labels(metodo, endpoint).observe(time.perf_counter() - inicio)
+            m.requisicoes.labels(metodo, endpoint, str(response.status_code)).inc()
+        return response
+
+    @app.teardown_request
+    def encerrar_requisicao(exc):
+        rotulo = g.pop('_metricas_rotulos', None)
+        if rotulo is not None:
+            m.em_andamento.labels(*rotulo).dec()
+
+    def ler_pool(exc):
+        agora = time.monotonic()
+        if agora - ultima_leitura_pool[0] >= INTERVALO_POOL:
+            ultima_leitura_pool[0] = agora
+            atualizar_pool(db)
+
+    # Executado por último (a lista é percorrida de trás para frente), depois
+    # que o Flask-SQLAlchemy devolve as conexões da sessão ao pool
+    app.teardown_appcontext_funcs.insert(0, ler_pool)
+
+    @app.route('/metrics', endpoint='metrics')
+    def metrics():
+        from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+        atualizar_pool(db)
+        return Response(generate_latest(registro), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,144 @@
+import os
+import threading
+import time
+import weakref
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+# Engines cujos pools devem ser recriados nos processos filhos após um fork
+_engines = weakref.WeakSet()
+
+
+class EstatisticasPool:
+    """Contadores de uso de um pool de conexões, mantidos por processo."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.conexoes_abertas = 0
+            self.espera_total = 0.0
+            self.espera_maxima = 0.0
+
+    def registrar_checkout(self, espera, timeout=False):
+        with self._lock:
+            if timeout:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+
+    def registrar_conexao(self):
+        with self._lock:
+            self.conexoes_abertas += 1
+
+    def info(self):
+        with self._lock:
+            return {
+                'checkouts': self.checkouts,
+                'timeouts': self.timeouts,
+                'connections_opened': self.conexoes_abertas,
+                'wait_total_ms': round(self.espera_total * 1000, 3),
+                'wait_avg_ms': round(self.espera_total * 1000 / self.checkouts, 3)
+                if self.checkouts else 0.0,
+                'wait_max_ms': round(self.espera_maxima * 1000, 3),
+            }
+
+
+class QueuePoolMonitorado(QueuePool):
+    """
+    QueuePool que mede o tempo de espera de cada checkout.
+
+    A espera inclui o tempo bloqueado aguardando uma conexão livre quando
+    ``pool_size + max_overflow`` conexões já estão em uso, e também o tempo
+    de abertura de uma conexão nova.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estatisticas = EstatisticasPool()
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            conexao = super()._do_get()
+        except PoolTimeoutError:
+            self.estatisticas.registrar_checkout(time.perf_counter() - inicio, timeout=True)
+            raise
+        self.estatisticas.registrar_checkout(time.perf_counter() - inicio)
+        return conexao
+
+    def recreate(self):
+        # dispose() recria o pool; os contadores continuam no novo
+        novo = super().recreate()
+        novo.estatisticas = self.estatisticas
+        return novo
+
+
+def monitorar_engine(engine):
+    """
+    Registra o engine para estatísticas e para ser descartado após um fork.
+
+    Após o fork de um worker do gunicorn, o processo filho recria o pool sem
+    fechar as conexões herdadas (``dispose(close=False)``), que continuam
+    pertencendo ao processo principal.
+
+    Args:
+        engine (Engine): Engine com pool de conexões
+    """
+    if not isinstance(engine.pool, QueuePool):
+        return
+    _engines.add(engine)
+
+    if isinstance(engine.pool, QueuePoolMonitorado):
+        @event.listens_for(engine, 'connect')
+        def contar_conexao(dbapi_connection, connection_record):
+            estatisticas = getattr(engine.pool, 'estatisticas', None)
+            if estatisticas is not None:
+                estatisticas.registrar_conexao()
+
+
+def descartar_pools():
+    """Recria os pools de todos os engines registrados (uso após um fork)."""
+    for engine in list(_engines):
+        engine.dispose(close=False)
+        estatisticas = getattr(engine.pool, 'estatisticas', None)
+        if estatisticas is not None:
+            estatisticas.reset()
+
+
+def pool_stats(engine):
+    """
+    Ocupação atual e contadores do pool de um engine neste processo.
+
+    Args:
+        engine (Engine): Engine a ser inspecionado
+
+    Returns:
+        dict: Tamanho, conexões em uso e, para o QueuePoolMonitorado,
+        checkouts e tempos de espera
+    """
+    pool = engine.pool
+    stats = {'pool': type(pool).__name__, 'pid': os.getpid()}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'checked_out': pool.checkedout(),
+            'checked_in': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+        })
+    estatisticas = getattr(pool, 'estatisticas', None)
+    if estatisticas is not None:
+        stats.update(estatisticas.info())
+    return stats
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=descartar_pools)
@@ -0,0 +1,60 @@
+"""
+Worker gthread do gunicorn que recicla sem derrubar conexões keep-alive.
+
+No ``ThreadWorker`` do gunicorn, ao atingir ``max_requests`` o worker sai
+do laço principal logo após a resposta em curso. As conexões keep-alive
+ociosas são fechadas com o processo, mesmo as que já trazem a próxima
+requisição do cliente, que recebe a conexão encerrada sem resposta.
+
+Aqui o worker entra em drenagem: deixa de aceitar conexões (os demais
+workers atendem as novas), responde às requisições das conexões abertas
+com ``Connection: close`` e só encerra quando todas foram fechadas, pelo
+cliente ou pelo tempo de keep-alive.
+
+Uso (gunicorn.conf.py): worker_class = 'app.services.reciclagem.ThreadWorker'
+"""
+import sys
+
+from gunicorn.workers import gthread
+
+
+class ThreadWorker(gthread.ThreadWorker):
+    """ThreadWorker com reciclagem por ``max_requests`` em drenagem."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # O limite (com o jitter) passa a ser controlado aqui: o da classe
+        # base encerraria o worker com as conexões keep-alive abertas
+        self.limite_requisicoes = self.max_requests
+        self.max_requests = sys.maxsize
+        self.drenando = False
+
+    def handle_request(self, req, conn):
+        keepalive = super().handle_request(req, conn)
+        if self.nr >= self.limite_requisicoes and not self.drenando:
+            self.drenar()
+        return keepalive
+
+    def drenar(self):
+        """Para de aceitar conexões e de mantê-las abertas após cada resposta."""
+        self.log.info("Autorestarting worker after draining keep-alive connections.")
+        with self._lock:
+            self.drenando = True
+            # Com o limite zerado, toda resposta sai com Connection: close
+            self.max_keepalived = 0
+            for sock in self.sockets:
+                try:
+                    self.poller.unregister(sock)
+                except (KeyError, ValueError):
+                    pass
+
+    def murder_keepalived(self):
+        # Chamado a cada volta do laço principal: fecha as conexões ociosas
+        # há mais que o keep-alive e, na drenagem, encerra o worker quando
+        # não restam conexões abertas nem requisições em andamento
+        super().murder_keepalived()
+        if self.drenando:
+            with self._lock:
+                vazio = not self._keep
+            if vazio and not self.futures:
+                self.alive = False
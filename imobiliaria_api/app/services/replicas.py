@@ -0,0 +1,208 @@
+import itertools
+import threading
+import time
+from flask import g, request, current_app, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event, text
+from sqlalchemy.sql.dml import UpdateBase
+
+# Métodos HTTP que não alteram dados
+_METODOS_LEITURA = ('GET', 'HEAD', 'OPTIONS')
+
+
+class RoutingSession(Session):
+    """
+    Sessão que envia as leituras para a réplica escolhida na requisição.
+
+    Escritas (INSERT/UPDATE/DELETE e flush do ORM) vão sempre para o banco
+    principal, mesmo em uma requisição marcada para réplica.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and not isinstance(clause, UpdateBase) \
+                and has_app_context():
+            chave = g.get('db_bind')
+            if chave is not None:
+                return self._db.engines[chave]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+class _Replica:
+    """Estado de saúde de uma réplica neste processo."""
+
+    def __init__(self, chave):
+        self.chave = chave
+        self.indisponivel_ate = 0.0
+        self.verificada_em = 0.0
+        self.falhas = 0
+        self.leituras = 0
+
+
+class ReplicaRouter:
+    """
+    Distribui as leituras entre as réplicas configuradas em SQLALCHEMY_BINDS.
+
+    As réplicas são escolhidas em rodízio. Cada uma é verificada com um
+    ``SELECT 1`` a cada REPLICA_HEALTH_INTERVAL segundos; uma réplica que
+    falha fica fora do rodízio por REPLICA_RETRY_AFTER segundos. Sem réplicas
+    disponíveis, as leituras vão para o banco principal.
+
+    Após uma escrita, o cliente recebe um cookie que mantém suas leituras no
+    banco principal por REPLICA_STICKY_SECONDS (ler as próprias escritas
+    apesar do atraso de replicação).
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Registra as réplicas da aplicação e o cookie de leitura no principal."""
+        prefixo = app.config.get('REPLICA_BIND_PREFIX', 'replica')
+        chaves = [chave for chave in (app.config.get('SQLALCHEMY_BINDS') or {})
+                  if chave and chave.startswith(prefixo)]
+        app.extensions['replicas'] = {
+            'replicas': [_Replica(chave) for chave in sorted(chaves)],
+            'rodizio': itertools.count(),
+            'lock': threading.Lock(),
+        }
+        app.after_request(self._marcar_escrita)
+
+    def init_engines(self, app, db):
+        """Tira do rodízio as réplicas cujas conexões caírem durante o uso."""
+        retry = app.config.get('REPLICA_RETRY_AFTER', 30)
+        for replica in app.extensions['replicas']['replicas']:
+            event.listen(db.engines[replica.chave], 'handle_error',
+                         self._ao_desconectar(replica, retry))
+            # As réplicas não têm modelos próprios: o create_all/drop_all
+            # (inclusive de outras aplicações do processo) não deve vê-las
+            db.metadatas.pop(replica.chave, None)
+
+    @staticmethod
+    def _ao_desconectar(replica, retry):
+        def handle_error(context):
+            if context.is_disconnect:
+                replica.falhas += 1
+                replica.indisponivel_ate = time.monotonic() + retry
+        return handle_error
+
+    @property
+    def _estado(self):
+        return current_app.extensions['replicas']
+
+    def escolher(self):
+        """
+        Escolhe a réplica das leituras da requisição atual.
+
+        Returns:
+            str: Bind da réplica, ou None para usar o banco principal
+        """
+        for replica in self._candidatas():
+            if self._disponivel(replica):
+                return self._escolhida(replica)
+        return None
+
+    async def escolher_async(self, engines):
+        """
+        Como ``escolher``, verificando a saúde pelos engines assíncronos.
+
+        Usado pelo servidor ASGI: um ``SELECT 1`` síncrono em uma réplica fora
+        do ar pararia o laço de eventos até o timeout de conexão.
+
+        Args:
+            engines (dict): Engine assíncrono de cada réplica, pelo bind
+
+        Returns:
+            str: Bind da réplica, ou None para usar o banco principal
+        """
+        for replica in self._candidatas():
+            if self._fora_do_rodizio(replica):
+                continue
+            if self._reservar_verificacao(replica):
+                try:
+                    async with engines[replica.chave].connect() as conn:
+                        await conn.execute(text('SELECT 1'))
+                except Exception:
+                    self._registrar_falha(replica)
+                    continue
+            return self._escolhida(replica)
+        return None
+
+    def _candidatas(self):
+        """Réplicas na ordem do rodízio (nenhuma se o cliente lê do principal)."""
+        replicas = self._estado['replicas']
+        if not replicas or self.leitura_no_principal():
+            return []
+        inicio = next(self._estado['rodizio'])
+        return [replicas[(inicio + deslocamento) % len(replicas)]
+                for deslocamento in range(len(replicas))]
+
+    @staticmethod
+    def _escolhida(replica):
+        replica.leituras += 1
+        return replica.chave
+
+    def _disponivel(self, replica):
+        """Verifica a saúde da réplica, no máximo uma vez por intervalo."""
+        if self._fora_do_rodizio(replica):
+            return False
+        if not self._reservar_verificacao(replica):
+            return True
+        try:
+            engine = current_app.extensions['sqlalchemy'].engines[replica.chave]
+            with engine.connect() as conn:
+                conn.execute(text('SELECT 1'))
+        except Exception:
+            self._registrar_falha(replica)
+            return False
+        return True
+
+    @staticmethod
+    def _fora_do_rodizio(replica):
+        return replica.indisponivel_ate > time.monotonic()
+
+    def _reservar_verificacao(self, replica):
+        """Indica se cabe a esta requisição verificar a réplica (uma por intervalo)."""
+        agora = time.monotonic()
+        intervalo = current_app.config.get('REPLICA_HEALTH_INTERVAL', 5)
+        with self._estado['lock']:
+            if agora - replica.verificada_em < intervalo:
+                return False
+            replica.verificada_em = agora
+        return True
+
+    @staticmethod
+    def _registrar_falha(replica):
+        """Tira a réplica do rodízio por REPLICA_RETRY_AFTER segundos."""
+        current_app.logger.warning('Réplica %s indisponível', replica.chave, exc_info=True)
+        replica.falhas += 1
+        replica.indisponivel_ate = time.monotonic() + current_app.config.get('REPLICA_RETRY_AFTER', 30)
+
+    @staticmethod
+    def leitura_no_principal():
+        """Indica se o cliente escreveu recentemente (cookie de aderência)."""
+        cookie = current_app.config.get('REPLICA_STICKY_COOKIE', 'db_primary_until')
+        try:
+            return float(request.cookies.get(cookie, 0)) > time.time()
+        except ValueError:
+            return False
+
+    def _marcar_escrita(self, response):
+        """Após uma escrita bem-sucedida, mantém o cliente no banco principal."""
+        segundos = current_app.config.get('REPLICA_STICKY_SECONDS', 5)
+        if request.method not in _METODOS_LEITURA and response.status_code < 400 \
+                and segundos and self._estado['replicas']:
+            cookie = current_app.config.get('REPLICA_STICKY_COOKIE', 'db_primary_until')
+            response.set_cookie(cookie, f'{time.time() + segundos:.3f}', max_age=segundos,
+                                httponly=True, samesite='Lax')
+        return response
+
+    def info(self):
+        """Estado de cada réplica neste processo."""
+        agora = time.monotonic()
+        return [{
+            'bind': replica.chave,
+            'healthy': replica.indisponivel_ate <= agora,
+            'reads': replica.leituras,
+            'failures': replica.falhas,
+        } for replica in self._estado['replicas']]
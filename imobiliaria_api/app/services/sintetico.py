@@ -0,0 +1,88 @@
+import itertools
+import random
+from datetime import date, timedelta
+
+# Cidades e o prefixo de 2 dígitos do CEP de cada uma. A ordem define a
+# popularidade: o peso da cidade na posição n é 1 / n ** EXPOENTE_CIDADES
+CIDADES = [
+    ('São Paulo', '01'), ('Rio de Janeiro', '20'), ('Belo Horizonte', '30'),
+    ('Brasília', '70'), ('Salvador', '40'), ('Fortaleza', '60'), ('Curitiba', '80'),
+    ('Recife', '50'), ('Porto Alegre', '90'), ('Manaus', '69'), ('Belém', '66'),
+    ('Goiânia', '74'), ('Campinas', '13'), ('São Luís', '65'), ('Maceió', '57'),
+    ('Natal', '59'), ('Teresina', '64'), ('Campo Grande', '79'), ('João Pessoa', '58'),
+    ('Florianópolis', '88'), ('Cuiabá', '78'), ('Aracaju', '49'), ('Vitória', '29'),
+    ('Londrina', '86'), ('Joinville', '89'), ('Santos', '11'), ('Ribeirão Preto', '14'),
+    ('Uberlândia', '38'), ('Sorocaba', '18'), ('Niterói', '24'),
+]
+EXPOENTE_CIDADES = 1.1
+
+# Tipo -> (peso, valor mediano)
+TIPOS = {
+    'apartamento': (50, 450000.0),
+    'casa': (25, 600000.0),
+    'casa em condominio': (12, 900000.0),
+    'terreno': (8, 250000.0),
+    'sala comercial': (5, 350000.0),
+}
+
+BAIRROS = [
+    'Centro', 'Jardim América', 'Vila Nova', 'Boa Vista', 'Santa Cruz', 'São José',
+    'Jardim Europa', 'Bela Vista', 'Liberdade', 'Industrial', 'Santo Antônio',
+    'Vila Mariana', 'Cidade Nova', 'Jardim das Flores', 'Parque Industrial',
+    'Alto da Boa Vista', 'Vila Operária', 'Santa Mônica', 'Jardim Paulista', 'Aeroporto',
+]
+LOGRADOUROS = ['Rua', 'Rua', 'Rua', 'Avenida', 'Avenida', 'Travessa', 'Alameda', 'Praça']
+NOMES = [
+    'das Flores', 'Brasil', 'São João', 'Sete de Setembro', 'XV de Novembro',
+    'Tiradentes', 'Dom Pedro II', 'Santos Dumont', 'Marechal Deodoro', 'Getúlio Vargas',
+    'das Palmeiras', 'Rui Barbosa', 'Castro Alves', 'da Paz', 'Independência',
+    'Barão do Rio Branco', 'José Bonifácio', 'Duque de Caxias', 'Floriano Peixoto', 'Goiás',
+]
+
+INICIO_AQUISICOES = date(2000, 1, 1)
+FIM_AQUISICOES = date(2024, 12, 31)
+
+
+def _acumulados(pesos):
+    return list(itertools.accumulate(pesos))
+
+
+def gerar_imoveis(quantidade, semente=42):
+    """
+    Gera imóveis sintéticos com distribuições assimétricas.
+
+    Poucas cidades concentram a maior parte dos imóveis (lei de Zipf), os
+    tipos seguem pesos fixos (metade apartamentos) e os valores seguem uma
+    distribuição log-normal em torno da mediana do tipo. A mesma semente
+    gera sempre os mesmos imóveis.
+
+    Args:
+        quantidade (int): Quantidade de imóveis
+        semente (int): Semente do gerador aleatório
+
+    Yields:
+        dict: Colunas de um imóvel, no formato aceito por ``importar``
+    """
+    aleatorio = random.Random(semente)
+    pesos_cidades = _acumulados(1 / n ** EXPOENTE_CIDADES for n in range(1, len(CIDADES) + 1))
+    pesos_tipos = _acumulados(peso for peso, _ in TIPOS.values())
+    pesos_bairros = _acumulados(1 / n for n in range(1, len(BAIRROS) + 1))
+    tipos = list(TIPOS)
+    dias = (FIM_AQUISICOES - INICIO_AQUISICOES).days
+
+    for _ in range(quantidade):
+        cidade, prefixo = aleatorio.choices(CIDADES, cum_weights=pesos_cidades)[0]
+        tipo = aleatorio.choices(tipos, cum_weights=pesos_tipos)[0]
+        tipo_logradouro = aleatorio.choice(LOGRADOUROS)
+        # Aquisições mais recentes são mais frequentes
+        dia = int(aleatorio.triangular(0, dias, dias))
+        yield {
+            'logradouro': f'{tipo_logradouro} {aleatorio.choice(NOMES)}, {aleatorio.randrange(1, 3000)}',
+            'tipo_logradouro': tipo_logradouro,
+            'bairro': aleatorio.choices(BAIRROS, cum_weights=pesos_bairros)[0],
+            'cidade': cidade,
+            'cep': f'{prefixo}{aleatorio.randrange(1000):03d}-{aleatorio.randrange(1000):03d}',
+            'tipo': tipo,
+            'valor': round(TIPOS[tipo][1] * aleatorio.lognormvariate(0, 0.5), 2),
+            'data_aquisicao': INICIO_AQUISICOES + timedelta(days=dia),
+        }
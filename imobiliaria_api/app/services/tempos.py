@@ -0,0 +1,159 @@
+import json
+import logging
+import time
+from contextlib import nullcontext
+from contextvars import ContextVar
+from flask import request
+from sqlalchemy import event
+
+# Fases medidas em cada requisição, na ordem do cabeçalho Server-Timing
+FASES = ('sql', 'dump', 'links', 'json')
+
+# Medição da requisição em andamento (None quando desligada)
+_atual = ContextVar('tempos_requisicao', default=None)
+
+# Contexto sem efeito devolvido por medir() quando não há medição
+_NULO = nullcontext()
+
+
+class TemposRequisicao:
+    """Tempo acumulado em cada fase e quantidade de comandos SQL da requisição."""
+
+    __slots__ = ('inicio', 'duracoes', 'consultas')
+
+    def __init__(self):
+        self.inicio = time.perf_counter()
+        self.duracoes = dict.fromkeys(FASES, 0.0)
+        self.consultas = 0
+
+
+class _Fase:
+    __slots__ = ('tempos', 'nome', 'inicio')
+
+    def __init__(self, tempos, nome):
+        self.tempos = tempos
+        self.nome = nome
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.tempos.duracoes[self.nome] += time.perf_counter() - self.inicio
+
+
+def medir(fase):
+    """
+    Contexto que soma o tempo do bloco à fase da requisição atual.
+
+    Sem medição em andamento (REQUEST_TIMING desligado ou fora de uma
+    requisição) devolve um contexto vazio.
+
+    Args:
+        fase (str): Uma das FASES
+    """
+    tempos = _atual.get()
+    if tempos is None:
+        return _NULO
+    return _Fase(tempos, fase)
+
+
+def _antes_do_cursor(conn, cursor, statement, parameters, context, executemany):
+    if _atual.get() is not None:
+        context._tempos_inicio = time.perf_counter()
+
+
+def _depois_do_cursor(conn, cursor, statement, parameters, context, executemany):
+    tempos = _atual.get()
+    inicio = getattr(context, '_tempos_inicio', None)
+    if tempos is None or inicio is None:
+        return
+    tempos.duracoes['sql'] += time.perf_counter() - inicio
+    tempos.consultas += 1
+
+
+def observar_engine(engine):
+    """
+    Soma à fase 'sql' da requisição os comandos executados pelo engine.
+
+    Args:
+        engine (Engine): Engine a observar (ou o ``sync_engine`` de um
+            engine assíncrono)
+    """
+    if not event.contains(engine, 'before_cursor_execute', _antes_do_cursor):
+        event.listen(engine, 'before_cursor_execute', _antes_do_cursor)
+        event.listen(engine, 'after_cursor_execute', _depois_do_cursor)
+
+
+def server_timing(tempos, total):
+    """
+    Valor do cabeçalho Server-Timing (durações em ms).
+
+    Args:
+        tempos (TemposRequisicao): Medição da requisição
+        total (float): Duração total da requisição, em segundos
+
+    Returns:
+        str: Ex.: 'sql;dur=1.20;desc="comandos=3", dump;dur=0.40, ..., total;dur=2.90'
+    """
+    partes = []
+    for fase in FASES:
+        parte = f'{fase};dur={tempos.duracoes[fase] * 1000:.2f}'
+        if fase == 'sql':
+            parte += f';desc="comandos={tempos.consultas}"'
+        partes.append(parte)
+    partes.append(f'total;dur={total * 1000:.2f}')
+    return ', '.join(partes)
+
+
+def init_app(app, db):
+    """
+    Mede as fases de cada requisição quando REQUEST_TIMING está ligado.
+
+    As durações de SQL (e a quantidade de comandos), serialização, links
+    HATEOAS e codificação JSON vão no cabeçalho Server-Timing e em uma
+    linha de log em JSON. Desligado, nenhum gancho é registrado e medir()
+    devolve um contexto vazio.
+
+    Args:
+        app (Flask): Aplicação
+        db (SQLAlchemy): Extensão com os engines a observar
+    """
+    if not app.config.get('REQUEST_TIMING'):
+        return
+    # A linha de log das medições é registrada no nível INFO
+    if app.logger.getEffectiveLevel() > logging.INFO:
+        app.logger.setLevel(logging.INFO)
+
+    with app.app_context():
+        for engine in db.engines.values():
+            observar_engine(engine)
+
+    def iniciar_medicao():
+        _atual.set(TemposRequisicao())
+    
+    # Antes dos demais before_request, para incluí-los no total
+    app.before_request_funcs.setdefault(None, []).insert(0, iniciar_medicao)
+
+    @app.after_request
+    def registrar_medicao(response):
+        tempos = _atual.get()
+        if tempos is None:
+            return response
+        total = time.perf_counter() - tempos.inicio
+        response.headers['Server-Timing'] = server_timing(tempos, total)
+        registro = {
+            'method': request.method,
+            'path': request.path,
+            'endpoint': request.endpoint,
+            'status': response.status_code,
+            'total_ms': round(total * 1000, 3),
+            'sql_count': tempos.consultas,
+        }
+        registro.update({f'{fase}_ms': round(duracao * 1000, 3)
+                         for fase, duracao in tempos.duracoes.items()})
+        app.logger.info('tempos %s', json.dumps(registro, ensure_ascii=False))
+        return response
+
+    @app.teardown_request
+    def encerrar_medicao(exc):
+        _atual.set(None)
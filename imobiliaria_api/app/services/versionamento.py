@@ -0,0 +1,80 @@
+from sqlalchemy import select, update
+from ..extensions import db
+from ..models.imovel import Imovel
+from ..models.versao import VersaoTabela
+
+TABELA_IMOVEIS = 'imoveis'
+
+# Versão das linhas gravadas sem registrar a alteração (server_default)
+VERSAO_INICIAL = 1
+
+def versao_tabela(tabela=TABELA_IMOVEIS):
+    """
+    Retorna a versão atual de uma tabela.
+    
+    Args:
+        tabela (str): Nome da tabela
+        
+    Returns:
+        int: Versão atual (0 se a tabela nunca foi alterada)
+    """
+    versao = db.session.execute(
+        select(VersaoTabela.versao).where(VersaoTabela.tabela == tabela)
+    ).scalar()
+    return versao or 0
+
+def versao_imovel(imovel_id):
+    """
+    Retorna a versão de um imóvel sem carregar a linha inteira.
+    
+    Args:
+        imovel_id (int): ID do imóvel
+        
+    Returns:
+        int: Versão do imóvel, ou None se ele não existir
+    """
+    return db.session.execute(
+        select(Imovel.versao).where(Imovel.id == imovel_id)
+    ).scalar()
+
+def incrementar_versao(tabela=TABELA_IMOVEIS):
+    """
+    Incrementa a versão de uma tabela na transação atual.
+    
+    Deve ser chamada antes do commit de qualquer escrita na tabela.
+    
+    Args:
+        tabela (str): Nome da tabela
+        
+    Returns:
+        int: Nova versão da tabela
+    """
+    result = db.session.execute(
+        update(VersaoTabela)
+        .where(VersaoTabela.tabela == tabela)
+        .values(versao=VersaoTabela.versao + 1)
+    )
+    if result.rowcount == 0:
+        # Acima da versão inicial, para não repetir a de linhas já gravadas
+        db.session.add(VersaoTabela(tabela=tabela, versao=VERSAO_INICIAL + 1))
+        return VERSAO_INICIAL + 1
+    return versao_tabela(tabela)
+
+def registrar_alteracao(imovel=None):
+    """
+    Registra a escrita de um imóvel na transação atual.
+    
+    Incrementa a versão global da tabela e grava a nova versão no imóvel
+    inserido ou atualizado. Como a versão global nunca se repete, um imóvel
+    que reutiliza o ID de outro já removido não herda o seu ETag.
+    
+    Args:
+        imovel (Imovel, optional): Imóvel inserido ou alterado
+        
+    Returns:
+        int: Nova versão da tabela
+    """
+    versao = incrementar_versao(TABELA_IMOVEIS)
+    if imovel is not None:
+        imovel.versao = versao
+    return versao
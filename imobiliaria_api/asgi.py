@@ -0,0 +1,5 @@
+import os
+from app.asgi import create_asgi_app
+
+# Aplicação ASGI: uvicorn asgi:app --workers 4
+app = create_asgi_app(os.environ.get('FLASK_ENV', 'production'))
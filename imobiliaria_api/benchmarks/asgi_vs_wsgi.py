@@ -0,0 +1,186 @@
+"""
+Compara a vazão das leituras servidas em WSGI (gunicorn) e em ASGI (uvicorn).
+
+Os servidores (presets ``sync`` e ``threaded`` do gunicorn.conf.py e o
+uvicorn) sobem com a mesma quantidade de workers, sobre uma cópia
+do mesmo banco SQLite, com o cache de respostas desligado. Cada cliente
+mantém uma conexão HTTP aberta e repete as leituras de listagem, imóvel por
+ID, tipo e cidade durante o tempo informado.
+
+Uso:
+    python benchmarks/asgi_vs_wsgi.py --workers 2 --concurrency 32 --duration 10
+    python benchmarks/asgi_vs_wsgi.py --servers sync,threaded
+"""
+import argparse
+import http.client
+import os
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+CIDADES = ['São Paulo', 'Rio de Janeiro', 'Curitiba', 'Porto Alegre', 'Recife']
+TIPOS = ['casa', 'apartamento', 'terreno']
+
+
+def criar_banco(caminho, linhas):
+    """Cria o banco do benchmark com imóveis sintéticos."""
+    # A URL do banco é lida na importação da configuração
+    os.environ['DATABASE_URL'] = f'sqlite:///{caminho}'
+    from app import create_app
+    from app.extensions import db
+    from app.models.imovel import Imovel
+    from sqlalchemy import insert
+
+    app = create_app('production')
+    aleatorio = random.Random(42)
+    with app.app_context():
+        db.create_all()
+        db.session.execute(insert(Imovel.__table__), [{
+            'logradouro': f'Rua {i}', 'tipo_logradouro': 'Rua', 'bairro': 'Centro',
+            'cidade': aleatorio.choice(CIDADES), 'tipo': aleatorio.choice(TIPOS),
+            'cep': f'{aleatorio.randrange(100000):05d}-000',
+            'valor': float(aleatorio.randrange(100000, 2000000)),
+        } for i in range(linhas)])
+        db.session.commit()
+        db.engine.dispose()
+
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def aguardar(porta, processo, limite=30):
+    """Espera o servidor responder."""
+    fim = time.monotonic() + limite
+    while time.monotonic() < fim:
+        if processo.poll() is not None:
+            raise RuntimeError('O servidor terminou antes de responder.')
+        try:
+            conn = http.client.HTTPConnection('127.0.0.1', porta, timeout=1)
+            conn.request('GET', '/api/imoveis?limit=1')
+            conn.getresponse().read()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('O servidor não respondeu a tempo.')
+
+
+# Servidores medidos: presets do gunicorn.conf.py (GUNICORN_MODE) e o uvicorn
+SERVIDORES = ('sync', 'threaded', 'asgi')
+
+
+def comando(servidor, workers, porta):
+    if servidor in ('sync', 'threaded'):
+        return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                '--workers', str(workers), '--bind', f'127.0.0.1:{porta}',
+                '--log-level', 'warning']
+    return [sys.executable, '-m', 'uvicorn', 'asgi:app', '--workers', str(workers),
+            '--host', '127.0.0.1', '--port', str(porta), '--log-level', 'warning',
+            '--no-access-log']
+
+
+def carga(porta, concorrencia, duracao, linhas):
+    """Executa as leituras em paralelo e devolve as latências (s) e os erros."""
+    caminhos = [
+        lambda a: '/api/imoveis?limit=20',
+        lambda a: f'/api/imoveis/{a.randrange(1, linhas + 1)}',
+        lambda a: f'/api/imoveis/tipo/{a.choice(TIPOS)}?limit=20',
+        lambda a: f'/api/imoveis/cidade/{quote(a.choice(CIDADES))}?limit=20',
+    ]
+    latencias, erros = [], []
+    fim = time.monotonic() + duracao
+
+    def cliente(semente):
+        aleatorio = random.Random(semente)
+        conn = http.client.HTTPConnection('127.0.0.1', porta, timeout=30)
+        minhas, falhas = [], 0
+        while time.monotonic() < fim:
+            url = aleatorio.choice(caminhos)(aleatorio)
+            inicio = time.perf_counter()
+            try:
+                conn.request('GET', url)
+                resposta = conn.getresponse()
+                resposta.read()
+                if resposta.status != 200:
+                    falhas += 1
+            except (OSError, http.client.HTTPException):
+                falhas += 1
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', porta, timeout=30)
+                continue
+            minhas.append(time.perf_counter() - inicio)
+        latencias.extend(minhas)
+        erros.append(falhas)
+
+    threads = [threading.Thread(target=cliente, args=(n,)) for n in range(concorrencia)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencias, sum(erros)
+
+
+def medir(servidor, banco, args):
+    porta = porta_livre()
+    env = dict(os.environ, FLASK_ENV='production', DATABASE_URL=f'sqlite:///{banco}',
+               RESPONSE_CACHE_BACKEND='null', GUNICORN_MODE=servidor)
+    processo = subprocess.Popen(comando(servidor, args.workers, porta), cwd=RAIZ, env=env)
+    try:
+        aguardar(porta, processo)
+        carga(porta, args.concurrency, 1, args.rows)  # aquecimento
+        latencias, erros = carga(porta, args.concurrency, args.duration, args.rows)
+    finally:
+        processo.terminate()
+        processo.wait(timeout=30)
+    quantis = statistics.quantiles(latencias, n=100)
+    return {
+        'servidor': servidor,
+        'req_s': len(latencias) / args.duration,
+        'p50_ms': quantis[49] * 1000,
+        'p99_ms': quantis[98] * 1000,
+        'erros': erros,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10)
+    parser.add_argument('--rows', type=int, default=10000)
+    parser.add_argument('--servers', default='sync,asgi',
+                        help=f"Servidores separados por vírgulas ({', '.join(SERVIDORES)})")
+    args = parser.parse_args()
+    servidores = [nome.strip() for nome in args.servers.split(',') if nome.strip()]
+    invalidos = sorted(set(servidores).difference(SERVIDORES))
+    if invalidos:
+        parser.error(f"Servidor inválido: {', '.join(invalidos)}")
+
+    pasta = tempfile.mkdtemp(prefix='bench-asgi-')
+    try:
+        banco = os.path.join(pasta, 'bench.db')
+        criar_banco(banco, args.rows)
+        print(f'{args.rows} imóveis, {args.workers} workers, {args.concurrency} clientes, '
+              f'{args.duration:g}s por servidor')
+        for servidor in servidores:
+            r = medir(servidor, banco, args)
+            print(f"{r['servidor']}: {r['req_s']:8.1f} req/s  p50 {r['p50_ms']:6.1f} ms  "
+                  f"p99 {r['p99_ms']:6.1f} ms  erros {r['erros']}")
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    main()
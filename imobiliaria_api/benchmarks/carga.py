@@ -0,0 +1,358 @@
+"""
+Teste de carga HTTP das rotas /api/imoveis.
+
+Sobe a aplicação (servidor de desenvolvimento do Flask com ``run:app``,
+gunicorn com ``gunicorn.conf.py`` ou uvicorn com ``asgi:app``), com a
+configuração de produção, sobre
+uma cópia de um banco SQLite populado como no ``flask seed``. Em seguida
+dispara uma mistura de GET, POST, PUT e DELETE em uma taxa fixa e informa
+a vazão, a taxa de erros e o histograma das latências.
+
+A carga é de laço aberto: as requisições são agendadas na taxa pedida,
+independentemente das respostas, e a latência é contada a partir do horário
+agendado. Assim, a fila que se forma quando o servidor não acompanha a taxa
+aparece nas latências (sem "omissão coordenada").
+
+Com ``--find-max``, a taxa é aumentada em degraus até que o p99 passe de
+``--slo-p99``, a taxa de erros passe de ``--max-errors`` ou a vazão fique
+abaixo da taxa pedida. Depois, uma busca binária entre o último degrau
+aprovado e o primeiro reprovado encontra a maior taxa sustentável.
+
+Uso:
+    python benchmarks/carga.py --server gunicorn --rate 100 --duration 30
+    python benchmarks/carga.py --server dev --mix get=70,list=20,post=5,put=4,delete=1
+    python benchmarks/carga.py --server gunicorn --mode threaded --find-max
+    python benchmarks/carga.py --server asgi --find-max
+"""
+import argparse
+import bisect
+import http.client
+import itertools
+import json
+import os
+import queue
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from urllib.parse import quote
+
+from asgi_vs_wsgi import RAIZ, porta_livre, aguardar
+from suite import banco_populado, NOVO_IMOVEL
+from app.services.sintetico import CIDADES, TIPOS
+
+MIX_PADRAO = 'get=60,list=25,post=8,put=5,delete=2'
+
+# Limites superiores (ms) das faixas do histograma
+FAIXAS_MS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, float('inf')]
+
+
+class Operacoes:
+    """
+    Gera as requisições de cada tipo de operação.
+
+    Os DELETEs removem primeiro os imóveis criados pelos POSTs do teste e,
+    na falta deles, os últimos imóveis da base; GETs e PUTs usam a primeira
+    metade da base, que nunca é removida.
+    """
+
+    def __init__(self, linhas):
+        self.linhas = linhas
+        self.criados = []
+        self.proximo_removido = itertools.count(linhas, -1)
+        self.lock = threading.Lock()
+
+    def gerar(self, nome, aleatorio):
+        """Devolve (método, URL, corpo JSON ou None)."""
+        metade = max(1, self.linhas // 2)
+        if nome == 'get':
+            return 'GET', f'/api/imoveis/{aleatorio.randint(1, metade)}', None
+        if nome == 'list':
+            cidade, _ = aleatorio.choice(CIDADES[:10])
+            return aleatorio.choice([
+                ('GET', '/api/imoveis?limit=20', None),
+                ('GET', f'/api/imoveis?limit=20&after={aleatorio.randint(1, metade)}', None),
+                ('GET', f'/api/imoveis/cidade/{quote(cidade)}?limit=20', None),
+                ('GET', f'/api/imoveis/tipo/{quote(aleatorio.choice(list(TIPOS)))}?limit=20', None),
+                ('GET', f'/api/imoveis?cidade={quote(cidade)}&valor_max=500000&limit=20', None),
+            ])
+        if nome == 'post':
+            return 'POST', '/api/imoveis', NOVO_IMOVEL
+        if nome == 'put':
+            return ('PUT', f'/api/imoveis/{aleatorio.randint(1, metade)}',
+                    {'valor': float(aleatorio.randrange(100000, 2000000))})
+        if nome == 'delete':
+            with self.lock:
+                id = self.criados.pop() if self.criados else next(self.proximo_removido)
+            return 'DELETE', f'/api/imoveis/{id}', None
+        raise ValueError(nome)
+
+    def registrar_criado(self, corpo):
+        try:
+            id = json.loads(corpo)['id']
+        except (ValueError, KeyError, TypeError):
+            return
+        with self.lock:
+            self.criados.append(id)
+
+
+def parse_mix(texto):
+    """'get=60,list=25' -> ([nomes], [pesos acumulados])."""
+    nomes, pesos = [], []
+    for parte in texto.split(','):
+        nome, _, peso = parte.partition('=')
+        nome = nome.strip()
+        if nome not in ('get', 'list', 'post', 'put', 'delete'):
+            raise ValueError(f'Operação inválida: {nome}')
+        nomes.append(nome)
+        pesos.append(float(peso or 1))
+    return nomes, list(itertools.accumulate(pesos))
+
+
+def executar(porta, taxa, duracao, nomes, pesos, operacoes, conexoes, semente=0):
+    """
+    Dispara requisições na taxa pedida durante ``duracao`` segundos.
+
+    Returns:
+        dict: Latências (s) e erros por operação e a duração efetiva
+    """
+    agenda = queue.Queue()
+    latencias = {nome: [] for nome in nomes}
+    erros = {nome: 0 for nome in nomes}
+    lock = threading.Lock()
+
+    def agendador():
+        inicio = time.perf_counter()
+        for n in range(int(taxa * duracao)):
+            horario = inicio + n / taxa
+            espera = horario - time.perf_counter()
+            if espera > 0:
+                time.sleep(espera)
+            agenda.put(horario)
+        for _ in range(conexoes):
+            agenda.put(None)
+
+    def cliente(numero):
+        aleatorio = random.Random(semente * 1000 + numero)
+        conn = http.client.HTTPConnection('127.0.0.1', porta, timeout=30)
+        while True:
+            horario = agenda.get()
+            if horario is None:
+                break
+            nome = aleatorio.choices(nomes, cum_weights=pesos)[0]
+            metodo, url, corpo = operacoes.gerar(nome, aleatorio)
+            headers = {'Content-Type': 'application/json'} if corpo is not None else {}
+            try:
+                conn.request(metodo, url, json.dumps(corpo) if corpo is not None else None, headers)
+                resposta = conn.getresponse()
+                dados = resposta.read()
+                falhou = resposta.status >= 400
+                if nome == 'post' and not falhou:
+                    operacoes.registrar_criado(dados)
+            except (OSError, http.client.HTTPException):
+                falhou = True
+                conn.close()
+                conn = http.client.HTTPConnection('127.0.0.1', porta, timeout=30)
+            decorrido = time.perf_counter() - horario
+            with lock:
+                if falhou:
+                    erros[nome] += 1
+                else:
+                    latencias[nome].append(decorrido)
+        conn.close()
+
+    inicio = time.perf_counter()
+    threads = [threading.Thread(target=agendador)]
+    threads += [threading.Thread(target=cliente, args=(n,)) for n in range(conexoes)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return {'latencias': latencias, 'erros': erros, 'segundos': time.perf_counter() - inicio}
+
+
+def resumir(resultado, taxa):
+    """Vazão, taxa de erros e percentis (ms) do resultado de ``executar``."""
+    todas = sorted(itertools.chain.from_iterable(resultado['latencias'].values()))
+    erros = sum(resultado['erros'].values())
+    total = len(todas) + erros
+
+    def percentil(p):
+        return todas[min(len(todas) - 1, int(len(todas) * p))] * 1000 if todas else float('inf')
+
+    return {
+        'taxa_pedida': taxa,
+        'req_s': len(todas) / resultado['segundos'],
+        'requisicoes': total,
+        'erros': erros,
+        'taxa_erros': erros / total if total else 0.0,
+        'p50_ms': percentil(0.50),
+        'p90_ms': percentil(0.90),
+        'p95_ms': percentil(0.95),
+        'p99_ms': percentil(0.99),
+        'max_ms': todas[-1] * 1000 if todas else float('inf'),
+    }
+
+
+def imprimir(resultado, resumo):
+    print(f"\n{resumo['requisicoes']} requisições em {resultado['segundos']:.1f}s: "
+          f"{resumo['req_s']:.1f} req/s (pedido {resumo['taxa_pedida']:g}), "
+          f"erros {resumo['erros']} ({resumo['taxa_erros']:.2%})")
+    print(f"p50 {resumo['p50_ms']:.1f} ms  p90 {resumo['p90_ms']:.1f} ms  "
+          f"p95 {resumo['p95_ms']:.1f} ms  p99 {resumo['p99_ms']:.1f} ms  "
+          f"máx {resumo['max_ms']:.1f} ms")
+
+    todas = [s * 1000 for s in itertools.chain.from_iterable(resultado['latencias'].values())]
+    contagem = [0] * len(FAIXAS_MS)
+    for ms in todas:
+        contagem[bisect.bisect_left(FAIXAS_MS, ms)] += 1
+    maior = max(contagem) or 1
+    print('\nHistograma das latências:')
+    anterior = 0
+    for limite, quantidade in zip(FAIXAS_MS, contagem):
+        faixa = f'> {anterior:g} ms' if limite == float('inf') else f'<= {limite:g} ms'
+        print(f'  {faixa:>11} {quantidade:7d} {"#" * round(40 * quantidade / maior)}')
+        anterior = limite
+
+    print('\nPor operação:')
+    for nome, latencias in resultado['latencias'].items():
+        ordenadas = sorted(latencias)
+        p50 = ordenadas[len(ordenadas) // 2] * 1000 if ordenadas else 0.0
+        p99 = ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * 0.99))] * 1000 if ordenadas else 0.0
+        print(f'  {nome:7} {len(ordenadas):7d} ok  {resultado["erros"][nome]:5d} erros  '
+              f'p50 {p50:8.1f} ms  p99 {p99:8.1f} ms')
+
+
+def sustentavel(resumo, args):
+    return (resumo['taxa_erros'] <= args.max_errors
+            and resumo['p99_ms'] <= args.slo_p99
+            and resumo['req_s'] >= 0.95 * resumo['taxa_pedida'])
+
+
+def encontrar_maximo(porta, args, nomes, pesos, operacoes):
+    """Maior taxa (req/s) que cumpre os limites de ``sustentavel``."""
+    aprovada, reprovada, taxa, degrau = None, None, args.rate, 0
+
+    def medir(taxa):
+        nonlocal degrau
+        degrau += 1
+        resumo = resumir(executar(porta, taxa, args.duration, nomes, pesos, operacoes,
+                                  args.connections, semente=degrau), taxa)
+        ok = sustentavel(resumo, args)
+        print(f"{taxa:8.1f} req/s pedidas: {resumo['req_s']:8.1f} req/s  "
+              f"p99 {resumo['p99_ms']:8.1f} ms  erros {resumo['taxa_erros']:.2%}  "
+              f"{'ok' if ok else 'reprovada'}", flush=True)
+        time.sleep(1)  # esvazia as filas do servidor entre os degraus
+        return ok, resumo
+
+    while reprovada is None:
+        ok, resumo = medir(taxa)
+        if ok:
+            aprovada = (taxa, resumo)
+            taxa *= 2
+        else:
+            reprovada = taxa
+    if aprovada is None:
+        return None
+    inferior = aprovada[0]
+    for _ in range(args.search_steps):
+        meio = (inferior + reprovada) / 2
+        ok, resumo = medir(meio)
+        if ok:
+            inferior, aprovada = meio, (meio, resumo)
+        else:
+            reprovada = meio
+    return aprovada
+
+
+def comando(args, porta):
+    if args.server == 'dev':
+        return [sys.executable, '-m', 'flask', '--app', 'run', 'run', '--host', '127.0.0.1',
+                '--port', str(porta), '--no-reload', '--no-debugger', '--with-threads']
+    if args.server == 'asgi':
+        return [sys.executable, '-m', 'uvicorn', 'asgi:app', '--workers', str(args.workers),
+                '--host', '127.0.0.1', '--port', str(porta), '--log-level', 'warning',
+                '--no-access-log']
+    return [sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+            '--bind', f'127.0.0.1:{porta}', '--log-level', 'warning']
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--server', choices=('dev', 'gunicorn', 'asgi'), default='gunicorn')
+    parser.add_argument('--mode', choices=('sync', 'threaded'), default='sync',
+                        help='Preset do gunicorn.conf.py (GUNICORN_MODE)')
+    parser.add_argument('--workers', type=int, default=2, help='Workers do gunicorn ou do uvicorn')
+    parser.add_argument('--rows', type=int, default=100000, help='Imóveis na base')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=os.path.join(RAIZ, 'benchmarks', 'dados'))
+    parser.add_argument('--mix', default=MIX_PADRAO,
+                        help=f'Pesos das operações get, list, post, put e delete ({MIX_PADRAO})')
+    parser.add_argument('--rate', type=float, default=50,
+                        help='Requisições por segundo (taxa inicial com --find-max)')
+    parser.add_argument('--duration', type=float, default=20, help='Segundos por medição')
+    parser.add_argument('--connections', type=int, default=64,
+                        help='Conexões simultâneas do cliente')
+    parser.add_argument('--find-max', action='store_true',
+                        help='Procurar a maior taxa sustentável')
+    parser.add_argument('--slo-p99', type=float, default=500, help='p99 máximo (ms) com --find-max')
+    parser.add_argument('--max-errors', type=float, default=0.01,
+                        help='Taxa de erros máxima com --find-max')
+    parser.add_argument('--search-steps', type=int, default=3,
+                        help='Passos da busca binária com --find-max')
+    parser.add_argument('--output', help='Grava o resumo em JSON')
+    args = parser.parse_args()
+    try:
+        nomes, pesos = parse_mix(args.mix)
+    except ValueError as err:
+        parser.error(str(err))
+
+    base = banco_populado(args.data_dir, args.rows, args.seed)
+    pasta = tempfile.mkdtemp(prefix='bench-carga-')
+    banco = os.path.join(pasta, 'carga.db')
+    shutil.copyfile(base, banco)
+    porta = porta_livre()
+    env = dict(os.environ, DATABASE_URL=f'sqlite:///{banco}', GUNICORN_MODE=args.mode,
+               GUNICORN_WORKERS=str(args.workers), FLASK_ENV='production', FLASK_DEBUG='0')
+    # O servidor de desenvolvimento registra cada requisição: saída descartada
+    saida = subprocess.DEVNULL if args.server == 'dev' else None
+    processo = subprocess.Popen(comando(args, porta), cwd=RAIZ, env=env,
+                                stdout=saida, stderr=saida)
+    try:
+        aguardar(porta, processo)
+        operacoes = Operacoes(args.rows)
+        descricao = {
+            'dev': 'flask run',
+            'gunicorn': f'gunicorn {args.mode}, {args.workers} workers',
+            'asgi': f'uvicorn, {args.workers} workers',
+        }[args.server]
+        print(f'{descricao}; {args.rows} imóveis; mistura {args.mix}', flush=True)
+        if args.find_max:
+            aprovada = encontrar_maximo(porta, args, nomes, pesos, operacoes)
+            if aprovada is None:
+                print(f'Nem a taxa inicial ({args.rate:g} req/s) é sustentável.')
+                resumo = None
+            else:
+                resumo = aprovada[1]
+                print(f"\nMaior taxa sustentável: {aprovada[0]:.1f} req/s "
+                      f"(p99 {resumo['p99_ms']:.1f} ms, erros {resumo['taxa_erros']:.2%})")
+        else:
+            resultado = executar(porta, args.rate, args.duration, nomes, pesos, operacoes,
+                                 args.connections)
+            resumo = resumir(resultado, args.rate)
+            imprimir(resultado, resumo)
+    finally:
+        processo.terminate()
+        processo.wait(timeout=30)
+        shutil.rmtree(pasta, ignore_errors=True)
+
+    if args.output and resumo is not None:
+        with open(args.output, 'w', encoding='utf-8') as arquivo:
+            json.dump(resumo, arquivo, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+Mede o tempo de cada rota de imóveis com o cliente de testes do Flask.
+
+Para cada tamanho de base (padrão: 1.000, 100.000 e 1.000.000 de imóveis),
+um banco SQLite é populado com ``gerar_imoveis`` (o mesmo gerador de
+``flask seed``) e cada cenário (listagem, paginação profunda, filtros, GET
+por ID, POST, PUT e DELETE) é repetido ``--iterations`` vezes, com o cache
+de respostas desligado.
+
+Os bancos populados ficam em ``--data-dir`` e são reaproveitados enquanto o
+esquema das tabelas não mudar; cada execução trabalha sobre uma cópia.
+
+Os resultados (p50, p95 e média em ms) são gravados em JSON. Com
+``--baseline``, cada cenário é comparado ao mesmo cenário do arquivo
+anterior e a execução termina com código 1 se algum p50 piorar mais que
+``--threshold``.
+
+Uso:
+    python benchmarks/suite.py --rows 1000,100000 --output atual.json
+    python benchmarks/suite.py --baseline base.json --output atual.json --threshold 0.25
+"""
+import argparse
+import hashlib
+import json
+import os
+import platform
+import random
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from urllib.parse import quote
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+from sqlalchemy.schema import CreateIndex, CreateTable  # noqa: E402
+from sqlalchemy.dialects import sqlite  # noqa: E402
+from app import create_app  # noqa: E402
+from app.config import config, ProductionConfig  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.services.importacao import importar  # noqa: E402
+from app.services.sintetico import gerar_imoveis  # noqa: E402
+
+NOVO_IMOVEL = {
+    'logradouro': 'Rua do Benchmark, 100', 'tipo_logradouro': 'Rua', 'bairro': 'Centro',
+    'cidade': 'Curitiba', 'cep': '80010-000', 'tipo': 'apartamento',
+    'valor': 450000.0, 'data_aquisicao': '2024-01-15',
+}
+
+
+def cenarios(linhas):
+    """
+    Cenários medidos: nome -> função (aleatorio, ids_removiveis) -> (método, URL, JSON).
+
+    Os IDs removidos pelo DELETE vêm do fim da tabela e não são usados pelos
+    demais cenários.
+    """
+    maior_lido = max(1, linhas // 2)
+    return {
+        'list': lambda a, r: ('GET', '/api/imoveis?limit=50', None),
+        'list_offset_deep': lambda a, r: (
+            'GET', f'/api/imoveis?page={max(1, linhas // 100)}&per_page=50', None),
+        'list_cursor_deep': lambda a, r: (
+            'GET', f'/api/imoveis?limit=50&after={maior_lido}', None),
+        'get': lambda a, r: ('GET', f'/api/imoveis/{a.randint(1, maior_lido)}', None),
+        'filter_cidade_tipo': lambda a, r: (
+            'GET', f"/api/imoveis?cidade={quote('São Paulo')}&tipo=casa&limit=50", None),
+        'filter_valor': lambda a, r: (
+            'GET', '/api/imoveis?valor_min=400000&valor_max=500000&limit=50', None),
+        'filter_cep_prefixo': lambda a, r: ('GET', '/api/imoveis?cep_prefixo=801&limit=50', None),
+        'list_by_tipo': lambda a, r: ('GET', '/api/imoveis/tipo/terreno?limit=50', None),
+        'list_by_cidade': lambda a, r: ('GET', f"/api/imoveis/cidade/{quote('Recife')}?limit=50", None),
+        'post': lambda a, r: ('POST', '/api/imoveis', NOVO_IMOVEL),
+        'put': lambda a, r: ('PUT', f'/api/imoveis/{a.randint(1, maior_lido)}',
+                             {'valor': float(a.randrange(100000, 2000000))}),
+        'delete': lambda a, r: ('DELETE', f'/api/imoveis/{r.pop()}', None),
+    }
+
+
+def versao_esquema():
+    """Hash do DDL das tabelas: bancos de esquemas antigos não são reaproveitados."""
+    ddl = []
+    for tabela in db.metadata.sorted_tables:
+        ddl.append(str(CreateTable(tabela).compile(dialect=sqlite.dialect())))
+        ddl.extend(str(CreateIndex(indice).compile(dialect=sqlite.dialect()))
+                   for indice in sorted(tabela.indexes, key=lambda i: i.name))
+    return hashlib.sha1('\n'.join(ddl).encode()).hexdigest()[:10]
+
+
+def criar_app(caminho):
+    """Aplicação de produção sobre o banco informado, sem cache de respostas."""
+    class BenchmarkConfig(ProductionConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{caminho}'
+        SQLALCHEMY_BINDS = {}
+        RESPONSE_CACHE_BACKEND = 'null'
+
+    config['benchmark'] = BenchmarkConfig
+    return create_app('benchmark')
+
+
+def banco_populado(pasta, linhas, semente):
+    """Caminho do banco com ``linhas`` imóveis, criado na primeira vez."""
+    caminho = os.path.join(pasta, f'imoveis-{linhas}-s{semente}-{versao_esquema()}.db')
+    if os.path.exists(caminho):
+        return caminho
+    os.makedirs(pasta, exist_ok=True)
+    parcial = caminho + '.parcial'
+    if os.path.exists(parcial):
+        os.remove(parcial)
+    print(f'Gerando {linhas} imóveis em {caminho}...', flush=True)
+    app = criar_app(parcial)
+    with app.app_context():
+        db.create_all()
+        importar(gerar_imoveis(linhas, semente), chunk_size=10000)
+        db.session.remove()
+        db.engine.dispose()
+    # Deixa o banco em um único arquivo (sem WAL) antes de reaproveitá-lo
+    conn = sqlite3.connect(parcial)
+    conn.execute('PRAGMA journal_mode = DELETE')
+    conn.close()
+    os.replace(parcial, caminho)
+    return caminho
+
+
+def percentil(amostras, p):
+    ordenadas = sorted(amostras)
+    return ordenadas[min(len(ordenadas) - 1, int(len(ordenadas) * p))]
+
+
+def medir(caminho, linhas, iteracoes, semente):
+    """Executa os cenários sobre uma cópia do banco e devolve os tempos (ms)."""
+    pasta = tempfile.mkdtemp(prefix='bench-suite-')
+    try:
+        copia = os.path.join(pasta, 'bench.db')
+        shutil.copyfile(caminho, copia)
+        app = criar_app(copia)
+        client = app.test_client()
+        aleatorio = random.Random(semente)
+        removiveis = list(range(linhas - 2 * (iteracoes + 3), linhas + 1))
+        resultados = {}
+        for nome, cenario in cenarios(linhas).items():
+            tempos = []
+            for i in range(iteracoes + 3):
+                metodo, url, corpo = cenario(aleatorio, removiveis)
+                inicio = time.perf_counter()
+                resposta = client.open(url, method=metodo, json=corpo)
+                decorrido = time.perf_counter() - inicio
+                if resposta.status_code >= 400:
+                    raise RuntimeError(f'{nome}: {metodo} {url} -> {resposta.status_code}')
+                if i >= 3:  # as primeiras repetições aquecem caches e conexões
+                    tempos.append(decorrido * 1000)
+            resultados[nome] = {
+                'p50_ms': round(statistics.median(tempos), 3),
+                'p95_ms': round(percentil(tempos, 0.95), 3),
+                'media_ms': round(statistics.fmean(tempos), 3),
+            }
+            print(f"  {nome:20} p50 {resultados[nome]['p50_ms']:9.3f} ms  "
+                  f"p95 {resultados[nome]['p95_ms']:9.3f} ms", flush=True)
+        with app.app_context():
+            db.engine.dispose()
+        return resultados
+    finally:
+        shutil.rmtree(pasta, ignore_errors=True)
+
+
+def commit_atual():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=RAIZ, check=True,
+                              capture_output=True, text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(atual, base, limite, delta_minimo):
+    """
+    Compara o p50 de cada cenário presente nos dois resultados.
+
+    Returns:
+        list: Regressões (linhas, cenário, p50 base, p50 atual)
+    """
+    regressoes = []
+    for linhas, cenarios_atuais in atual['resultados'].items():
+        for nome, tempos in cenarios_atuais.items():
+            anterior = base.get('resultados', {}).get(linhas, {}).get(nome)
+            if anterior is None:
+                continue
+            antes, depois = anterior['p50_ms'], tempos['p50_ms']
+            variacao = (depois - antes) / antes if antes else 0.0
+            marca = ''
+            if variacao > limite and depois - antes > delta_minimo:
+                regressoes.append((linhas, nome, antes, depois))
+                marca = '  REGRESSÃO'
+            print(f'{linhas:>9} {nome:20} {antes:9.3f} -> {depois:9.3f} ms ({variacao:+.0%}){marca}')
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--rows', default='1000,100000,1000000',
+                        help='Tamanhos da base separados por vírgulas')
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=os.path.join(RAIZ, 'benchmarks', 'dados'))
+    parser.add_argument('--output', default='benchmark.json')
+    parser.add_argument('--baseline', help='Resultado anterior para comparação')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Piora relativa do p50 considerada regressão (0.25 = 25%%)')
+    parser.add_argument('--min-delta-ms', type=float, default=0.5,
+                        help='Piora absoluta mínima (ms) para sinalizar uma regressão')
+    args = parser.parse_args()
+    try:
+        tamanhos = [int(valor) for valor in args.rows.split(',') if valor.strip()]
+    except ValueError:
+        parser.error('--rows deve conter números inteiros separados por vírgulas')
+
+    atual = {
+        'meta': {
+            'commit': commit_atual(),
+            'data': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'sqlite': sqlite3.sqlite_version,
+            'plataforma': platform.platform(),
+            'iteracoes': args.iterations,
+            'semente': args.seed,
+        },
+        'resultados': {},
+    }
+    for linhas in tamanhos:
+        caminho = banco_populado(args.data_dir, linhas, args.seed)
+        print(f'{linhas} imóveis, {args.iterations} repetições por cenário', flush=True)
+        atual['resultados'][str(linhas)] = medir(caminho, linhas, args.iterations, args.seed)
+
+    with open(args.output, 'w', encoding='utf-8') as arquivo:
+        json.dump(atual, arquivo, indent=2, ensure_ascii=False)
+    print(f'Resultados gravados em {args.output}')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as arquivo:
+            base = json.load(arquivo)
+        print(f"\nComparação com {args.baseline} (commit {base.get('meta', {}).get('commit')}):")
+        regressoes = comparar(atual, base, args.threshold, args.min_delta_ms)
+        if regressoes:
+            print(f'{len(regressoes)} cenário(s) com regressão acima de {args.threshold:.0%}.')
+            sys.exit(1)
+        print('Nenhuma regressão.')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Configuração do gunicorn: gunicorn -c gunicorn.conf.py
+
+Variáveis de ambiente:
+    GUNICORN_MODE      sync (padrão) ou threaded (gthread)
+    GUNICORN_WORKERS   Processos (padrão: 2 * CPUs + 1)
+    GUNICORN_THREADS   Threads por processo no modo threaded (padrão 4)
+    GUNICORN_BIND      Endereço (padrão 0.0.0.0:5000)
+    METRICS_ENABLED    Liga o /metrics, somando os workers em PROMETHEUS_MULTIPROC_DIR
+"""
+import hashlib
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+# Modos de worker: classe do gunicorn e threads padrão por processo. O modo
+# threaded usa o gthread com reciclagem em drenagem (app/services/reciclagem.py),
+# que não derruba as conexões keep-alive abertas ao atingir max_requests
+MODOS = {
+    'sync': ('sync', 1),
+    'threaded': ('app.services.reciclagem.ThreadWorker', 4),
+}
+
+modo = os.environ.get('GUNICORN_MODE', 'sync')
+if modo not in MODOS:
+    raise ValueError(f"GUNICORN_MODE inválido: {modo}. Use um de: {', '.join(MODOS)}.")
+
+wsgi_app = 'wsgi:app'
+bind = os.environ.get('GUNICORN_BIND', '0.0.0.0:5000')
+worker_class, _threads = MODOS[modo]
+workers = int(os.environ.get('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get('GUNICORN_THREADS', _threads)) if modo == 'threaded' else 1
+
+# Cada thread precisa de uma conexão: o pool acompanha as threads, salvo
+# se DB_POOL_SIZE for informado (lido na importação da configuração)
+os.environ.setdefault('DB_POOL_SIZE', str(max(threads, 5)))
+
+# Identifica a instância (checkout e endereço) no diretório padrão das
+# métricas: esvaziá-lo na partida não pode apagar os de outra instância
+instancia = hashlib.sha1(
+    f'{os.path.dirname(os.path.abspath(__file__))}|{bind}'.encode('utf-8')).hexdigest()[:12]
+
+# Métricas somadas entre os workers: o diretório precisa existir (e ser
+# esvaziado de execuções anteriores) antes da carga da aplicação
+metricas_ligadas = os.environ.get('METRICS_ENABLED', '0').lower() in ('1', 'true')
+if metricas_ligadas:
+    _diretorio_metricas = os.environ.setdefault(
+        'PROMETHEUS_MULTIPROC_DIR',
+        os.path.join(tempfile.gettempdir(), f'imobiliaria-metricas-{instancia}'))
+    shutil.rmtree(_diretorio_metricas, ignore_errors=True)
+    os.makedirs(_diretorio_metricas)
+
+# Importar a aplicação (e compilar schemas e serializadores) uma única vez,
+# no processo principal, antes do fork dos workers
+preload_app = True
+
+# Reciclar os workers periodicamente, sem reiniciar todos ao mesmo tempo
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 1000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 100))
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 30))
+graceful_timeout = 30
+keepalive = 5
+accesslog = os.environ.get('GUNICORN_ACCESS_LOG')
+
+
+def on_starting(server):
+    """
+    Esvazia o cache de respostas de execuções anteriores.
+
+    As versões usadas nos ETags recomeçam quando o banco é restaurado ou
+    recriado; um corpo antigo poderia voltar a ser aceito até o TTL.
+    """
+    from wsgi import app
+    from app.extensions import response_cache
+    with app.app_context():
+        response_cache.clear()
+
+
+def child_exit(server, worker):
+    """Tira dos gauges os valores do worker encerrado (ex.: reciclado por max_requests)."""
+    if metricas_ligadas:
+        from app.services.metricas import processo_encerrado
+        processo_encerrado(worker.pid)
+
+
+def post_fork(server, worker):
+    """Cada worker abre as próprias conexões, sem herdar as do processo principal."""
+    from app.services.pool import descartar_pools
+    descartar_pools()
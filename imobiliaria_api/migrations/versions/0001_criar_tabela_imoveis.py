@@ -0,0 +1,37 @@
+"""criar tabela imoveis
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Estado inicial, equivalente ao schema.sql. Bancos já existentes
+    # devem ser marcados com `flask db stamp 0001` antes do upgrade.
+    op.create_table('imoveis',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('logradouro', sa.String(length=100), nullable=False),
+    sa.Column('tipo_logradouro', sa.String(length=20), nullable=True),
+    sa.Column('bairro', sa.String(length=50), nullable=True),
+    sa.Column('cidade', sa.String(length=50), nullable=False),
+    sa.Column('cep', sa.String(length=10), nullable=True),
+    sa.Column('tipo', sa.String(length=50), nullable=True),
+    sa.Column('valor', sa.Float(), nullable=True),
+    sa.Column('data_aquisicao', sa.String(length=10), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+
+
+def downgrade():
+    op.drop_table('imoveis')
@@ -0,0 +1,30 @@
+"""indices dos filtros de imoveis
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index('ix_imoveis_cidade', 'imoveis', ['cidade'], unique=False)
+    op.create_index('ix_imoveis_tipo', 'imoveis', ['tipo'], unique=False)
+    op.create_index('ix_imoveis_cidade_tipo', 'imoveis', ['cidade', 'tipo'], unique=False)
+    op.create_index('ix_imoveis_cidade_valor', 'imoveis', ['cidade', 'valor'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_imoveis_cidade_valor', table_name='imoveis')
+    op.drop_index('ix_imoveis_cidade_tipo', table_name='imoveis')
+    op.drop_index('ix_imoveis_tipo', table_name='imoveis')
+    op.drop_index('ix_imoveis_cidade', table_name='imoveis')
@@ -0,0 +1,32 @@
+"""versoes para etag
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('versoes_tabelas',
+    sa.Column('tabela', sa.String(length=50), nullable=False),
+    sa.Column('versao', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('tabela')
+    )
+    op.execute("INSERT INTO versoes_tabelas (tabela, versao) VALUES ('imoveis', 1)")
+    op.add_column('imoveis', sa.Column('versao', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade():
+    with op.batch_alter_table('imoveis') as batch_op:
+        batch_op.drop_column('versao')
+    op.drop_table('versoes_tabelas')
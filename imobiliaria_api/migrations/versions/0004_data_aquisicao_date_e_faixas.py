@@ -0,0 +1,44 @@
+"""data_aquisicao como date e indices dos filtros por faixa
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Datas vazias não podem ser convertidas para DATE
+    op.execute("UPDATE imoveis SET data_aquisicao = NULL WHERE data_aquisicao = ''")
+    if op.get_bind().dialect.name == 'sqlite':
+        # No SQLite o SQLAlchemy grava DATE como texto AAAA-MM-DD, o mesmo
+        # formato já usado; recriar a tabela faria CAST(... AS DATE), que
+        # transforma o texto em número. Basta descartar valores inválidos.
+        op.execute("UPDATE imoveis SET data_aquisicao = NULL WHERE data_aquisicao "
+                   "NOT GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'")
+    else:
+        op.alter_column('imoveis', 'data_aquisicao',
+                        existing_type=sa.String(length=10),
+                        type_=sa.Date(),
+                        existing_nullable=True)
+    op.create_index('ix_imoveis_valor', 'imoveis', ['valor'], unique=False)
+    op.create_index('ix_imoveis_data_aquisicao', 'imoveis', ['data_aquisicao'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_imoveis_data_aquisicao', table_name='imoveis')
+    op.drop_index('ix_imoveis_valor', table_name='imoveis')
+    if op.get_bind().dialect.name != 'sqlite':
+        op.alter_column('imoveis', 'data_aquisicao',
+                        existing_type=sa.Date(),
+                        type_=sa.String(length=10),
+                        existing_nullable=True)
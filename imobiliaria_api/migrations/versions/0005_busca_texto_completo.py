@@ -0,0 +1,64 @@
+"""busca de texto completo nos enderecos (FTS5)
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # O índice FTS5 existe apenas no SQLite
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute("""
+        CREATE VIRTUAL TABLE imoveis_busca USING fts5(
+            logradouro, tipo_logradouro, bairro, cidade,
+            content='imoveis', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2',
+            prefix='2 3'
+        )
+    """)
+    op.execute("""
+        CREATE TRIGGER imoveis_busca_ai AFTER INSERT ON imoveis BEGIN
+            INSERT INTO imoveis_busca (rowid, logradouro, tipo_logradouro, bairro, cidade)
+            VALUES (new.id, new.logradouro, new.tipo_logradouro, new.bairro, new.cidade);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER imoveis_busca_ad AFTER DELETE ON imoveis BEGIN
+            INSERT INTO imoveis_busca (imoveis_busca, rowid, logradouro, tipo_logradouro, bairro, cidade)
+            VALUES ('delete', old.id, old.logradouro, old.tipo_logradouro, old.bairro, old.cidade);
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER imoveis_busca_au
+        AFTER UPDATE OF logradouro, tipo_logradouro, bairro, cidade ON imoveis BEGIN
+            INSERT INTO imoveis_busca (imoveis_busca, rowid, logradouro, tipo_logradouro, bairro, cidade)
+            VALUES ('delete', old.id, old.logradouro, old.tipo_logradouro, old.bairro, old.cidade);
+            INSERT INTO imoveis_busca (rowid, logradouro, tipo_logradouro, bairro, cidade)
+            VALUES (new.id, new.logradouro, new.tipo_logradouro, new.bairro, new.cidade);
+        END
+    """)
+    # Indexar os imóveis já existentes
+    op.execute("INSERT INTO imoveis_busca (imoveis_busca) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute('DROP TRIGGER IF EXISTS imoveis_busca_au')
+    op.execute('DROP TRIGGER IF EXISTS imoveis_busca_ad')
+    op.execute('DROP TRIGGER IF EXISTS imoveis_busca_ai')
+    op.execute('DROP TABLE IF EXISTS imoveis_busca')
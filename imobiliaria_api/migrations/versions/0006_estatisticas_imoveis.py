@@ -0,0 +1,99 @@
+"""resumo das estatisticas de valor por cidade e tipo
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def _adicionar(linha):
+    return f"""
+        INSERT INTO estatisticas_imoveis
+            (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+        VALUES ({linha}.cidade, coalesce({linha}.tipo, ''), 1, {linha}.valor IS NOT NULL,
+                coalesce({linha}.valor, 0), {linha}.valor, {linha}.valor)
+        ON CONFLICT (cidade, tipo) DO UPDATE SET
+            quantidade = quantidade + 1,
+            quantidade_valor = quantidade_valor + excluded.quantidade_valor,
+            soma_valor = soma_valor + excluded.soma_valor,
+            menor_valor = min(coalesce(menor_valor, excluded.menor_valor),
+                              coalesce(excluded.menor_valor, menor_valor)),
+            maior_valor = max(coalesce(maior_valor, excluded.maior_valor),
+                              coalesce(excluded.maior_valor, maior_valor));"""
+
+
+def _remover(linha):
+    grupo = f"cidade = {linha}.cidade AND tipo = coalesce({linha}.tipo, '')"
+    no_grupo = f'FROM imoveis WHERE cidade = {linha}.cidade AND tipo IS {linha}.tipo'
+    return f"""
+        UPDATE estatisticas_imoveis SET
+            quantidade = quantidade - 1,
+            quantidade_valor = quantidade_valor - ({linha}.valor IS NOT NULL),
+            soma_valor = soma_valor - coalesce({linha}.valor, 0)
+        WHERE {grupo};
+        UPDATE estatisticas_imoveis SET
+            menor_valor = (SELECT min(valor) {no_grupo}),
+            maior_valor = (SELECT max(valor) {no_grupo})
+        WHERE {grupo} AND {linha}.valor IN (menor_valor, maior_valor);
+        DELETE FROM estatisticas_imoveis WHERE {grupo} AND quantidade <= 0;"""
+
+
+def upgrade():
+    op.create_table('estatisticas_imoveis',
+    sa.Column('cidade', sa.String(length=50), nullable=False),
+    sa.Column('tipo', sa.String(length=50), nullable=False),
+    sa.Column('quantidade', sa.Integer(), nullable=False),
+    sa.Column('quantidade_valor', sa.Integer(), nullable=False),
+    sa.Column('soma_valor', sa.Float(), nullable=False),
+    sa.Column('menor_valor', sa.Float(), nullable=True),
+    sa.Column('maior_valor', sa.Float(), nullable=True),
+    sa.PrimaryKeyConstraint('cidade', 'tipo')
+    )
+
+    # Os gatilhos que mantêm o resumo existem apenas no SQLite
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_ai AFTER INSERT ON imoveis BEGIN
+            {_adicionar('new')}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_ad AFTER DELETE ON imoveis BEGIN
+            {_remover('old')}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_au
+        AFTER UPDATE OF cidade, tipo, valor ON imoveis BEGIN
+            {_remover('old')}
+            {_adicionar('new')}
+        END
+    """)
+    # Resumo dos imóveis já existentes
+    op.execute("""
+        INSERT INTO estatisticas_imoveis
+            (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+        SELECT cidade, coalesce(tipo, ''), count(*), count(valor), coalesce(sum(valor), 0),
+               min(valor), max(valor)
+        FROM imoveis GROUP BY cidade, coalesce(tipo, '')
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        op.execute('DROP TRIGGER IF EXISTS estatisticas_imoveis_au')
+        op.execute('DROP TRIGGER IF EXISTS estatisticas_imoveis_ad')
+        op.execute('DROP TRIGGER IF EXISTS estatisticas_imoveis_ai')
+    op.drop_table('estatisticas_imoveis')
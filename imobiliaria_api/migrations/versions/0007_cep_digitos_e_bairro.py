@@ -0,0 +1,38 @@
+"""cep normalizado e indices dos filtros por cep e bairro
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+CEP_DIGITOS_SQL = "replace(replace(replace(cep, '-', ''), '.', ''), ' ', '')"
+
+
+def upgrade():
+    # Coluna gerada pelo banco: acompanha o cep em qualquer escrita
+    op.add_column('imoveis', sa.Column('cep_digitos', sa.String(length=8),
+                                       sa.Computed(CEP_DIGITOS_SQL, persisted=False),
+                                       nullable=True))
+    op.create_index('ix_imoveis_cep_digitos', 'imoveis', ['cep_digitos'], unique=False)
+    op.create_index('ix_imoveis_bairro', 'imoveis', ['bairro'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_imoveis_bairro', table_name='imoveis')
+    op.drop_index('ix_imoveis_cep_digitos', table_name='imoveis')
+    if op.get_bind().dialect.name == 'sqlite':
+        # DROP COLUMN nativo (SQLite 3.35+): recriar a tabela com o
+        # batch_alter_table apagaria os gatilhos da busca e das estatísticas
+        op.execute('ALTER TABLE imoveis DROP COLUMN cep_digitos')
+    else:
+        op.drop_column('imoveis', 'cep_digitos')
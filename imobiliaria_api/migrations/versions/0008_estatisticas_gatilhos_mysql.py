@@ -0,0 +1,103 @@
+"""gatilhos do resumo das estatisticas no MySQL
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0008'
+down_revision = '0007'
+branch_labels = None
+depends_on = None
+
+# Variável de sessão que desliga os gatilhos durante uma importação
+CARGA_SEM_GATILHOS = '@imoveis_carga'
+
+
+def _adicionar(linha):
+    return f"""
+            INSERT INTO estatisticas_imoveis
+                (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+            VALUES ({linha}.cidade, coalesce({linha}.tipo, ''), 1, {linha}.valor IS NOT NULL,
+                    coalesce({linha}.valor, 0), {linha}.valor, {linha}.valor)
+            ON DUPLICATE KEY UPDATE
+                quantidade = quantidade + 1,
+                quantidade_valor = quantidade_valor + VALUES(quantidade_valor),
+                soma_valor = soma_valor + VALUES(soma_valor),
+                menor_valor = least(coalesce(menor_valor, VALUES(menor_valor)),
+                                    coalesce(VALUES(menor_valor), menor_valor)),
+                maior_valor = greatest(coalesce(maior_valor, VALUES(maior_valor)),
+                                       coalesce(VALUES(maior_valor), maior_valor));"""
+
+
+def _remover(linha):
+    grupo = f"cidade = {linha}.cidade AND tipo = coalesce({linha}.tipo, '')"
+    no_grupo = f'FROM imoveis WHERE cidade = {linha}.cidade AND tipo <=> {linha}.tipo'
+    return f"""
+            UPDATE estatisticas_imoveis SET
+                quantidade = quantidade - 1,
+                quantidade_valor = quantidade_valor - ({linha}.valor IS NOT NULL),
+                soma_valor = soma_valor - coalesce({linha}.valor, 0)
+            WHERE {grupo};
+            UPDATE estatisticas_imoveis SET
+                menor_valor = (SELECT min(valor) {no_grupo}),
+                maior_valor = (SELECT max(valor) {no_grupo})
+            WHERE {grupo} AND {linha}.valor IN (menor_valor, maior_valor);
+            DELETE FROM estatisticas_imoveis WHERE {grupo} AND quantidade <= 0;"""
+
+
+def upgrade():
+    # No SQLite os gatilhos foram criados na 0006
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_ai
+        AFTER INSERT ON imoveis FOR EACH ROW BEGIN
+            IF {CARGA_SEM_GATILHOS} IS NULL THEN
+                {_adicionar('new')}
+            END IF;
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_ad
+        AFTER DELETE ON imoveis FOR EACH ROW BEGIN
+            IF {CARGA_SEM_GATILHOS} IS NULL THEN
+                {_remover('old')}
+            END IF;
+        END
+    """)
+    # Sem UPDATE OF no MySQL: o gatilho compara as colunas do resumo
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_au
+        AFTER UPDATE ON imoveis FOR EACH ROW BEGIN
+            IF {CARGA_SEM_GATILHOS} IS NULL AND NOT (old.cidade <=> new.cidade
+                    AND old.tipo <=> new.tipo AND old.valor <=> new.valor) THEN
+                {_remover('old')}
+                {_adicionar('new')}
+            END IF;
+        END
+    """)
+    # Resumo dos imóveis já existentes
+    op.execute('DELETE FROM estatisticas_imoveis')
+    op.execute("""
+        INSERT INTO estatisticas_imoveis
+            (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+        SELECT cidade, coalesce(tipo, ''), count(*), count(valor), coalesce(sum(valor), 0),
+               min(valor), max(valor)
+        FROM imoveis GROUP BY cidade, coalesce(tipo, '')
+    """)
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'mysql':
+        return
+
+    op.execute('DROP TRIGGER IF EXISTS estatisticas_imoveis_au')
+    op.execute('DROP TRIGGER IF EXISTS estatisticas_imoveis_ad')
+    op.execute('DROP TRIGGER IF EXISTS estatisticas_imoveis_ai')
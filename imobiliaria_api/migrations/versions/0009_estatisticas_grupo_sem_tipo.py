@@ -0,0 +1,134 @@
+"""minimo e maximo do grupo sem tipo nos gatilhos das estatisticas
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+# Variável de sessão que desliga os gatilhos do MySQL durante uma importação
+CARGA_SEM_GATILHOS = '@imoveis_carga'
+
+
+def _adicionar_sqlite(linha):
+    return f"""
+        INSERT INTO estatisticas_imoveis
+            (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+        VALUES ({linha}.cidade, coalesce({linha}.tipo, ''), 1, {linha}.valor IS NOT NULL,
+                coalesce({linha}.valor, 0), {linha}.valor, {linha}.valor)
+        ON CONFLICT (cidade, tipo) DO UPDATE SET
+            quantidade = quantidade + 1,
+            quantidade_valor = quantidade_valor + excluded.quantidade_valor,
+            soma_valor = soma_valor + excluded.soma_valor,
+            menor_valor = min(coalesce(menor_valor, excluded.menor_valor),
+                              coalesce(excluded.menor_valor, menor_valor)),
+            maior_valor = max(coalesce(maior_valor, excluded.maior_valor),
+                              coalesce(excluded.maior_valor, maior_valor));"""
+
+
+def _adicionar_mysql(linha):
+    return f"""
+            INSERT INTO estatisticas_imoveis
+                (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+            VALUES ({linha}.cidade, coalesce({linha}.tipo, ''), 1, {linha}.valor IS NOT NULL,
+                    coalesce({linha}.valor, 0), {linha}.valor, {linha}.valor)
+            ON DUPLICATE KEY UPDATE
+                quantidade = quantidade + 1,
+                quantidade_valor = quantidade_valor + VALUES(quantidade_valor),
+                soma_valor = soma_valor + VALUES(soma_valor),
+                menor_valor = least(coalesce(menor_valor, VALUES(menor_valor)),
+                                    coalesce(VALUES(menor_valor), menor_valor)),
+                maior_valor = greatest(coalesce(maior_valor, VALUES(maior_valor)),
+                                       coalesce(VALUES(maior_valor), maior_valor));"""
+
+
+def _remover(linha):
+    # O grupo '' reúne os imóveis com tipo vazio e sem tipo: relido por inteiro
+    grupo = f"cidade = {linha}.cidade AND tipo = coalesce({linha}.tipo, '')"
+    no_grupo = (f"FROM imoveis WHERE cidade = {linha}.cidade "
+                f"AND coalesce(tipo, '') = coalesce({linha}.tipo, '')")
+    return f"""
+            UPDATE estatisticas_imoveis SET
+                quantidade = quantidade - 1,
+                quantidade_valor = quantidade_valor - ({linha}.valor IS NOT NULL),
+                soma_valor = soma_valor - coalesce({linha}.valor, 0)
+            WHERE {grupo};
+            UPDATE estatisticas_imoveis SET
+                menor_valor = (SELECT min(valor) {no_grupo}),
+                maior_valor = (SELECT max(valor) {no_grupo})
+            WHERE {grupo} AND {linha}.valor IN (menor_valor, maior_valor);
+            DELETE FROM estatisticas_imoveis WHERE {grupo} AND quantidade <= 0;"""
+
+
+def _gatilhos_sqlite():
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_ad AFTER DELETE ON imoveis BEGIN
+            {_remover('old')}
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_au
+        AFTER UPDATE OF cidade, tipo, valor ON imoveis BEGIN
+            {_remover('old')}
+            {_adicionar_sqlite('new')}
+        END
+    """)
+
+
+def _gatilhos_mysql():
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_ad
+        AFTER DELETE ON imoveis FOR EACH ROW BEGIN
+            IF {CARGA_SEM_GATILHOS} IS NULL THEN
+                {_remover('old')}
+            END IF;
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER estatisticas_imoveis_au
+        AFTER UPDATE ON imoveis FOR EACH ROW BEGIN
+            IF {CARGA_SEM_GATILHOS} IS NULL AND NOT (old.cidade <=> new.cidade
+                    AND old.tipo <=> new.tipo AND old.valor <=> new.valor) THEN
+                {_remover('old')}
+                {_adicionar_mysql('new')}
+            END IF;
+        END
+    """)
+
+
+def upgrade():
+    dialeto = op.get_bind().dialect.name
+    if dialeto not in ('sqlite', 'mysql'):
+        return
+
+    # Apenas os gatilhos de remoção e alteração releem mínimo e máximo
+    op.execute('DROP TRIGGER IF EXISTS estatisticas_imoveis_au')
+    op.execute('DROP TRIGGER IF EXISTS estatisticas_imoveis_ad')
+    if dialeto == 'sqlite':
+        _gatilhos_sqlite()
+    else:
+        _gatilhos_mysql()
+
+    # Mínimos e máximos já gravados com o grupo lido pela metade
+    op.execute('DELETE FROM estatisticas_imoveis')
+    op.execute("""
+        INSERT INTO estatisticas_imoveis
+            (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+        SELECT cidade, coalesce(tipo, ''), count(*), count(valor), coalesce(sum(valor), 0),
+               min(valor), max(valor)
+        FROM imoveis GROUP BY cidade, coalesce(tipo, '')
+    """)
+
+
+def downgrade():
+    # Os gatilhos corrigidos valem também para o esquema da 0008
+    pass
@@ -5,9 +5,119 @@ CREATE TABLE IF NOT EXISTS imoveis (
     bairro TEXT,
     cidade TEXT NOT NULL,
     cep TEXT,
+    -- CEP só com dígitos, calculado a partir de cep (filtro ?cep_prefixo=)
+    cep_digitos TEXT GENERATED ALWAYS AS (replace(replace(replace(cep, '-', ''), '.', ''), ' ', '')) VIRTUAL,
     tipo TEXT,
     valor REAL,
-    data_aquisicao TEXT
+    data_aquisicao DATE,  -- AAAA-MM-DD
+    versao INTEGER NOT NULL DEFAULT 1
 );
 
+-- Índices para os filtros por cidade e tipo
+CREATE INDEX IF NOT EXISTS ix_imoveis_cidade ON imoveis (cidade);
+CREATE INDEX IF NOT EXISTS ix_imoveis_tipo ON imoveis (tipo);
+CREATE INDEX IF NOT EXISTS ix_imoveis_cidade_tipo ON imoveis (cidade, tipo);
+CREATE INDEX IF NOT EXISTS ix_imoveis_cidade_valor ON imoveis (cidade, valor);
+
+-- Índices para os filtros por faixa de valor e de data de aquisição
+CREATE INDEX IF NOT EXISTS ix_imoveis_valor ON imoveis (valor);
+CREATE INDEX IF NOT EXISTS ix_imoveis_data_aquisicao ON imoveis (data_aquisicao);
+
+-- Índices para os filtros por bairro e por prefixo do CEP
+CREATE INDEX IF NOT EXISTS ix_imoveis_bairro ON imoveis (bairro);
+CREATE INDEX IF NOT EXISTS ix_imoveis_cep_digitos ON imoveis (cep_digitos);
+
+-- Busca de texto completo nos endereços (FTS5), mantida por gatilhos
+CREATE VIRTUAL TABLE IF NOT EXISTS imoveis_busca USING fts5(
+    logradouro, tipo_logradouro, bairro, cidade,
+    content='imoveis', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS imoveis_busca_ai AFTER INSERT ON imoveis BEGIN
+    INSERT INTO imoveis_busca (rowid, logradouro, tipo_logradouro, bairro, cidade)
+    VALUES (new.id, new.logradouro, new.tipo_logradouro, new.bairro, new.cidade);
+END;
+CREATE TRIGGER IF NOT EXISTS imoveis_busca_ad AFTER DELETE ON imoveis BEGIN
+    INSERT INTO imoveis_busca (imoveis_busca, rowid, logradouro, tipo_logradouro, bairro, cidade)
+    VALUES ('delete', old.id, old.logradouro, old.tipo_logradouro, old.bairro, old.cidade);
+END;
+CREATE TRIGGER IF NOT EXISTS imoveis_busca_au
+AFTER UPDATE OF logradouro, tipo_logradouro, bairro, cidade ON imoveis BEGIN
+    INSERT INTO imoveis_busca (imoveis_busca, rowid, logradouro, tipo_logradouro, bairro, cidade)
+    VALUES ('delete', old.id, old.logradouro, old.tipo_logradouro, old.bairro, old.cidade);
+    INSERT INTO imoveis_busca (rowid, logradouro, tipo_logradouro, bairro, cidade)
+    VALUES (new.id, new.logradouro, new.tipo_logradouro, new.bairro, new.cidade);
+END;
+
+-- Versão de cada tabela, incrementada a cada escrita (ETags da API)
+CREATE TABLE IF NOT EXISTS versoes_tabelas (
+    tabela TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL DEFAULT 0
+);
+
+-- Resumo das estatísticas de valor por cidade e tipo (GET /api/imoveis/estatisticas),
+-- mantido por gatilhos; imóveis sem tipo ficam no grupo ''
+CREATE TABLE IF NOT EXISTS estatisticas_imoveis (
+    cidade TEXT NOT NULL,
+    tipo TEXT NOT NULL DEFAULT '',
+    quantidade INTEGER NOT NULL DEFAULT 0,
+    quantidade_valor INTEGER NOT NULL DEFAULT 0,
+    soma_valor REAL NOT NULL DEFAULT 0,
+    menor_valor REAL,
+    maior_valor REAL,
+    PRIMARY KEY (cidade, tipo)
+);
+CREATE TRIGGER IF NOT EXISTS estatisticas_imoveis_ai AFTER INSERT ON imoveis BEGIN
+    INSERT INTO estatisticas_imoveis
+        (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+    VALUES (new.cidade, coalesce(new.tipo, ''), 1, new.valor IS NOT NULL,
+            coalesce(new.valor, 0), new.valor, new.valor)
+    ON CONFLICT (cidade, tipo) DO UPDATE SET
+        quantidade = quantidade + 1,
+        quantidade_valor = quantidade_valor + excluded.quantidade_valor,
+        soma_valor = soma_valor + excluded.soma_valor,
+        menor_valor = min(coalesce(menor_valor, excluded.menor_valor),
+                          coalesce(excluded.menor_valor, menor_valor)),
+        maior_valor = max(coalesce(maior_valor, excluded.maior_valor),
+                          coalesce(excluded.maior_valor, maior_valor));
+END;
+CREATE TRIGGER IF NOT EXISTS estatisticas_imoveis_ad AFTER DELETE ON imoveis BEGIN
+    UPDATE estatisticas_imoveis SET
+        quantidade = quantidade - 1,
+        quantidade_valor = quantidade_valor - (old.valor IS NOT NULL),
+        soma_valor = soma_valor - coalesce(old.valor, 0)
+    WHERE cidade = old.cidade AND tipo = coalesce(old.tipo, '');
+    UPDATE estatisticas_imoveis SET
+        menor_valor = (SELECT min(valor) FROM imoveis WHERE cidade = old.cidade AND tipo IS old.tipo),
+        maior_valor = (SELECT max(valor) FROM imoveis WHERE cidade = old.cidade AND tipo IS old.tipo)
+    WHERE cidade = old.cidade AND tipo = coalesce(old.tipo, '') AND old.valor IN (menor_valor, maior_valor);
+    DELETE FROM estatisticas_imoveis WHERE cidade = old.cidade AND tipo = coalesce(old.tipo, '') AND quantidade <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS estatisticas_imoveis_au
+AFTER UPDATE OF cidade, tipo, valor ON imoveis BEGIN
+    UPDATE estatisticas_imoveis SET
+        quantidade = quantidade - 1,
+        quantidade_valor = quantidade_valor - (old.valor IS NOT NULL),
+        soma_valor = soma_valor - coalesce(old.valor, 0)
+    WHERE cidade = old.cidade AND tipo = coalesce(old.tipo, '');
+    UPDATE estatisticas_imoveis SET
+        menor_valor = (SELECT min(valor) FROM imoveis WHERE cidade = old.cidade AND tipo IS old.tipo),
+        maior_valor = (SELECT max(valor) FROM imoveis WHERE cidade = old.cidade AND tipo IS old.tipo)
+    WHERE cidade = old.cidade AND tipo = coalesce(old.tipo, '') AND old.valor IN (menor_valor, maior_valor);
+    DELETE FROM estatisticas_imoveis WHERE cidade = old.cidade AND tipo = coalesce(old.tipo, '') AND quantidade <= 0;
+    INSERT INTO estatisticas_imoveis
+        (cidade, tipo, quantidade, quantidade_valor, soma_valor, menor_valor, maior_valor)
+    VALUES (new.cidade, coalesce(new.tipo, ''), 1, new.valor IS NOT NULL,
+            coalesce(new.valor, 0), new.valor, new.valor)
+    ON CONFLICT (cidade, tipo) DO UPDATE SET
+        quantidade = quantidade + 1,
+        quantidade_valor = quantidade_valor + excluded.quantidade_valor,
+        soma_valor = soma_valor + excluded.soma_valor,
+        menor_valor = min(coalesce(menor_valor, excluded.menor_valor),
+                          coalesce(excluded.menor_valor, menor_valor)),
+        maior_valor = max(coalesce(maior_valor, excluded.maior_valor),
+                          coalesce(excluded.maior_valor, maior_valor));
+END;
+
 -- Script adaptado para SQLite 
\ No newline at end of file
@@ -1,5 +1,7 @@
+from datetime import date
 import pytest
 from app import create_app
+from app.config import config, TestingConfig
 from app.extensions import db
 from app.models.imovel import Imovel
 
@@ -14,6 +16,36 @@ def app():
         db.session.remove()
         db.drop_all()
 
+@pytest.fixture
+def app_factory(monkeypatch):
+    """
+    Criar aplicações de teste com configurações alteradas.
+    
+    ``app_factory(base=TestingConfig, **overrides)`` registra uma subclasse de
+    ``base`` com os atributos informados e retorna a aplicação, com as tabelas
+    criadas e o contexto ativo até o fim do teste.
+    """
+    contextos = []
+    
+    def criar(base=TestingConfig, **overrides):
+        nome = f'teste_{len(contextos)}'
+        monkeypatch.setitem(config, nome, type(f'{base.__name__}Teste', (base,), overrides))
+        app = create_app(nome)
+        contexto = app.app_context()
+        contexto.push()
+        contextos.append(contexto)
+        db.create_all()
+        return app
+    
+    yield criar
+    
+    # Cada contexto volta a ser o atual ao desempilhar os seguintes
+    for contexto in reversed(contextos):
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+        contexto.pop()
+
 @pytest.fixture
 def client(app):
     """Criar cliente de teste."""
@@ -65,3 +97,27 @@ def imovel_db(app, imovel_teste):
         db.session.commit()
         imovel_id = imovel.id
         return imovel_id
+
+
+@pytest.fixture
+def imoveis_db(app):
+    """Criar vários imóveis no banco de dados e retornar seus IDs."""
+    cidades = ['São Paulo', 'Rio de Janeiro', 'Curitiba']
+    tipos = ['casa', 'apartamento']
+    with app.app_context():
+        imoveis = [
+            Imovel(
+                logradouro=f'Rua {i}',
+                tipo_logradouro='Rua',
+                bairro='Centro',
+                cidade=cidades[i % len(cidades)],
+                cep=f'0100{i % 10}-000',
+                tipo=tipos[i % len(tipos)],
+                valor=100000.0 + i * 1000,
+                data_aquisicao=date(2020, 1, (i % 28) + 1)
+            )
+            for i in range(12)
+        ]
+        db.session.add_all(imoveis)
+        db.session.commit()
+        return [imovel.id for imovel in imoveis]
@@ -0,0 +1,129 @@
+import io
+import json
+import pytest
+from sqlalchemy import text
+from app.extensions import db
+from app.models.imovel import Imovel
+from app.services.estatisticas import estatisticas_valor
+from app.services.importacao import ler_sql, ErroImportacao
+
+def gatilhos():
+    return set(db.session.execute(text("SELECT name FROM sqlite_master WHERE type = 'trigger'")).scalars())
+
+SQL = """
+CREATE TABLE IF NOT EXISTS imoveis (id INTEGER PRIMARY KEY, logradouro TEXT NOT NULL);
+-- comentário com 'aspas' e ); no meio
+INSERT INTO imoveis (logradouro, tipo_logradouro, bairro, cidade, cep, tipo, valor, data_aquisicao) VALUES ('Rua A', 'Rua', 'Centro', 'Recife', '50000', 'casa', 100.5, '2020-01-01');
+INSERT INTO imoveis (logradouro, cidade, valor) VALUES ('Rua d''Ajuda); DROP TABLE imoveis;--', 'Natal', 200), ('Rua C', 'Natal', NULL);
+/* bloco; com ponto e vírgula */
+INSERT INTO outra_tabela (nome) VALUES ('ignorada');
+"""
+
+def test_ler_sql_valores_com_delimitadores():
+    """Teste do parser com aspas, ');' e vários VALUES no mesmo INSERT."""
+    linhas = list(ler_sql(io.StringIO(SQL)))
+    
+    assert [linha['logradouro'] for linha in linhas] == [
+        'Rua A', "Rua d'Ajuda); DROP TABLE imoveis;--", 'Rua C']
+    assert linhas[0]['valor'] == 100.5
+    assert linhas[2]['valor'] is None
+
+def test_ler_sql_incremental():
+    """Teste se o resultado não depende do tamanho dos blocos lidos."""
+    class StreamEmPedacos(io.StringIO):
+        def read(self, size=-1):
+            return super().read(7)
+    
+    assert list(ler_sql(StreamEmPedacos(SQL))) == list(ler_sql(io.StringIO(SQL)))
+
+def test_ler_sql_invalido():
+    """Teste de INSERT com quantidade errada de valores."""
+    with pytest.raises(ErroImportacao):
+        list(ler_sql(io.StringIO("INSERT INTO imoveis (logradouro, cidade) VALUES ('x');")))
+
+def test_import_data_sql(runner, tmp_path):
+    """Teste do comando flask import-data com um script SQL."""
+    arquivo = tmp_path / 'imoveis.sql'
+    arquivo.write_text(SQL, encoding='utf-8')
+    
+    result = runner.invoke(args=['import-data', str(arquivo), '--chunk-size', '2'])
+    
+    assert result.exit_code == 0, result.output
+    assert 'linhas/s' in result.output
+    assert Imovel.query.count() == 3
+
+def test_import_data_substituir_e_inserir(runner, tmp_path, imoveis_db):
+    """Teste dos modos substituir (padrão) e inserir."""
+    arquivo = tmp_path / 'imoveis.sql'
+    arquivo.write_text(SQL, encoding='utf-8')
+    
+    runner.invoke(args=['import-data', str(arquivo), '--modo', 'inserir'])
+    assert Imovel.query.count() == 15
+    
+    runner.invoke(args=['import-data', str(arquivo)])
+    assert Imovel.query.count() == 3
+
+def test_import_data_csv_upsert(runner, tmp_path, imoveis_db):
+    """Teste do modo upsert a partir de CSV, sem apagar a tabela."""
+    arquivo = tmp_path / 'imoveis.csv'
+    arquivo.write_text(
+        'id,logradouro,cidade,valor\n'
+        f'{imoveis_db[0]},Rua Atualizada,Recife,1.5\n'
+        '9999,Rua Nova,Natal,\n',
+        encoding='utf-8')
+    
+    result = runner.invoke(args=['import-data', str(arquivo), '--modo', 'upsert'])
+    
+    assert result.exit_code == 0, result.output
+    assert Imovel.query.count() == 13
+    atualizado = Imovel.query.get(imoveis_db[0])
+    assert (atualizado.logradouro, atualizado.valor, atualizado.versao) == ('Rua Atualizada', 1.5, 2)
+    assert Imovel.query.get(9999).valor is None
+
+def test_import_data_ndjson_rejeita_linhas(runner, tmp_path):
+    """Teste de NDJSON com linhas sem campos obrigatórios."""
+    arquivo = tmp_path / 'imoveis.ndjson'
+    arquivo.write_text('\n'.join(json.dumps(row) for row in [
+        {'logradouro': 'Rua A', 'cidade': 'Recife'},
+        {'logradouro': 'Rua B'},
+    ]), encoding='utf-8')
+    
+    result = runner.invoke(args=['import-data', str(arquivo)])
+    
+    assert result.exit_code == 0, result.output
+    assert '1 linhas rejeitadas' in result.output
+    assert Imovel.query.count() == 1
+
+def test_import_data_erro_nao_grava(runner, tmp_path, imoveis_db):
+    """Teste se um arquivo inválido não altera a tabela."""
+    arquivo = tmp_path / 'imoveis.sql'
+    arquivo.write_text(SQL + "INSERT INTO imoveis (logradouro) VALUES ('a', 'b');", encoding='utf-8')
+    
+    antes = gatilhos()
+    
+    result = runner.invoke(args=['import-data', str(arquivo)])
+    
+    assert result.exit_code != 0
+    assert Imovel.query.count() == 12
+    # Os gatilhos removidos no modo substituir voltam com o rollback
+    assert len(antes) == 6 and gatilhos() == antes
+
+def test_import_data_substituir_busca_e_estatisticas(runner, client, tmp_path, imoveis_db):
+    """Teste do índice de busca e do resumo após substituir a tabela sem os gatilhos."""
+    arquivo = tmp_path / 'imoveis.sql'
+    arquivo.write_text(SQL, encoding='utf-8')
+    antes = gatilhos()
+    
+    result = runner.invoke(args=['import-data', str(arquivo)])
+    
+    assert result.exit_code == 0, result.output
+    assert gatilhos() == antes
+    assert [(g['cidade'], g['count']) for g in estatisticas_valor(['cidade'])] == [
+        ('Natal', 2), ('Recife', 1)]
+    assert client.get('/api/imoveis/busca?q=Centro').json['total'] == 1
+    assert client.get('/api/imoveis/busca?q=Curitiba').json['total'] == 0
+    
+    # Os gatilhos recriados acompanham as escritas seguintes
+    client.post('/api/imoveis', json={'logradouro': 'Rua Nova', 'bairro': 'Centro', 'cidade': 'Natal'})
+    assert client.get('/api/imoveis/busca?q=Centro').json['total'] == 2
+    assert estatisticas_valor(filtros={'cidade': 'Natal'})[0]['count'] == 3
@@ -0,0 +1,32 @@
+from collections import Counter
+from app.models.imovel import Imovel
+from app.services.sintetico import gerar_imoveis
+
+def test_gerar_imoveis_deterministico():
+    """Teste se a mesma semente gera os mesmos imóveis."""
+    assert list(gerar_imoveis(50, semente=7)) == list(gerar_imoveis(50, semente=7))
+    assert list(gerar_imoveis(50, semente=7)) != list(gerar_imoveis(50, semente=8))
+
+def test_gerar_imoveis_distribuicao_assimetrica():
+    """Teste se poucas cidades e tipos concentram a maior parte dos imóveis."""
+    imoveis = list(gerar_imoveis(5000))
+    cidades = Counter(imovel['cidade'] for imovel in imoveis).most_common()
+    tipos = Counter(imovel['tipo'] for imovel in imoveis).most_common()
+
+    assert cidades[0][0] == 'São Paulo'
+    assert cidades[0][1] > 10 * cidades[-1][1]
+    assert tipos[0][0] == 'apartamento'
+    assert tipos[0][1] > len(imoveis) * 0.4
+
+def test_seed(runner):
+    """Teste do comando flask seed (substituir e --append)."""
+    result = runner.invoke(args=['seed', '--rows', '120', '--chunk-size', '50'])
+
+    assert result.exit_code == 0, result.output
+    assert '120 imóveis gerados' in result.output
+    assert Imovel.query.count() == 120
+
+    result = runner.invoke(args=['seed', '--rows', '30', '--seed', '1', '--append'])
+
+    assert result.exit_code == 0, result.output
+    assert Imovel.query.count() == 150
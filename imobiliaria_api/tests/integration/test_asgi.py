@@ -0,0 +1,218 @@
+import asyncio
+import json
+import time
+import pytest
+from contextlib import contextmanager
+from datetime import date
+from sqlalchemy import insert
+from app.extensions import db, replicas
+from app.models.imovel import Imovel
+from app.services.consultas_lentas import ler_ocorrencias
+
+pytest.importorskip('aiosqlite')
+from app.asgi import AsgiApp
+
+@contextmanager
+def executando(asgi_app):
+    """Anexa ``chamar`` à aplicação, com um laço de eventos próprio."""
+    loop = asyncio.new_event_loop()
+    asgi_app.chamar = lambda *args, **kwargs: loop.run_until_complete(
+        chamar(asgi_app, *args, **kwargs))
+    try:
+        yield asgi_app
+    finally:
+        for engine in asgi_app.engines.values():
+            loop.run_until_complete(engine.dispose())
+        loop.close()
+
+@pytest.fixture
+def asgi(tmp_path, app_factory):
+    """Aplicação ASGI com um banco SQLite em arquivo e alguns imóveis."""
+    app = app_factory(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'asgi.db'}",
+                      RESPONSE_CACHE_BACKEND='null')
+    cidades = ['São Paulo', 'Rio de Janeiro', 'Curitiba']
+    db.session.add_all([
+        Imovel(logradouro=f'Rua {i}', cidade=cidades[i % 3], tipo=['casa', 'apartamento'][i % 2],
+               cep=f'0100{i % 10}-000', valor=100000.0 + i * 1000,
+               data_aquisicao=date(2020, 1, i + 1))
+        for i in range(12)
+    ])
+    db.session.commit()
+    
+    with executando(AsgiApp(app)) as asgi_app:
+        yield asgi_app
+
+async def chamar(asgi_app, url, method='GET', headers=None, body=b''):
+    """Executa uma requisição na aplicação ASGI."""
+    path, _, query = url.partition('?')
+    scope = {
+        'type': 'http', 'method': method, 'path': path, 'root_path': '',
+        'query_string': query.encode(), 'http_version': '1.1', 'scheme': 'http',
+        'server': ('localhost', 80),
+        'headers': [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+    }
+    mensagens = [{'type': 'http.request', 'body': body, 'more_body': False}]
+    
+    async def receive():
+        return mensagens.pop(0) if mensagens else {'type': 'http.disconnect'}
+    
+    resposta = {'body': b''}
+    
+    async def send(mensagem):
+        if mensagem['type'] == 'http.response.start':
+            resposta['status'] = mensagem['status']
+            resposta['headers'] = {k.decode(): v.decode() for k, v in mensagem['headers']}
+        else:
+            resposta['body'] += mensagem.get('body', b'')
+    
+    await asgi_app(scope, receive, send)
+    return resposta
+
+@pytest.mark.parametrize('url', [
+    '/api/imoveis?limit=3',
+    '/api/imoveis?limit=3&after=3',
+    '/api/imoveis?limit=3&before=10',
+    '/api/imoveis?page=2&per_page=5',
+    '/api/imoveis?tipo=casa&valor_min=104000&links=collection',
+    '/api/imoveis/tipo/casa?links=none',
+    '/api/imoveis/cidade/Curitiba?fields=valor,cep',
+    '/api/imoveis/1',
+    '/api/imoveis/2?fields=tipo,_links',
+    '/api/imoveis?valor_min=abc',
+    '/api/imoveis/1?fields=nada',
+])
+def test_mesma_resposta_do_wsgi(asgi, url, monkeypatch):
+    """Teste do mesmo contrato (status, corpo e ETag) das leituras em WSGI."""
+    esperado = asgi.flask_app.test_client().get(url)
+    
+    async def sem_wsgi(scope, receive, send):
+        raise AssertionError('Leitura enviada ao aplicativo WSGI')
+    monkeypatch.setattr(asgi, 'wsgi', sem_wsgi)
+    resposta = asgi.chamar(url)
+    
+    assert resposta['status'] == esperado.status_code
+    assert json.loads(resposta['body']) == esperado.json
+    assert resposta['headers']['content-type'] == 'application/json'
+    assert resposta['headers'].get('etag') == esperado.headers.get('ETag')
+
+def test_not_modified(asgi):
+    """Teste do 304 com o ETag da resposta anterior."""
+    etag = asgi.chamar('/api/imoveis/cidade/Curitiba')['headers']['etag']
+    
+    resposta = asgi.chamar('/api/imoveis/cidade/Curitiba', headers={'If-None-Match': etag})
+    
+    assert resposta['status'] == 304
+    assert resposta['body'] == b''
+
+def test_demais_rotas_no_wsgi(asgi):
+    """Teste das escritas, do 404 e do streaming atendidos pelo aplicativo Flask."""
+    corpo = json.dumps({'logradouro': 'Rua Nova', 'cidade': 'Curitiba'}).encode()
+    criado = asgi.chamar('/api/imoveis', method='POST', body=corpo,
+                         headers={'Content-Type': 'application/json',
+                                  'Content-Length': str(len(corpo))})
+    assert criado['status'] == 201
+    
+    id = json.loads(criado['body'])['id']
+    assert json.loads(asgi.chamar(f'/api/imoveis/{id}')['body'])['logradouro'] == 'Rua Nova'
+    
+    assert asgi.chamar('/api/imoveis/999')['status'] == 404
+    linhas = asgi.chamar('/api/imoveis?stream=ndjson')['body'].decode().splitlines()
+    assert len(linhas) == 13
+
+def test_cache_de_respostas(tmp_path, app_factory):
+    """Teste das leituras assíncronas no mesmo cache das leituras WSGI."""
+    app = app_factory(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'asgi.db'}")
+    db.session.add(Imovel(logradouro='Rua 1', cidade='Recife', tipo='casa'))
+    db.session.commit()
+    
+    with executando(AsgiApp(app)) as asgi_app:
+        primeira = asgi_app.chamar('/api/imoveis/cidade/Recife')
+        segunda = asgi_app.chamar('/api/imoveis/cidade/Recife')
+        assert primeira['headers']['x-cache'] == 'MISS'
+        assert segunda['headers']['x-cache'] == 'HIT'
+        assert segunda['body'] == primeira['body']
+        assert asgi_app.chamar('/api/imoveis/1')['headers']['x-cache'] == 'MISS'
+        assert asgi_app.flask_app.test_client().get('/api/imoveis/1').headers['X-Cache'] == 'HIT'
+        
+        # A escrita (atendida pelo Flask) invalida os grupos das leituras assíncronas
+        corpo = json.dumps({'logradouro': 'Rua 2', 'cidade': 'Recife'}).encode()
+        asgi_app.chamar('/api/imoveis', method='POST', body=corpo,
+                        headers={'Content-Type': 'application/json',
+                                 'Content-Length': str(len(corpo))})
+        depois = asgi_app.chamar('/api/imoveis/cidade/Recife')
+        assert depois['headers']['x-cache'] == 'MISS'
+        assert depois['headers']['etag'] != primeira['headers']['etag']
+        assert len(json.loads(depois['body'])['items']) == 2
+
+def test_leituras_nas_replicas(tmp_path, app_factory):
+    """Teste das leituras assíncronas na réplica e da aderência após a escrita."""
+    app = app_factory(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'principal.db'}",
+                      SQLALCHEMY_BINDS={'replica_1': f"sqlite:///{tmp_path / 'replica.db'}"},
+                      RESPONSE_CACHE_BACKEND='null')
+    for chave, cidade in ((None, 'Principal'), ('replica_1', 'Replica')):
+        db.metadata.create_all(db.engines[chave])
+        with db.engines[chave].begin() as conn:
+            conn.execute(insert(Imovel.__table__), [{'logradouro': 'Rua 1', 'cidade': cidade}])
+    
+    with executando(AsgiApp(app)) as asgi_app:
+        def cidade_lida(**headers):
+            return json.loads(asgi_app.chamar('/api/imoveis', headers=headers)['body'])[
+                'items'][0]['cidade']
+        
+        assert cidade_lida() == 'Replica'
+        assert cidade_lida(Cookie=f'db_primary_until={time.time() + 60}') == 'Principal'
+
+def test_replica_indisponivel_sem_bloquear(tmp_path, app_factory, monkeypatch):
+    """Teste da verificação de saúde da réplica pelo engine assíncrono."""
+    app = app_factory(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'principal.db'}",
+                      SQLALCHEMY_BINDS={
+                          'replica_1': f"sqlite:///{tmp_path / 'inexistente' / 'replica.db'}"},
+                      RESPONSE_CACHE_BACKEND='null')
+    db.session.add(Imovel(logradouro='Rua 1', cidade='Principal'))
+    db.session.commit()
+    
+    # A exceção seria tratada como falha da réplica: registrar a chamada
+    sincronas = []
+    monkeypatch.setattr(db.engines['replica_1'], 'connect', lambda: sincronas.append(1))
+    
+    with executando(AsgiApp(app)) as asgi_app:
+        resposta = asgi_app.chamar('/api/imoveis')
+        with app.test_request_context():
+            estado = replicas.info()
+    
+    assert json.loads(resposta['body'])['items'][0]['cidade'] == 'Principal'
+    assert estado[0]['healthy'] is False
+    assert estado[0]['failures'] == 1
+    assert sincronas == []
+
+def test_ganchos_do_flask(tmp_path, app_factory):
+    """Teste do Server-Timing, do /metrics e do log de consultas lentas nas leituras assíncronas."""
+    parser = pytest.importorskip('prometheus_client.parser')
+    app = app_factory(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'asgi.db'}",
+                      RESPONSE_CACHE_BACKEND='null', REQUEST_TIMING=True, METRICS_ENABLED=True,
+                      SLOW_QUERY_LOG=str(tmp_path / 'lentas.jsonl'), SLOW_QUERY_THRESHOLD_MS=0)
+    db.session.add(Imovel(logradouro='Rua 1', cidade='Recife'))
+    db.session.commit()
+    
+    def contagem(texto, status):
+        return sum(amostra.value for familia in parser.text_string_to_metric_families(texto)
+                   for amostra in familia.samples
+                   if amostra.name == 'imobiliaria_http_requests_total'
+                   and amostra.labels == {'method': 'GET', 'endpoint': 'api.get_imovel',
+                                          'status': status})
+    
+    with executando(AsgiApp(app)) as asgi_app:
+        antes = asgi_app.chamar('/metrics')['body'].decode()
+        resposta = asgi_app.chamar('/api/imoveis/1')
+        # O 404 é repassado ao Flask e contado uma única vez
+        asgi_app.chamar('/api/imoveis/999')
+        depois = asgi_app.chamar('/metrics')['body'].decode()
+    
+    assert 'sql;dur=' in resposta['headers']['server-timing']
+    assert 'comandos=0' not in resposta['headers']['server-timing']
+    assert contagem(depois, '200') - contagem(antes, '200') == 1
+    assert contagem(depois, '404') - contagem(antes, '404') == 1
+    ocorrencias = [o for o in ler_ocorrencias(app.config['SLOW_QUERY_LOG'])
+                   if o['endpoint'] == 'api.get_imovel']
+    assert any(o['fingerprint'].startswith('SELECT imoveis.versao') and o['plan']
+               for o in ocorrencias)
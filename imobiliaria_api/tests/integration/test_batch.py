@@ -0,0 +1,111 @@
+import json
+from sqlalchemy import event
+from app.extensions import db
+from app.models.imovel import Imovel
+
+def lote(n, cidade='Recife'):
+    """Gerar n imóveis válidos."""
+    return [{'logradouro': f'Rua {i}', 'cidade': cidade, 'tipo': 'casa', 'valor': 1000.0 * i}
+            for i in range(n)]
+
+def test_criar_lote(client, app):
+    """Teste da criação em lote com um único INSERT."""
+    inserts = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO imoveis'):
+            inserts.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.post('/api/imoveis/batch', data=json.dumps(lote(50)),
+                               content_type='application/json')
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    data = json.loads(response.data)
+    
+    assert response.status_code == 201
+    assert data['count'] == 50
+    assert data['errors'] == {}
+    assert len(inserts) == 1
+    ids = [item['id'] for item in data['created']]
+    assert [item['index'] for item in data['created']] == list(range(50))
+    assert [i.logradouro for i in Imovel.query.order_by(Imovel.id)] == [f'Rua {i}' for i in range(50)]
+    assert ids == [i.id for i in Imovel.query.order_by(Imovel.id)]
+
+def test_criar_lote_sem_returning(client, app, monkeypatch):
+    """Teste da criação em lote nos bancos sem RETURNING em lote (ex.: MySQL)."""
+    client.post('/api/imoveis', json={'logradouro': 'Rua Existente', 'cidade': 'Natal'})
+    monkeypatch.setattr(db.engine.dialect, 'insert_executemany_returning', False)
+    comandos = []
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith('INSERT INTO imoveis'):
+            comandos.append(executemany)
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.post('/api/imoveis/batch', json=lote(20))
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    
+    assert response.status_code == 201
+    # Um único executemany, sem um INSERT por linha
+    assert comandos == [True]
+    ids = {item['index']: item['id'] for item in response.json['created']}
+    assert [db.session.get(Imovel, ids[i]).logradouro for i in range(20)] == \
+        [f'Rua {i}' for i in range(20)]
+
+def test_criar_lote_atomico_com_erro(client):
+    """Teste se o modo atômico não grava nada quando há item inválido."""
+    itens = lote(3)
+    itens[1] = {'cidade': 'Recife'}
+    response = client.post('/api/imoveis/batch', data=json.dumps(itens),
+                           content_type='application/json')
+    data = json.loads(response.data)
+    
+    assert response.status_code == 400
+    assert list(data['errors']) == ['1']
+    assert 'logradouro' in data['errors']['1']
+    assert Imovel.query.count() == 0
+
+def test_criar_lote_parcial(client):
+    """Teste do modo parcial com erros por índice."""
+    itens = lote(4)
+    itens[0]['valor'] = -1
+    itens[2] = 'texto'
+    response = client.post('/api/imoveis/batch?modo=parcial', data=json.dumps({'items': itens}),
+                           content_type='application/json')
+    data = json.loads(response.data)
+    
+    assert response.status_code == 201
+    assert [item['index'] for item in data['created']] == [1, 3]
+    assert set(data['errors']) == {'0', '2'}
+    assert Imovel.query.count() == 2
+
+def test_criar_lote_ndjson(client):
+    """Teste da criação em lote a partir de NDJSON."""
+    corpo = '\n'.join(json.dumps(item) for item in lote(3)) + '\n{quebrado\n'
+    response = client.post('/api/imoveis/batch?modo=parcial', data=corpo,
+                           content_type='application/x-ndjson')
+    data = json.loads(response.data)
+    
+    assert response.status_code == 201
+    assert data['count'] == 3
+    assert list(data['errors']) == ['3']
+
+def test_criar_lote_invalida_cache(client):
+    """Teste se o lote invalida a coleção e as cidades afetadas."""
+    client.get('/api/imoveis/cidade/Recife')
+    client.post('/api/imoveis/batch', data=json.dumps(lote(2)), content_type='application/json')
+    response = client.get('/api/imoveis/cidade/Recife')
+    
+    assert response.headers['X-Cache'] == 'MISS'
+    assert json.loads(response.data)['count'] == 2
+
+def test_criar_lote_invalido(client, app):
+    """Teste de corpos e modos inválidos."""
+    app.config['API_BATCH_MAX_ITEMS'] = 2
+    
+    assert client.post('/api/imoveis/batch', data='{}', content_type='application/json').status_code == 400
+    assert client.post('/api/imoveis/batch', data='[]', content_type='application/json').status_code == 400
+    assert client.post('/api/imoveis/batch', data=json.dumps(lote(3)),
+                       content_type='application/json').status_code == 400
+    assert client.post('/api/imoveis/batch?modo=talvez', data=json.dumps(lote(1)),
+                       content_type='application/json').status_code == 400
@@ -0,0 +1,79 @@
+import json
+from app.models.imovel import Imovel
+
+def patch(client, url, corpo):
+    return client.patch(url, data=json.dumps(corpo), content_type='application/json')
+
+def test_patch_por_filtro(client, imoveis_db):
+    """Teste da atualização em lote pelos filtros da listagem."""
+    response = patch(client, '/api/imoveis?cidade=Curitiba', {'dados': {'valor': 1.5}})
+    data = json.loads(response.data)
+    
+    assert response.status_code == 200
+    assert data['count'] == 4
+    assert {i.valor for i in Imovel.query.filter_by(cidade='Curitiba')} == {1.5}
+    assert all(i.versao == 2 for i in Imovel.query.filter_by(cidade='Curitiba'))
+    assert all(i.valor != 1.5 for i in Imovel.query.filter(Imovel.cidade != 'Curitiba'))
+
+def test_patch_por_ids(client, imoveis_db):
+    """Teste da atualização em lote por lista de IDs."""
+    ids = imoveis_db[:3]
+    response = patch(client, '/api/imoveis', {'ids': ids, 'dados': {'tipo': 'terreno'}})
+    
+    assert json.loads(response.data)['count'] == 3
+    assert sorted(i.id for i in Imovel.query.filter_by(tipo='terreno')) == ids
+
+def test_patch_invalido(client, imoveis_db):
+    """Teste de atualizações em lote inválidas."""
+    # Sem IDs nem filtros
+    assert patch(client, '/api/imoveis', {'dados': {'valor': 1.0}}).status_code == 400
+    # Dados que não passam pelo schema
+    assert patch(client, '/api/imoveis?tipo=casa', {'dados': {'valor': -1}}).status_code == 400
+    # Sem dados
+    assert patch(client, '/api/imoveis?tipo=casa', {}).status_code == 400
+    # IDs inválidos
+    assert patch(client, '/api/imoveis', {'ids': ['x'], 'dados': {'valor': 1.0}}).status_code == 400
+
+def test_patch_mantem_cache_e_etag(client, imoveis_db):
+    """Teste se a atualização em lote invalida cache e ETags afetados."""
+    url = f'/api/imoveis/{imoveis_db[0]}'
+    etag = client.get(url).headers['ETag']
+    client.get('/api/imoveis/cidade/Natal')
+    
+    patch(client, '/api/imoveis', {'ids': [imoveis_db[0]], 'dados': {'cidade': 'Natal'}})
+    
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert json.loads(response.data)['cidade'] == 'Natal'
+    data = json.loads(client.get('/api/imoveis/cidade/Natal').data)
+    assert [item['id'] for item in data['items']] == [imoveis_db[0]]
+
+def test_delete_por_filtro(client, imoveis_db):
+    """Teste da remoção em lote pelos filtros da listagem."""
+    client.get('/api/imoveis/tipo/casa')
+    response = client.delete('/api/imoveis?tipo=casa&cidade=São Paulo')
+    
+    assert json.loads(response.data)['count'] == 2
+    assert Imovel.query.count() == 10
+    data = json.loads(client.get('/api/imoveis/tipo/casa').data)
+    assert all(item['cidade'] != 'São Paulo' for item in data['items'])
+
+def test_delete_por_ids(client, imoveis_db):
+    """Teste da remoção em lote por IDs na query string."""
+    ids = ','.join(map(str, imoveis_db[:5]))
+    response = client.delete(f'/api/imoveis?ids={ids}')
+    
+    assert json.loads(response.data)['count'] == 5
+    assert client.get(f'/api/imoveis/{imoveis_db[0]}').status_code == 404
+
+def test_delete_sem_criterio(client, imoveis_db):
+    """Teste se a remoção em lote exige IDs ou filtros."""
+    assert client.delete('/api/imoveis').status_code == 400
+    assert Imovel.query.count() == 12
+
+def test_listar_imoveis_com_filtros(client, imoveis_db):
+    """Teste dos filtros de igualdade na listagem."""
+    data = json.loads(client.get('/api/imoveis?tipo=casa&cidade=Curitiba').data)
+    
+    assert data['count'] == 2
+    assert all(item['tipo'] == 'casa' and item['cidade'] == 'Curitiba' for item in data['items'])
@@ -0,0 +1,86 @@
+import pytest
+from app.extensions import db
+from app.models.imovel import Imovel
+
+@pytest.fixture
+def enderecos(app):
+    """Imóveis com endereços acentuados para a busca."""
+    imoveis = [
+        Imovel(logradouro='Avenida Paulista', tipo_logradouro='Avenida', bairro='Bela Vista',
+               cidade='São Paulo', tipo='apartamento', valor=900000),
+        Imovel(logradouro='Rua São Paulo', tipo_logradouro='Rua', bairro='Centro',
+               cidade='Curitiba', tipo='casa', valor=300000),
+        Imovel(logradouro='Rua das Flores', tipo_logradouro='Rua', bairro='Jardim Paulistano',
+               cidade='São Paulo', tipo='casa', valor=500000),
+        Imovel(logradouro='Rua Ipiranga', tipo_logradouro='Rua', bairro='Água Verde',
+               cidade='Curitiba', tipo='casa', valor=400000),
+    ]
+    db.session.add_all(imoveis)
+    db.session.commit()
+    return imoveis
+
+def logradouros(response):
+    return [item['logradouro'] for item in response.json['items']]
+
+def test_busca_sem_acentos_e_por_relevancia(client, enderecos):
+    """Teste da busca sem acentos, ordenada por relevância (bm25)."""
+    response = client.get('/api/imoveis/busca?q=sao paulo')
+    
+    assert response.status_code == 200
+    # O logradouro tem o maior peso: "Rua São Paulo" vem antes dos demais
+    assert logradouros(response)[0] == 'Rua São Paulo'
+    assert set(logradouros(response)) == {'Rua São Paulo', 'Avenida Paulista', 'Rua das Flores'}
+    assert response.json['total'] == 3
+
+def test_busca_por_prefixo(client, enderecos):
+    """Teste da última palavra buscada por prefixo e do * explícito."""
+    assert set(logradouros(client.get('/api/imoveis/busca?q=paulis'))) == {
+        'Avenida Paulista', 'Rua das Flores'}
+    assert logradouros(client.get('/api/imoveis/busca?q=agua* curi')) == ['Rua Ipiranga']
+    assert logradouros(client.get('/api/imoveis/busca?q=agua curi')) == ['Rua Ipiranga']
+    assert logradouros(client.get('/api/imoveis/busca?q=agu curi')) == []
+
+def test_busca_ignora_sintaxe_fts(client, enderecos):
+    """Teste de texto com operadores e aspas do FTS5."""
+    response = client.get('/api/imoveis/busca?q=flores" OR NEAR(')
+    
+    assert response.status_code == 200
+
+def test_busca_com_filtros_e_paginacao(client, enderecos):
+    """Teste da busca combinada com filtros e paginada por página."""
+    response = client.get('/api/imoveis/busca?q=rua&tipo=casa&per_page=1&page=2')
+    
+    assert response.status_code == 200
+    assert response.json['total'] == 3
+    assert response.json['count'] == 1
+    assert 'page=3' in response.json['_links']['next']['href']
+    assert 'q=rua' in response.json['_links']['next']['href']
+
+def test_busca_acompanha_escritas(client, enderecos):
+    """Teste dos gatilhos que mantêm o índice ao alterar e remover imóveis."""
+    id_flores = enderecos[2].id
+    client.put(f'/api/imoveis/{id_flores}', json={'logradouro': 'Rua das Palmeiras'})
+    client.delete(f'/api/imoveis/{enderecos[0].id}')
+    
+    assert logradouros(client.get('/api/imoveis/busca?q=palmeiras')) == ['Rua das Palmeiras']
+    assert logradouros(client.get('/api/imoveis/busca?q=flores')) == []
+    assert logradouros(client.get('/api/imoveis/busca?q=avenida')) == []
+
+@pytest.mark.parametrize('query', ['', '?q=', '?q=%20!%20', '?q=rua&after=1'])
+def test_busca_invalida(client, enderecos, query):
+    """Teste da busca sem palavras ou com paginação por cursor."""
+    response = client.get(f'/api/imoveis/busca{query}')
+    
+    assert response.status_code == 400
+
+def test_rebuild_search(runner, enderecos):
+    """Teste do comando que reconstrói o índice."""
+    db.session.execute(db.text("DELETE FROM imoveis_busca"))
+    db.session.commit()
+    
+    result = runner.invoke(args=['rebuild-search'])
+    
+    assert result.exit_code == 0, result.output
+    assert '4 imóveis indexados' in result.output
+    response = runner.app.test_client().get('/api/imoveis/busca?q=ipiranga')
+    assert logradouros(response) == ['Rua Ipiranga']
@@ -0,0 +1,124 @@
+import json
+from app.extensions import db, response_cache
+from app.models.imovel import Imovel
+from app.services.importacao import importar
+
+def test_listar_imoveis_cache_hit(client, imoveis_db):
+    """Teste se a segunda leitura vem do cache com o mesmo corpo."""
+    primeira = client.get('/api/imoveis?limit=5')
+    segunda = client.get('/api/imoveis?limit=5')
+    
+    assert primeira.headers['X-Cache'] == 'MISS'
+    assert segunda.headers['X-Cache'] == 'HIT'
+    assert segunda.data == primeira.data
+    assert segunda.headers['ETag'] == primeira.headers['ETag']
+    assert primeira.mimetype == segunda.mimetype == 'application/json'
+
+def test_parametros_em_outra_ordem(client, imoveis_db):
+    """Teste da mesma entrada e do mesmo ETag com os parâmetros reordenados."""
+    primeira = client.get('/api/imoveis?cidade=Curitiba&limit=2')
+    segunda = client.get('/api/imoveis?limit=2&cidade=Curitiba')
+    
+    assert segunda.headers['X-Cache'] == 'HIT'
+    assert segunda.headers['ETag'] == primeira.headers['ETag']
+    assert client.get('/api/imoveis?limit=2&cidade=Curitiba', headers={
+        'If-None-Match': primeira.headers['ETag']}).status_code == 304
+
+def test_invalidacao_apenas_grupos_afetados(client, imoveis_db):
+    """Teste se a escrita invalida só o imóvel alterado, mas todas as coleções."""
+    urls = ['/api/imoveis', '/api/imoveis/cidade/Curitiba',
+            '/api/imoveis/cidade/Recife', f'/api/imoveis/{imoveis_db[1]}']
+    for url in urls:
+        client.get(url)
+    
+    # Mover um imóvel de São Paulo para Recife
+    client.put(f'/api/imoveis/{imoveis_db[0]}', data=json.dumps({'cidade': 'Recife'}),
+               content_type='application/json')
+    
+    assert client.get('/api/imoveis').headers['X-Cache'] == 'MISS'
+    assert client.get('/api/imoveis/cidade/Recife').headers['X-Cache'] == 'MISS'
+    assert client.get(f'/api/imoveis/{imoveis_db[1]}').headers['X-Cache'] == 'HIT'
+    # O ETag das coleções acompanha a versão da tabela: outra cidade também é gerada de novo
+    assert client.get('/api/imoveis/cidade/Curitiba').headers['X-Cache'] == 'MISS'
+    
+    data = json.loads(client.get('/api/imoveis/cidade/Recife').data)
+    assert [item['id'] for item in data['items']] == [imoveis_db[0]]
+
+def test_delete_invalida_imovel(client, imoveis_db):
+    """Teste se o imóvel removido não é servido pelo cache."""
+    url = f'/api/imoveis/{imoveis_db[0]}'
+    client.get(url)
+    client.delete(url)
+    
+    assert client.get(url).status_code == 404
+    assert client.get('/api/imoveis/cidade/São Paulo').headers['X-Cache'] == 'MISS'
+
+def test_corpo_gravado_apos_invalidacao(app, client, imoveis_db):
+    """Teste do leitor concorrente que grava um corpo antigo depois da invalidação."""
+    client.get('/api/imoveis')
+    with app.test_request_context('/api/imoveis'):
+        chave = response_cache.request_key()
+    backend = app.extensions['response_cache']
+    antigo = backend.get('imoveis', chave)
+    
+    client.put(f'/api/imoveis/{imoveis_db[0]}', data=json.dumps({'valor': 1.5}),
+               content_type='application/json')
+    # O leitor que começou antes da escrita grava o corpo depois do invalidate()
+    backend.set('imoveis', chave, antigo)
+    
+    response = client.get('/api/imoveis')
+    assert response.headers['X-Cache'] == 'MISS'
+    assert json.loads(response.data)['items'][0]['valor'] == 1.5
+
+def test_escrita_de_outro_processo(client, imoveis_db):
+    """Teste de uma importação que não limpa o cache deste processo."""
+    url = f'/api/imoveis/{imoveis_db[0]}'
+    client.get(url)
+    client.get('/api/imoveis')
+    
+    # Como o flask import-data em outro processo: só o banco muda
+    importar([{'id': imoveis_db[0], 'logradouro': 'Rua Importada', 'cidade': 'Natal'}],
+             modo='upsert')
+    
+    response = client.get(url)
+    assert response.headers['X-Cache'] == 'MISS'
+    assert json.loads(response.data)['logradouro'] == 'Rua Importada'
+    assert client.get('/api/imoveis').headers['X-Cache'] == 'MISS'
+
+def test_cache_stats(client, imoveis_db):
+    """Teste do endpoint com os contadores do cache."""
+    antes = json.loads(client.get('/api/cache').data)
+    client.get('/api/imoveis')
+    client.get('/api/imoveis')
+    depois = json.loads(client.get('/api/cache').data)
+    
+    assert depois['backend'] == 'MemoryBackend'
+    assert depois['hits'] - antes['hits'] == 1
+    assert depois['misses'] - antes['misses'] == 1
+
+def test_cache_desligado(client, app, imoveis_db):
+    """Teste das leituras com o cache desligado."""
+    app.extensions['response_cache'] = None
+    response = client.get('/api/imoveis')
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/json'
+    assert 'X-Cache' not in response.headers
+
+def test_bancos_no_mesmo_diretorio(app_factory, tmp_path):
+    """Teste de duas instâncias com bancos diferentes no mesmo diretório de cache."""
+    clientes = []
+    for nome in ('a', 'b'):
+        app = app_factory(SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / f'{nome}.db'}",
+                          RESPONSE_CACHE_BACKEND='file',
+                          RESPONSE_CACHE_DIR=str(tmp_path / 'cache'))
+        # Mesmo id e mesma versão nos dois bancos: o mesmo ETag
+        db.session.add(Imovel(logradouro=f'Rua {nome}', cidade='Natal'))
+        db.session.commit()
+        clientes.append(app.test_client())
+    
+    respostas = [cliente.get('/api/imoveis/1') for cliente in clientes]
+    
+    assert respostas[0].headers['ETag'] == respostas[1].headers['ETag']
+    assert [r.headers['X-Cache'] for r in respostas] == ['MISS', 'MISS']
+    assert [r.json['logradouro'] for r in respostas] == ['Rua a', 'Rua b']
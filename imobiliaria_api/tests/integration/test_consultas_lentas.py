@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import select
+from app.extensions import db
+from app.models.imovel import Imovel
+from app.services.consultas_lentas import fingerprint, ler_ocorrencias, resumir_ocorrencias
+
+@pytest.fixture
+def app_lentas(tmp_path, app_factory):
+    """Aplicação que registra todos os comandos (limite de 0 ms) em um arquivo."""
+    app = app_factory(SLOW_QUERY_LOG=str(tmp_path / 'lentas.jsonl'), SLOW_QUERY_THRESHOLD_MS=0,
+                      SLOW_QUERY_REPEAT_LIMIT=3, RESPONSE_CACHE_BACKEND='null')
+
+    @app.route('/repetida')
+    def repetida():
+        for id in range(1, 6):
+            db.session.execute(select(Imovel.cidade).where(Imovel.id == id)).first()
+        return {}
+
+    db.session.add_all([Imovel(logradouro=f'Rua {i}', cidade='Recife', valor=1000.0 * i)
+                        for i in range(1, 6)])
+    db.session.commit()
+    return app
+
+def ocorrencias_de(app, endpoint):
+    return [o for o in ler_ocorrencias(app.config['SLOW_QUERY_LOG']) if o['endpoint'] == endpoint]
+
+def test_fingerprint():
+    """Teste da normalização de literais, listas do IN e espaços."""
+    assert fingerprint("SELECT * FROM imoveis\n WHERE id IN (?, ?, ?) AND cidade = 'Natal' LIMIT 10") \
+        == 'SELECT * FROM imoveis WHERE id IN (...) AND cidade = ? LIMIT ?'
+    assert fingerprint('SELECT anon_1.id FROM t WHERE x IN (%s, %s)') == \
+        'SELECT anon_1.id FROM t WHERE x IN (...)'
+
+def test_consulta_lenta_com_plano(app_lentas):
+    """Teste do registro com parâmetros, recurso e plano de execução."""
+    client = app_lentas.test_client()
+    assert client.get('/api/imoveis/2').status_code == 200
+    assert client.get('/api/imoveis?valor_min=2500&limit=2').status_code == 200
+
+    por_id = ocorrencias_de(app_lentas, 'api.get_imovel')
+    assert por_id and all(o['resource'] == 'ImovelResource' for o in por_id)
+    versao = next(o for o in por_id if o['fingerprint'].startswith('SELECT imoveis.versao'))
+    assert versao['params'] == [2]
+    assert versao['full_scan'] is False
+    assert any('SEARCH imoveis' in linha for linha in versao['plan'])
+
+    listagem = [o for o in ocorrencias_de(app_lentas, 'api.list_imoveis')
+                if o['fingerprint'].startswith('SELECT imoveis.')]
+    assert listagem and listagem[0]['plan']
+
+def test_varredura_completa(app_lentas):
+    """Teste da marcação de leitura completa da tabela imoveis."""
+    assert app_lentas.test_client().get('/api/imoveis?logradouro=Rua%201').status_code == 200
+
+    assert any(o['full_scan'] for o in ocorrencias_de(app_lentas, 'api.list_imoveis'))
+
+def test_comando_repetido(app_lentas):
+    """Teste da detecção de N+1 e do resumo da linha de comando."""
+    client = app_lentas.test_client()
+    client.get('/repetida')
+    client.get('/repetida')
+
+    repetidas = [o for o in ocorrencias_de(app_lentas, 'repetida') if o['kind'] == 'repeated']
+    assert len(repetidas) == 2
+    assert repetidas[0]['count'] == 4
+
+    resumo = resumir_ocorrencias(ler_ocorrencias(app_lentas.config['SLOW_QUERY_LOG']))
+    grupo = next(g for g in resumo if g['fingerprint'] == repetidas[0]['fingerprint'])
+    assert grupo['repeticoes'] == 2
+    assert grupo['lentas'] == 10
+
+    result = app_lentas.test_cli_runner().invoke(args=['slow-queries', '--limit', '50'])
+    assert result.exit_code == 0, result.output
+    assert 'repetido (N+1) em 2 requisições' in result.output
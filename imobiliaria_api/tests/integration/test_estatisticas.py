@@ -0,0 +1,169 @@
+import os
+import pytest
+from sqlalchemy import select, func, text
+from app.extensions import db
+from app.models.estatisticas import EstatisticaImoveis
+from app.models.imovel import Imovel
+from app.services.estatisticas import estatisticas_valor, recalcular_estatisticas
+from app.services.importacao import importar
+
+AGRUPAMENTOS_TESTADOS = ([], ['cidade'], ['tipo'], ['cidade', 'tipo'])
+
+def resumo():
+    """Linhas da tabela de resumo, em ordem."""
+    return db.session.execute(
+        select(EstatisticaImoveis.cidade, EstatisticaImoveis.tipo, EstatisticaImoveis.quantidade,
+               EstatisticaImoveis.quantidade_valor, EstatisticaImoveis.soma_valor,
+               EstatisticaImoveis.menor_valor, EstatisticaImoveis.maior_valor)
+        .order_by(EstatisticaImoveis.cidade, EstatisticaImoveis.tipo)
+    ).all()
+
+def test_estatisticas_agrupadas(client, imoveis_db):
+    """Teste das estatísticas por cidade e tipo."""
+    response = client.get('/api/imoveis/estatisticas?agrupar=cidade,tipo')
+    
+    assert response.status_code == 200
+    assert response.json['agrupar'] == ['cidade', 'tipo']
+    assert response.json['count'] == 6
+    # Curitiba: i = 2, 8 (casa) e 5, 11 (apartamento)
+    grupo = response.json['items'][1]
+    assert (grupo['cidade'], grupo['tipo']) == ('Curitiba', 'casa')
+    assert grupo['count'] == 2
+    assert grupo['sum'] == 210000.0
+    assert (grupo['min'], grupo['max'], grupo['mean']) == (102000.0, 108000.0, 105000.0)
+    assert 'ETag' in response.headers
+
+def test_estatisticas_gerais_e_por_cidade(client, imoveis_db):
+    """Teste dos totais gerais, de um agrupamento e dos filtros."""
+    geral = client.get('/api/imoveis/estatisticas').json
+    assert geral['items'] == [{
+        'count': 12, 'sum': 1266000.0, 'min': 100000.0, 'max': 111000.0, 'mean': 105500.0}]
+    
+    por_tipo = client.get('/api/imoveis/estatisticas?agrupar=tipo&cidade=Curitiba').json
+    assert [(item['tipo'], item['count']) for item in por_tipo['items']] == [
+        ('apartamento', 2), ('casa', 2)]
+
+def test_estatisticas_agrupamento_invalido(client):
+    """Teste de coluna de agrupamento não aceita."""
+    response = client.get('/api/imoveis/estatisticas?agrupar=cidade,valor')
+    
+    assert response.status_code == 400
+    assert 'agrupar' in response.json['errors']
+
+def test_resumo_acompanha_escritas(client, imoveis_db):
+    """Teste dos gatilhos em inserções, alterações (inclusive em lote) e remoções."""
+    client.get('/api/imoveis/estatisticas')
+    response = client.post('/api/imoveis', json={'logradouro': 'Avenida Atlântica',
+                                                  'cidade': 'Rio de Janeiro'})
+    assert response.status_code == 201
+    client.patch('/api/imoveis?cidade=Curitiba', json={'dados': {'valor': 1.0}})
+    client.delete(f'/api/imoveis/{imoveis_db[0]}')
+    db.session.execute(db.update(Imovel).where(Imovel.id == imoveis_db[1])
+                       .values(cidade='Curitiba', tipo='casa'))
+    db.session.commit()
+    
+    incremental = resumo()
+    recalcular_estatisticas()
+    assert incremental == resumo()
+    
+    # Imóvel sem tipo e sem valor: grupo próprio, sem soma nem média
+    grupos = estatisticas_valor(['cidade', 'tipo'], {'cidade': 'Rio de Janeiro'})
+    assert grupos[0] == {'cidade': 'Rio de Janeiro', 'tipo': None, 'count': 1,
+                         'sum': None, 'min': None, 'max': None, 'mean': None}
+    # O cache da resposta anterior não sobrevive às escritas
+    total = client.get('/api/imoveis/estatisticas').json['items'][0]['count']
+    assert total == db.session.execute(select(func.count()).select_from(Imovel)).scalar()
+
+def test_extremos_removidos(app):
+    """Teste da releitura do mínimo e do máximo ao remover os extremos."""
+    imoveis = [Imovel(logradouro=f'Rua {valor}', cidade='Curitiba', tipo='casa', valor=valor)
+               for valor in (10.0, 20.0, 30.0)]
+    db.session.add_all(imoveis)
+    db.session.commit()
+    db.session.delete(imoveis[0])
+    db.session.delete(imoveis[2])
+    db.session.commit()
+    
+    assert resumo() == [('Curitiba', 'casa', 1, 1, 20.0, 20.0, 20.0)]
+    
+    db.session.delete(imoveis[1])
+    db.session.commit()
+    assert resumo() == []
+
+def test_extremos_no_grupo_sem_tipo(client, runner):
+    """Teste dos extremos do grupo '' com imóveis de tipo vazio e sem tipo."""
+    def criar(valor, **tipo):
+        return client.post('/api/imoveis', json={'logradouro': f'Rua {valor}', 'cidade': 'Natal',
+                                                 'valor': valor, **tipo}).json['id']
+    
+    def comparar_com_rebuild():
+        incremental = resumo()
+        assert runner.invoke(args=['rebuild-stats']).exit_code == 0
+        assert incremental == resumo()
+        return incremental
+    
+    maior = criar(100.0, tipo='')
+    criar(50.0, tipo='')
+    sem_tipo = criar(500.0)
+    criar(10.0)
+    
+    # Os extremos estavam em linhas com o outro "tipo" do grupo
+    client.delete(f'/api/imoveis/{sem_tipo}')
+    assert comparar_com_rebuild() == [('Natal', '', 3, 3, 160.0, 10.0, 100.0)]
+    client.delete(f'/api/imoveis/{maior}')
+    assert comparar_com_rebuild() == [('Natal', '', 2, 2, 60.0, 10.0, 50.0)]
+
+def test_rebuild_stats(app, runner, imoveis_db):
+    """Teste do comando que recalcula o resumo."""
+    db.session.execute(db.delete(EstatisticaImoveis))
+    db.session.commit()
+    
+    result = runner.invoke(args=['rebuild-stats'])
+    
+    assert result.exit_code == 0
+    assert '6 grupos' in result.output
+    assert sum(row.quantidade for row in resumo()) == 12
+
+def por_agregacao_direta(monkeypatch, agrupar):
+    """Estatísticas pela agregação da tabela imoveis (bancos sem os gatilhos)."""
+    with monkeypatch.context() as m:
+        m.setattr('app.services.estatisticas.DIALETOS_RESUMO', ())
+        return estatisticas_valor(agrupar)
+
+def test_agregacao_direta_igual_ao_resumo(app, imoveis_db, monkeypatch):
+    """Teste da consulta dos bancos sem resumo contra a tabela de resumo."""
+    db.session.add(Imovel(logradouro='Rua Sem Tipo', cidade='Natal'))
+    db.session.commit()
+    
+    for agrupar in AGRUPAMENTOS_TESTADOS:
+        assert por_agregacao_direta(monkeypatch, agrupar) == estatisticas_valor(agrupar)
+
+@pytest.mark.skipif(not os.environ.get('MYSQL_TEST_URL'),
+                    reason='Defina MYSQL_TEST_URL (banco MySQL descartável) para testar os gatilhos')
+def test_resumo_mysql(app_factory, monkeypatch):
+    """Teste dos gatilhos do resumo no MySQL, inclusive na importação sem gatilhos."""
+    app = app_factory(
+        SQLALCHEMY_DATABASE_URI=os.environ['MYSQL_TEST_URL'].replace('mysql://', 'mysql+pymysql://', 1),
+        RESPONSE_CACHE_BACKEND='null')
+    # Começar de um banco vazio, mesmo que uma execução anterior tenha sido interrompida
+    db.drop_all()
+    db.create_all()
+    try:
+        client = app.test_client()
+        ids = [client.post('/api/imoveis', json={
+            'logradouro': f'Rua {i}', 'cidade': ('Recife', 'Natal')[i % 2],
+            'tipo': ('casa', 'apartamento', None)[i % 3], 'valor': 1000.0 * i}).json['id']
+            for i in range(1, 10)]
+        client.put(f'/api/imoveis/{ids[0]}', json={'valor': 50000.0})
+        client.patch('/api/imoveis?cidade=Natal', json={'dados': {'tipo': 'casa'}})
+        client.delete(f'/api/imoveis/{ids[8]}')
+        for agrupar in AGRUPAMENTOS_TESTADOS:
+            assert estatisticas_valor(agrupar) == por_agregacao_direta(monkeypatch, agrupar)
+        
+        importar([{'logradouro': 'Rua Importada', 'cidade': 'Natal', 'valor': 1.0}])
+        assert db.session.execute(text('SELECT @imoveis_carga')).scalar() is None
+        assert estatisticas_valor(['cidade']) == [
+            {'cidade': 'Natal', 'count': 1, 'sum': 1.0, 'min': 1.0, 'max': 1.0, 'mean': 1.0}]
+    finally:
+        db.session.rollback()
+        db.drop_all()
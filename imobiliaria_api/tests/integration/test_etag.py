@@ -0,0 +1,84 @@
+import json
+from sqlalchemy import event
+from app.extensions import db
+
+def test_listar_imoveis_etag_304(client, imoveis_db):
+    """Teste se a listagem responde 304 sem consultar os imóveis."""
+    response = client.get('/api/imoveis')
+    etag = response.headers['ETag']
+    
+    consultas = []
+    def before_cursor_execute(conn, cursor, statement, *args):
+        consultas.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        response = client.get('/api/imoveis', headers={'If-None-Match': etag})
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+    assert not any('FROM imoveis' in consulta for consulta in consultas)
+
+def test_etag_muda_apos_escrita(client, imoveis_db):
+    """Teste se POST, PUT e DELETE invalidam os ETags da coleção."""
+    etag = client.get('/api/imoveis/tipo/casa').headers['ETag']
+    escritas = [
+        lambda: client.post('/api/imoveis', data=json.dumps({'logradouro': 'Rua Nova', 'cidade': 'Recife'}),
+                            content_type='application/json'),
+        lambda: client.put(f'/api/imoveis/{imoveis_db[0]}', data=json.dumps({'valor': 1.0}),
+                           content_type='application/json'),
+        lambda: client.delete(f'/api/imoveis/{imoveis_db[1]}'),
+    ]
+    
+    for escrita in escritas:
+        assert escrita().status_code < 300
+        response = client.get('/api/imoveis/tipo/casa', headers={'If-None-Match': etag})
+        assert response.status_code == 200
+        etag = response.headers['ETag']
+
+def test_obter_imovel_etag_por_linha(client, imoveis_db):
+    """Teste se o ETag de um imóvel só muda quando ele é alterado."""
+    url = f'/api/imoveis/{imoveis_db[0]}'
+    etag = client.get(url).headers['ETag']
+    
+    # Alterar outro imóvel não invalida o ETag
+    client.put(f'/api/imoveis/{imoveis_db[1]}', data=json.dumps({'valor': 1.0}),
+               content_type='application/json')
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+    
+    client.put(url, data=json.dumps({'valor': 2.0}), content_type='application/json')
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert json.loads(response.data)['valor'] == 2.0
+
+def test_etag_depende_da_representacao(client, imoveis_db):
+    """Teste se páginas e formatos diferentes têm ETags diferentes."""
+    etags = {
+        client.get('/api/imoveis').headers['ETag'],
+        client.get('/api/imoveis?limit=2').headers['ETag'],
+        client.get('/api/imoveis', headers={'Accept': 'application/x-ndjson'}).headers['ETag'],
+    }
+    
+    assert len(etags) == 3
+
+def test_obter_imovel_inexistente_sem_etag(client):
+    """Teste se um ID inexistente continua respondendo 404."""
+    assert client.get('/api/imoveis/999', headers={'If-None-Match': '*'}).status_code == 404
+
+def test_etag_de_id_reutilizado(client):
+    """Teste se um imóvel que reutiliza o ID de outro removido não herda o ETag."""
+    criar = lambda logradouro: client.post(
+        '/api/imoveis', data=json.dumps({'logradouro': logradouro, 'cidade': 'Recife'}),
+        content_type='application/json')
+    imovel_id = criar('Rua Antiga').json['id']
+    etag = client.get(f'/api/imoveis/{imovel_id}').headers['ETag']
+    
+    client.delete(f'/api/imoveis/{imovel_id}')
+    # Sem AUTOINCREMENT, o SQLite reutiliza o maior ID removido
+    assert criar('Rua Nova').json['id'] == imovel_id
+    
+    response = client.get(f'/api/imoveis/{imovel_id}', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.json['logradouro'] == 'Rua Nova'
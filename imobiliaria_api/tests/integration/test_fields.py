@@ -0,0 +1,47 @@
+from app.api.resources.imoveis import sparse_serializer
+
+def test_fields_na_colecao(client, imoveis_db):
+    """Teste dos campos pedidos em ?fields=, sempre com o ID."""
+    response = client.get('/api/imoveis?fields=valor,cidade&limit=5')
+    
+    assert response.status_code == 200
+    items = response.json['items']
+    assert len(items) == 5
+    assert all(set(item) == {'id', 'valor', 'cidade'} for item in items)
+    # A paginação por cursor continua funcionando com o ID
+    assert f'after={imoveis_db[4]}' in response.json['_links']['next']['href']
+    assert 'fields=valor' in response.json['_links']['next']['href']
+
+def test_fields_com_links(client, imoveis_db):
+    """Teste de _links pedido entre os campos."""
+    items = client.get('/api/imoveis?fields=tipo,_links').json['items']
+    
+    assert set(items[0]) == {'id', 'tipo', '_links'}
+    assert items[0]['_links']['self']['href'].endswith(f'/api/imoveis/{items[0]["id"]}')
+
+def test_fields_invalido(client, imoveis_db):
+    """Teste de campo inexistente no schema."""
+    response = client.get('/api/imoveis?fields=valor,versao')
+    
+    assert response.status_code == 400
+    assert 'versao' in response.json['errors']['fields'][0]
+
+def test_fields_em_um_imovel_e_no_streaming(client, imoveis_db):
+    """Teste de ?fields= no GET de um imóvel e no streaming."""
+    response = client.get(f'/api/imoveis/{imoveis_db[0]}?fields=cep')
+    assert response.json == {'id': imoveis_db[0], 'cep': '01000-000'}
+    assert client.get('/api/imoveis/999999?fields=cep').status_code == 404
+    
+    response = client.get('/api/imoveis/cidade/Curitiba?fields=tipo&stream=ndjson')
+    linhas = response.get_data(as_text=True).splitlines()
+    assert len(linhas) == 4
+    assert '"cidade"' not in linhas[0]
+
+def test_serializador_por_conjunto_de_campos(client, imoveis_db):
+    """Teste do serializador compilado uma única vez por conjunto de campos."""
+    client.get('/api/imoveis?fields=valor,tipo')
+    client.get('/api/imoveis?fields=tipo,valor,id')
+    
+    serializer = sparse_serializer(('id', 'tipo', 'valor'))
+    assert {coluna.key for coluna in serializer.columns} == {'id', 'tipo', 'valor'}
+    assert sparse_serializer.cache_info().hits >= 2
@@ -0,0 +1,97 @@
+import pytest
+
+def cidades_e_valores(response):
+    return [(item['cidade'], item['valor']) for item in response.json['items']]
+
+def test_filtro_faixa_valor(client, imoveis_db):
+    """Teste dos limites inclusivos de valor."""
+    response = client.get('/api/imoveis?valor_min=103000&valor_max=105000')
+    
+    assert response.status_code == 200
+    assert [item['valor'] for item in response.json['items']] == [103000.0, 104000.0, 105000.0]
+
+def test_filtro_faixa_data(client, imoveis_db):
+    """Teste do filtro por data de aquisição, mantendo o formato AAAA-MM-DD."""
+    response = client.get('/api/imoveis?adquirido_de=2020-01-10&adquirido_ate=2020-01-12')
+    
+    assert response.status_code == 200
+    assert [item['data_aquisicao'] for item in response.json['items']] == [
+        '2020-01-10', '2020-01-11', '2020-01-12']
+
+def test_filtro_faixa_combinado_com_rota(client, imoveis_db):
+    """Teste da faixa de valor combinada com a rota por cidade e a paginação."""
+    response = client.get('/api/imoveis/cidade/Curitiba?valor_min=105000&limit=2')
+    
+    assert cidades_e_valores(response) == [('Curitiba', 105000.0), ('Curitiba', 108000.0)]
+    assert 'valor_min=105000' in response.json['_links']['next']['href']
+
+@pytest.mark.parametrize('query, campo', [
+    ('valor_min=abc', 'valor_min'),
+    ('valor_max=-1', 'valor_max'),
+    ('adquirido_de=31/01/2020', 'adquirido_de'),
+    ('valor_min=10&valor_max=5', 'valor_max'),
+    ('adquirido_de=2020-02-01&adquirido_ate=2020-01-01', 'adquirido_ate'),
+])
+def test_filtro_faixa_invalido(client, imoveis_db, query, campo):
+    """Teste dos erros de validação dos filtros por faixa."""
+    response = client.get(f'/api/imoveis?{query}')
+    
+    assert response.status_code == 400
+    assert campo in response.json['errors']
+
+def test_data_aquisicao_validada(client):
+    """Teste da validação de data_aquisicao na criação."""
+    response = client.post('/api/imoveis', json={
+        'logradouro': 'Rua Nova', 'cidade': 'Recife', 'data_aquisicao': '2020-02-30'})
+    
+    assert response.status_code == 400
+    assert 'data_aquisicao' in response.json['errors']
+
+def test_data_aquisicao_ida_e_volta(client):
+    """Teste se a data enviada volta no mesmo formato."""
+    response = client.post('/api/imoveis', json={
+        'logradouro': 'Rua Nova', 'cidade': 'Recife', 'data_aquisicao': '2021-12-31'})
+    
+    assert response.status_code == 201
+    assert response.json['data_aquisicao'] == '2021-12-31'
+    assert client.get(f"/api/imoveis/{response.json['id']}").json['data_aquisicao'] == '2021-12-31'
+
+@pytest.mark.parametrize('prefixo, quantidade', [
+    ('0100', 12),
+    ('01003', 1),
+    ('01001-0', 2),
+    ('8', 0),
+])
+def test_filtro_prefixo_cep(client, imoveis_db, prefixo, quantidade):
+    """Teste do prefixo do CEP, com ou sem a formatação."""
+    response = client.get(f'/api/imoveis?cep_prefixo={prefixo}&limit=50')
+    
+    assert response.status_code == 200
+    assert response.json['count'] == quantidade
+
+def test_filtro_prefixo_cep_terminado_em_9(client, imoveis_db):
+    """Teste do limite superior quando o prefixo termina em 9 ('0199' -> '02')."""
+    for cep in ('01999-999', '02000-000', '99999999'):
+        client.post('/api/imoveis', json={'logradouro': 'Rua Nova', 'cidade': 'Curitiba', 'cep': cep})
+    
+    assert [item['cep'] for item in client.get('/api/imoveis?cep_prefixo=0199').json['items']] == [
+        '01999-999']
+    assert [item['cep'] for item in client.get('/api/imoveis?cep_prefixo=999').json['items']] == [
+        '99999999']
+
+def test_filtro_bairro_combinado(client, imoveis_db):
+    """Teste do bairro combinado com a cidade e o prefixo do CEP."""
+    client.post('/api/imoveis', json={'logradouro': 'Rua Nova', 'cidade': 'Curitiba',
+                                      'bairro': 'Batel', 'cep': '80420-090'})
+    
+    response = client.get('/api/imoveis?bairro=Batel&cidade=Curitiba&cep_prefixo=804')
+    assert [item['bairro'] for item in response.json['items']] == ['Batel']
+    assert client.get('/api/imoveis?bairro=Batel&cidade=Londrina').json['count'] == 0
+    assert client.get('/api/imoveis/cidade/Curitiba?bairro=Centro').json['count'] == 4
+
+def test_filtro_prefixo_cep_invalido(client, imoveis_db):
+    """Teste de prefixo com letras."""
+    response = client.get('/api/imoveis?cep_prefixo=80a')
+    
+    assert response.status_code == 400
+    assert 'cep_prefixo' in response.json['errors']
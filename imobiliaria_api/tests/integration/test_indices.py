@@ -0,0 +1,89 @@
+import os
+import pytest
+from sqlalchemy import event, inspect
+from app.extensions import db
+
+@pytest.fixture
+def consultas_sql(app):
+    """Capturar os SELECTs executados durante as requisições."""
+    consultas = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith('SELECT'):
+            consultas.append((statement, parameters))
+    
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    yield consultas
+    event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+
+def plano_de_consulta(statement, parameters):
+    """Executar EXPLAIN QUERY PLAN e devolver os passos do plano."""
+    with db.engine.connect() as conn:
+        rows = conn.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters).fetchall()
+    return [row[-1] for row in rows]
+
+def test_indices_criados(app):
+    """Teste se os índices dos filtros existem na tabela."""
+    indices = {index['name'] for index in inspect(db.engine).get_indexes('imoveis')}
+    
+    assert {'ix_imoveis_cidade', 'ix_imoveis_tipo',
+            'ix_imoveis_cidade_tipo', 'ix_imoveis_cidade_valor',
+            'ix_imoveis_valor', 'ix_imoveis_data_aquisicao',
+            'ix_imoveis_bairro', 'ix_imoveis_cep_digitos'} <= indices
+
+@pytest.mark.parametrize('url', [
+    '/api/imoveis?after=3',
+    '/api/imoveis/tipo/casa',
+    '/api/imoveis/tipo/casa?after=3',
+    '/api/imoveis/cidade/Curitiba',
+    '/api/imoveis/cidade/Curitiba?before=10',
+    '/api/imoveis/1',
+])
+def test_consultas_usam_indice(client, imoveis_db, consultas_sql, url):
+    """Teste se cada consulta dos recursos usa um índice e não ordena em memória."""
+    response = client.get(url)
+    
+    assert response.status_code == 200
+    assert consultas_sql
+    for statement, parameters in list(consultas_sql):
+        plano = plano_de_consulta(statement, parameters)
+        assert any('USING' in passo for passo in plano), plano
+        assert not any('TEMP B-TREE' in passo for passo in plano), plano
+
+@pytest.mark.parametrize('url, indice', [
+    ('/api/imoveis?valor_min=105000&valor_max=106000', 'ix_imoveis_valor'),
+    ('/api/imoveis?adquirido_de=2020-01-05&adquirido_ate=2020-01-06', 'ix_imoveis_data_aquisicao'),
+    ('/api/imoveis?cep_prefixo=01003', 'ix_imoveis_cep_digitos'),
+    ('/api/imoveis?bairro=Centro', 'ix_imoveis_bairro'),
+])
+def test_filtros_faixa_usam_indice(client, imoveis_db, consultas_sql, url, indice):
+    """Teste se os filtros por faixa fazem uma busca por faixa no índice."""
+    client.get(url)
+    
+    planos = [plano_de_consulta(*consulta) for consulta in consultas_sql]
+    assert any(f'USING INDEX {indice}' in passo for plano in planos for passo in plano), planos
+
+def test_listagem_sem_ordenacao_em_memoria(client, imoveis_db, consultas_sql):
+    """Teste se a primeira página percorre a chave primária já ordenada."""
+    client.get('/api/imoveis')
+    
+    for statement, parameters in list(consultas_sql):
+        plano = plano_de_consulta(statement, parameters)
+        assert not any('TEMP B-TREE' in passo for passo in plano), plano
+
+def test_migracoes_criam_indices(tmp_path):
+    """Teste se as migrações criam a tabela e os índices em um banco novo."""
+    from flask_migrate import upgrade, downgrade
+    from app import create_app
+    
+    app = create_app('testing')
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path / 'migracao.db'}"
+    diretorio = os.path.join(os.path.dirname(__file__), '..', '..', 'migrations')
+    
+    with app.app_context():
+        upgrade(directory=diretorio)
+        indices = {index['name'] for index in inspect(db.engine).get_indexes('imoveis')}
+        assert {'ix_imoveis_cidade_tipo', 'ix_imoveis_valor', 'ix_imoveis_data_aquisicao'} <= indices
+        
+        downgrade(directory=diretorio, revision='0001')
+        assert inspect(db.engine).get_indexes('imoveis') == []
@@ -0,0 +1,113 @@
+import os
+import subprocess
+import sys
+import textwrap
+import pytest
+from app.extensions import db
+from app.models.imovel import Imovel
+
+parser = pytest.importorskip('prometheus_client.parser')
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture
+def app_metricas(app_factory):
+    """Aplicação de testes com o /metrics ligado e sem cache de respostas."""
+    app = app_factory(METRICS_ENABLED=True, RESPONSE_CACHE_BACKEND='null')
+    db.session.add_all([Imovel(logradouro=f'Rua {i}', cidade='Recife',
+                               tipo='casa' if i % 3 else 'apartamento', valor=1000.0 * i)
+                        for i in range(1, 7)])
+    db.session.commit()
+    return app
+
+def amostras(texto):
+    """Texto do /metrics -> {(nome, rótulos ordenados): valor}."""
+    return {(amostra.name, tuple(sorted(amostra.labels.items()))): amostra.value
+            for familia in parser.text_string_to_metric_families(texto)
+            for amostra in familia.samples}
+
+def valor(medidas, nome, **rotulos):
+    return medidas.get((nome, tuple(sorted(rotulos.items()))), 0.0)
+
+def test_metricas_requisicoes(app_metricas):
+    """Teste do total por status, do histograma e das requisições em andamento."""
+    client = app_metricas.test_client()
+    # As métricas são do processo: comparar com os valores antes das requisições
+    antes = amostras(client.get('/metrics').get_data(as_text=True))
+
+    client.get('/api/imoveis?limit=2')
+    client.get('/api/imoveis/1')
+    client.get('/api/imoveis/999')
+    response = client.get('/metrics')
+
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    depois = amostras(response.get_data(as_text=True))
+
+    def delta(nome, **rotulos):
+        return valor(depois, nome, **rotulos) - valor(antes, nome, **rotulos)
+
+    total = 'imobiliaria_http_requests_total'
+    assert delta(total, method='GET', endpoint='api.list_imoveis', status='200') == 1
+    assert delta(total, method='GET', endpoint='api.get_imovel', status='200') == 1
+    assert delta(total, method='GET', endpoint='api.get_imovel', status='404') == 1
+    assert delta('imobiliaria_http_request_duration_seconds_count',
+                 method='GET', endpoint='api.get_imovel') == 2
+    assert delta('imobiliaria_http_request_duration_seconds_bucket',
+                 method='GET', endpoint='api.get_imovel', le='+Inf') == 2
+    assert valor(depois, 'imobiliaria_http_requests_in_progress',
+                 method='GET', endpoint='api.get_imovel') == 0
+    assert valor(depois, 'imobiliaria_http_requests_in_progress',
+                 method='GET', endpoint='metrics') == 1
+
+def test_metricas_imoveis_por_tipo(app_metricas):
+    """Teste da contagem de imóveis, guardada por METRICS_ROWS_TTL."""
+    client = app_metricas.test_client()
+
+    medidas = amostras(client.get('/metrics').get_data(as_text=True))
+    assert valor(medidas, 'imobiliaria_imoveis', tipo='casa') == 4
+    assert valor(medidas, 'imobiliaria_imoveis', tipo='apartamento') == 2
+
+    db.session.add(Imovel(logradouro='Rua Nova', cidade='Natal', tipo='casa'))
+    db.session.commit()
+    medidas = amostras(client.get('/metrics').get_data(as_text=True))
+    assert valor(medidas, 'imobiliaria_imoveis', tipo='casa') == 4
+
+    app_metricas.extensions.pop('metricas_linhas')
+    medidas = amostras(client.get('/metrics').get_data(as_text=True))
+    assert valor(medidas, 'imobiliaria_imoveis', tipo='casa') == 5
+
+def test_metricas_desligado(client):
+    """Teste da configuração padrão (sem o endpoint)."""
+    assert client.get('/metrics').status_code == 404
+
+def test_metricas_multiprocesso(tmp_path):
+    """Teste da soma entre processos pelo diretório do modo multiprocesso."""
+    script = textwrap.dedent('''
+        import sys
+        from app import create_app
+        from app.extensions import db
+
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            client = app.test_client()
+            for _ in range(int(sys.argv[1])):
+                client.get('/api/imoveis')
+            sys.stdout.write(client.get('/metrics').get_data(as_text=True))
+    ''')
+    env = dict(os.environ, METRICS_ENABLED='1', PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+
+    def executar(requisicoes):
+        resultado = subprocess.run([sys.executable, '-c', script, str(requisicoes)], cwd=RAIZ,
+                                   env=env, capture_output=True, text=True, timeout=60)
+        assert resultado.returncode == 0, resultado.stderr
+        return amostras(resultado.stdout)
+
+    executar(3)
+    medidas = executar(2)
+
+    assert valor(medidas, 'imobiliaria_http_requests_total',
+                 method='GET', endpoint='api.list_imoveis', status='200') == 5
+    assert valor(medidas, 'imobiliaria_http_request_duration_seconds_count',
+                 method='GET', endpoint='api.list_imoveis') == 5
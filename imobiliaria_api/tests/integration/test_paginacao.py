@@ -0,0 +1,87 @@
+import json
+import pytest
+
+def test_listar_imoveis_primeira_pagina(client, imoveis_db):
+    """Teste da primeira página por cursor."""
+    response = client.get('/api/imoveis?limit=5')
+    data = json.loads(response.data)
+    
+    assert response.status_code == 200
+    assert data['count'] == 5
+    assert [item['id'] for item in data['items']] == imoveis_db[:5]
+    assert 'first' in data['_links']
+    assert 'next' in data['_links']
+    assert 'prev' not in data['_links']
+    assert f'after={imoveis_db[4]}' in data['_links']['next']['href']
+
+def test_listar_imoveis_percorre_cursor(client, imoveis_db):
+    """Teste se os links next/prev percorrem toda a coleção."""
+    ids = []
+    url = '/api/imoveis?limit=5'
+    while url:
+        data = json.loads(client.get(url).data)
+        ids.extend(item['id'] for item in data['items'])
+        url = data['_links'].get('next', {}).get('href')
+    
+    assert ids == imoveis_db
+    
+    # Voltar uma página a partir da última
+    prev = data['_links']['prev']['href']
+    data = json.loads(client.get(prev).data)
+    assert [item['id'] for item in data['items']] == imoveis_db[5:10]
+
+def test_listar_imoveis_limite_maximo(client, app, imoveis_db):
+    """Teste se o tamanho da página é limitado pela configuração."""
+    app.config['API_PAGE_SIZE_MAX'] = 3
+    data = json.loads(client.get('/api/imoveis?limit=1000').data)
+    
+    assert data['count'] == 3
+
+def test_listar_imoveis_modo_offset(client, imoveis_db):
+    """Teste do modo de paginação por página para clientes antigos."""
+    response = client.get('/api/imoveis?page=2&per_page=5')
+    data = json.loads(response.data)
+    
+    assert response.status_code == 200
+    assert data['total'] == 12
+    assert [item['id'] for item in data['items']] == imoveis_db[5:10]
+    assert 'page=3' in data['_links']['next']['href']
+    assert 'page=1' in data['_links']['prev']['href']
+    assert 'page=3' in data['_links']['last']['href']
+
+def test_listar_imoveis_por_tipo_paginado(client, imoveis_db):
+    """Teste se os filtros são preservados nos links de paginação."""
+    data = json.loads(client.get('/api/imoveis/tipo/casa?limit=2').data)
+    
+    assert data['count'] == 2
+    assert all(item['tipo'] == 'casa' for item in data['items'])
+    assert '/api/imoveis/tipo/casa' in data['_links']['next']['href']
+
+@pytest.mark.parametrize('query', ['limit=0', 'limit=abc', 'after=-1', 'after=1&before=5', 'page=0'])
+def test_listar_imoveis_paginacao_invalida(client, query):
+    """Teste de parâmetros de paginação inválidos."""
+    response = client.get(f'/api/imoveis?{query}')
+    
+    assert response.status_code == 400
+
+def test_listar_imoveis_links_collection(client, imoveis_db):
+    """Teste do modo ?links=collection com o bloco _templates."""
+    data = json.loads(client.get('/api/imoveis?links=collection&limit=2').data)
+    
+    assert all('_links' not in item for item in data['items'])
+    assert data['_templates']['self']['href'].endswith('/api/imoveis/{id}')
+    assert data['_templates']['self']['templated'] is True
+    assert data['_templates']['filtrar_por_cidade']['href'].endswith('/api/imoveis/cidade/{cidade}')
+    assert 'links=collection' in data['_links']['next']['href']
+
+def test_listar_imoveis_links_none(client, imoveis_db):
+    """Teste do modo ?links=none."""
+    data = json.loads(client.get('/api/imoveis?links=none').data)
+    
+    assert all('_links' not in item for item in data['items'])
+    assert '_templates' not in data
+    assert '_links' in data
+
+def test_listar_imoveis_links_invalido(client):
+    """Teste de valor inválido para ?links=."""
+    assert client.get('/api/imoveis?links=todos').status_code == 400
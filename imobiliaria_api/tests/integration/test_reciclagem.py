@@ -0,0 +1,67 @@
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import time
+import pytest
+
+pytest.importorskip('gunicorn')
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def porta_livre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+@pytest.fixture
+def gunicorn_threaded(tmp_path):
+    """Gunicorn no modo threaded, com 1 worker reciclado a cada 5 requisições."""
+    porta = porta_livre()
+    env = dict(os.environ, DATABASE_URL=f"sqlite:///{tmp_path / 'reciclagem.db'}",
+               RESPONSE_CACHE_DIR=str(tmp_path / 'cache'), FLASK_ENV='production',
+               GUNICORN_MODE='threaded', GUNICORN_WORKERS='1',
+               GUNICORN_MAX_REQUESTS='5', GUNICORN_MAX_REQUESTS_JITTER='0')
+    processo = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', 'gunicorn.conf.py',
+                                 '--bind', f'127.0.0.1:{porta}', '--keep-alive', '1',
+                                 '--log-level', 'warning'], cwd=RAIZ, env=env)
+    fim = time.monotonic() + 30
+    while True:
+        assert processo.poll() is None, 'O gunicorn terminou antes de responder'
+        try:
+            socket.create_connection(('127.0.0.1', porta), timeout=1).close()
+            break
+        except OSError:
+            assert time.monotonic() < fim, 'O gunicorn não respondeu a tempo'
+            time.sleep(0.2)
+    yield porta
+    processo.terminate()
+    processo.wait(timeout=30)
+
+def test_reciclagem_sem_derrubar_conexoes_keep_alive(gunicorn_threaded):
+    """Teste se a reciclagem por max_requests responde a quem reutiliza uma conexão keep-alive."""
+    conexoes = [http.client.HTTPConnection('127.0.0.1', gunicorn_threaded, timeout=30)
+                for _ in range(4)]
+    erros, fechadas = [], 0
+    # 3 reciclagens; as 4 conexões ficam abertas e ociosas entre os usos
+    for n in range(20):
+        numero = n % len(conexoes)
+        conn = conexoes[numero]
+        try:
+            conn.request('GET', '/nao-existe')
+            resposta = conn.getresponse()
+            resposta.read()
+            assert resposta.status == 404
+        except (OSError, http.client.HTTPException) as err:
+            erros.append(repr(err))
+        if conn.sock is None:
+            # Connection: close (ou erro): o cliente reconecta
+            fechadas += 1
+            conexoes[numero] = http.client.HTTPConnection('127.0.0.1', gunicorn_threaded,
+                                                         timeout=30)
+    for conn in conexoes:
+        conn.close()
+
+    assert erros == []
+    assert fechadas > 0
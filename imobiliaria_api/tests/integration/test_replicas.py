@@ -0,0 +1,100 @@
+import pytest
+from flask import g
+from sqlalchemy import insert, select, func
+from app.extensions import db, replicas
+from app.models.imovel import Imovel
+
+def criar_app(app_factory, tmp_path, *replicas_urls):
+    """Aplicação com um banco principal e réplicas em arquivos SQLite separados."""
+    return app_factory(
+        SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'principal.db'}",
+        SQLALCHEMY_BINDS={f'replica_{n}': url for n, url in enumerate(replicas_urls, start=1)},
+        RESPONSE_CACHE_BACKEND='null',
+        REPLICA_HEALTH_INTERVAL=0,
+    )
+
+def popular(engine, cidade, quantidade):
+    """Cria a tabela no banco e insere imóveis da cidade informada."""
+    db.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Imovel.__table__), [
+            {'logradouro': f'Rua {i}', 'cidade': cidade, 'tipo': 'casa'} for i in range(quantidade)])
+
+@pytest.fixture
+def app_replicas(app_factory, tmp_path):
+    app = criar_app(app_factory, tmp_path,
+                    f"sqlite:///{tmp_path / 'replica1.db'}", f"sqlite:///{tmp_path / 'replica2.db'}")
+    popular(db.engines[None], 'Principal', 1)
+    popular(db.engines['replica_1'], 'Replica1', 2)
+    popular(db.engines['replica_2'], 'Replica2', 3)
+    return app
+
+def cidade_lida(client, **kwargs):
+    response = client.get('/api/imoveis', **kwargs)
+    assert response.status_code == 200
+    return response.json['items'][0]['cidade']
+
+def test_leituras_em_rodizio(app_replicas):
+    """Teste da distribuição dos GETs entre as réplicas."""
+    client = app_replicas.test_client()
+    
+    lidas = [cidade_lida(client) for _ in range(4)]
+    
+    assert sorted(lidas) == ['Replica1', 'Replica1', 'Replica2', 'Replica2']
+    assert lidas[0] != lidas[1]
+
+def test_escrita_no_principal_e_aderencia(app_replicas, imovel_teste):
+    """Teste da escrita no principal e da leitura das próprias escritas."""
+    client = app_replicas.test_client()
+    dados = {k: v for k, v in imovel_teste.items() if k not in ('numero', 'complemento', 'estado')}
+    
+    response = client.post('/api/imoveis', json=dados)
+    
+    assert response.status_code == 201
+    assert 'db_primary_until' in response.headers['Set-Cookie']
+    assert db.session.execute(select(func.count()).select_from(Imovel)).scalar() == 2
+    # O cliente que escreveu lê do principal; outro cliente continua na réplica
+    assert cidade_lida(client) == 'Principal'
+    assert cidade_lida(app_replicas.test_client()).startswith('Replica')
+
+def test_escrita_ignora_replica_da_requisicao(app_replicas):
+    """Teste do roteamento de INSERT para o principal mesmo com réplica escolhida."""
+    with app_replicas.test_request_context():
+        g.db_bind = 'replica_1'
+        assert db.session.execute(select(Imovel.cidade)).scalar() == 'Replica1'
+        db.session.execute(insert(Imovel.__table__).values(logradouro='Rua X', cidade='Nova'))
+        db.session.commit()
+    
+    with db.engines[None].connect() as conn:
+        assert conn.execute(select(func.count()).select_from(Imovel)).scalar() == 2
+
+def test_replica_indisponivel(app_factory, tmp_path):
+    """Teste da exclusão de uma réplica que falha na verificação de saúde."""
+    app = criar_app(app_factory, tmp_path,
+                    f"sqlite:///{tmp_path / 'inexistente' / 'replica.db'}",
+                    f"sqlite:///{tmp_path / 'replica2.db'}")
+    popular(db.engines[None], 'Principal', 1)
+    popular(db.engines['replica_2'], 'Replica2', 1)
+    client = app.test_client()
+    
+    assert [cidade_lida(client) for _ in range(3)] == ['Replica2'] * 3
+    estado = {r['bind']: r for r in replicas.info()}
+    assert estado['replica_1']['healthy'] is False
+    assert estado['replica_1']['failures'] == 1
+    assert estado['replica_2']['reads'] == 3
+
+def test_sem_replicas_usa_principal(client):
+    """Teste do comportamento padrão, sem réplicas configuradas."""
+    with client.application.test_request_context():
+        assert replicas.escolher() is None
+
+def test_endpoint_pool_com_replicas(app_replicas):
+    """Teste do estado das réplicas no endpoint do pool."""
+    client = app_replicas.test_client()
+    cidade_lida(client)
+    
+    response = client.get('/api/pool')
+    
+    assert set(response.json) == {'default', 'replica_1', 'replica_2'}
+    assert response.json['replica_1']['healthy'] is True
+    assert response.json['replica_1']['reads'] + response.json['replica_2']['reads'] == 1
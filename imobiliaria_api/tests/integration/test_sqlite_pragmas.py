@@ -0,0 +1,54 @@
+import logging
+import pytest
+from app.config import ProductionConfig, sqlite_pragmas
+from app.extensions import db
+
+@pytest.fixture
+def app_arquivo(tmp_path, app_factory):
+    """Aplicação de produção usando um banco SQLite em arquivo."""
+    return app_factory(ProductionConfig, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'teste.db'}",
+                       RESPONSE_CACHE_BACKEND='memory')
+
+def pragma(nome):
+    return db.session.execute(db.text(f'PRAGMA {nome}')).scalar()
+
+def test_pragmas_aplicados_em_novas_conexoes(app_arquivo):
+    """Teste do perfil de produção em um banco em arquivo."""
+    with app_arquivo.app_context():
+        assert pragma('journal_mode') == 'wal'
+        assert pragma('synchronous') == 1  # NORMAL
+        assert pragma('busy_timeout') == 15000
+        assert pragma('mmap_size') == 1024 * 1024 * 1024
+        assert pragma('temp_store') == 2  # MEMORY
+
+def test_pragmas_registrados_no_log(app_factory, tmp_path, monkeypatch, caplog):
+    """Teste do log com os valores efetivos na inicialização."""
+    caplog.set_level(logging.INFO, logger='app')
+    # O fileConfig das migrações (test_indices) desativa os loggers existentes
+    monkeypatch.setattr(logging.getLogger('app'), 'disabled', False)
+    
+    app_factory(ProductionConfig, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'teste.db'}",
+                RESPONSE_CACHE_BACKEND='memory')
+    
+    assert 'journal_mode=wal' in caplog.text
+    assert 'busy_timeout=15000' in caplog.text
+
+def test_pragmas_testing(app):
+    """Teste do perfil do banco em memória usado nos testes."""
+    assert pragma('synchronous') == 0  # OFF
+    assert pragma('busy_timeout') == 1000
+
+def test_sqlite_pragmas_variaveis_de_ambiente(monkeypatch):
+    """Teste da sobrescrita e desativação de pragmas pelo ambiente."""
+    monkeypatch.setenv('SQLITE_MMAP_SIZE', '0')
+    monkeypatch.setenv('SQLITE_JOURNAL_MODE', '')
+    
+    assert sqlite_pragmas(journal_mode='WAL', mmap_size=1024, busy_timeout=10) == {
+        'mmap_size': '0', 'busy_timeout': 10}
+
+def test_pragma_invalido(app_factory, tmp_path):
+    """Teste de valor de pragma que não pode ser aplicado com segurança."""
+    with pytest.raises(ValueError):
+        app_factory(ProductionConfig, SQLALCHEMY_DATABASE_URI=f"sqlite:///{tmp_path / 'teste.db'}",
+                    RESPONSE_CACHE_BACKEND='memory',
+                    SQLITE_PRAGMAS={'journal_mode': 'WAL; DROP TABLE imoveis'})
@@ -0,0 +1,47 @@
+import json
+import pytest
+
+def test_listar_imoveis_ndjson(client, app, imoveis_db):
+    """Teste do streaming NDJSON escolhido pelo cabeçalho Accept."""
+    app.config['API_PAGE_SIZE_MAX'] = 3
+    response = client.get('/api/imoveis', headers={'Accept': 'application/x-ndjson'})
+    linhas = response.data.decode().splitlines()
+    
+    assert response.status_code == 200
+    assert response.mimetype == 'application/x-ndjson'
+    assert [json.loads(linha)['id'] for linha in linhas] == imoveis_db
+    assert '_links' in json.loads(linhas[0])
+
+def test_listar_imoveis_stream_json(client, app, imoveis_db):
+    """Teste do JSON em partes com ?stream=1, igual à coleção paginada."""
+    app.config['API_STREAM_CHUNK_SIZE'] = 5
+    response = client.get('/api/imoveis?stream=1', buffered=False)
+    partes = list(response.response)
+    data = json.loads(b''.join(partes))
+    
+    assert response.mimetype == 'application/json'
+    assert len(partes) > 3
+    assert data['count'] == 12
+    assert [item['id'] for item in data['items']] == imoveis_db
+    assert data['items'] == json.loads(client.get('/api/imoveis').data)['items']
+    assert 'self' in data['_links']
+
+def test_listar_imoveis_por_cidade_stream(client, imoveis_db):
+    """Teste do streaming com filtro, cursor e modo de links."""
+    response = client.get(f'/api/imoveis/cidade/Curitiba?stream=1&links=collection&after={imoveis_db[5]}')
+    data = json.loads(response.data)
+    
+    assert data['count'] == 2
+    assert all(item['cidade'] == 'Curitiba' and '_links' not in item for item in data['items'])
+    assert '_templates' in data
+
+def test_listar_imoveis_stream_vazio(client):
+    """Teste do streaming de uma coleção vazia."""
+    data = json.loads(client.get('/api/imoveis?stream=json').data)
+    
+    assert data['count'] == 0
+    assert data['items'] == []
+
+def test_listar_imoveis_stream_invalido(client):
+    """Teste de valor inválido para ?stream=."""
+    assert client.get('/api/imoveis?stream=xml').status_code == 400
@@ -0,0 +1,61 @@
+import json
+import logging
+import re
+import pytest
+from app.extensions import db
+from app.models.imovel import Imovel
+
+@pytest.fixture
+def app_tempos(app_factory):
+    """Aplicação de testes com REQUEST_TIMING ligado e sem cache de respostas."""
+    app = app_factory(REQUEST_TIMING=True, RESPONSE_CACHE_BACKEND='null')
+    db.session.add_all([Imovel(logradouro=f'Rua {i}', cidade='Recife', tipo='casa',
+                               valor=100000.0 + i) for i in range(5)])
+    db.session.commit()
+    return app
+
+def fases(response):
+    """Server-Timing -> {fase: (duração, descrição)}."""
+    resultado = {}
+    for parte in response.headers['Server-Timing'].split(', '):
+        nome, dur, *desc = parte.split(';')
+        resultado[nome] = (float(dur.removeprefix('dur=')), desc[0] if desc else None)
+    return resultado
+
+def test_server_timing_colecao(app_tempos, caplog, monkeypatch):
+    """Teste do cabeçalho e da linha de log em uma listagem."""
+    # O fileConfig das migrações (Alembic) desativa os loggers já existentes
+    monkeypatch.setattr(app_tempos.logger, 'disabled', False)
+    with caplog.at_level(logging.INFO, logger=app_tempos.logger.name):
+        response = app_tempos.test_client().get('/api/imoveis?limit=3')
+
+    assert response.status_code == 200
+    medidas = fases(response)
+    assert list(medidas) == ['sql', 'dump', 'links', 'json', 'total']
+    assert re.fullmatch(r'desc="comandos=[1-9]\d*"', medidas['sql'][1])
+    assert medidas['total'][0] >= medidas['sql'][0] + medidas['dump'][0]
+
+    registro = json.loads(caplog.records[-1].getMessage().removeprefix('tempos '))
+    assert registro['endpoint'] == 'api.list_imoveis'
+    assert registro['status'] == 200
+    assert registro['sql_count'] == int(medidas['sql'][1][len('desc="comandos='):-1])
+    assert set(registro) >= {'total_ms', 'sql_ms', 'dump_ms', 'links_ms', 'json_ms'}
+
+def test_server_timing_escrita_e_erro(app_tempos):
+    """Teste do cabeçalho em um POST e em um 404."""
+    client = app_tempos.test_client()
+
+    response = client.post('/api/imoveis', json={'logradouro': 'Rua Nova', 'cidade': 'Natal'})
+    assert response.status_code == 201
+    assert fases(response)['sql'][1] != 'desc="comandos=0"'
+
+    response = client.get('/api/imoveis/999')
+    assert response.status_code == 404
+    assert 'Server-Timing' in response.headers
+
+def test_server_timing_desligado(client):
+    """Teste da configuração padrão (sem medição)."""
+    response = client.get('/api/imoveis')
+
+    assert response.status_code == 200
+    assert 'Server-Timing' not in response.headers
@@ -0,0 +1,92 @@
+import os
+import time
+import pytest
+from app.services.cache import MemoryBackend, FileBackend
+
+@pytest.fixture(params=['memory', 'file'])
+def backend(request, tmp_path):
+    """Backends de cache com limites pequenos."""
+    if request.param == 'memory':
+        return MemoryBackend(ttl=60, max_entries=3, max_bytes=1024)
+    return FileBackend(str(tmp_path), ttl=60, max_entries=3, max_bytes=1024)
+
+def test_backend_get_set(backend):
+    """Teste de leitura e escrita de uma entrada."""
+    backend.set('imoveis', 'a', b'corpo')
+    
+    assert backend.get('imoveis', 'a') == b'corpo'
+    assert backend.get('imoveis', 'b') is None
+
+def test_backend_delete_group(backend):
+    """Teste se a invalidação remove apenas as entradas do grupo."""
+    backend.set('cidade:Recife', 'a', b'1')
+    backend.set('cidade:Recife', 'b', b'2')
+    backend.set('cidade:Natal', 'a', b'3')
+    backend.delete_group('cidade:Recife')
+    
+    assert backend.get('cidade:Recife', 'a') is None
+    assert backend.get('cidade:Recife', 'b') is None
+    assert backend.get('cidade:Natal', 'a') == b'3'
+
+def test_backend_ttl(backend):
+    """Teste se entradas expiradas não são devolvidas."""
+    backend.ttl = -1
+    backend.set('imoveis', 'a', b'corpo')
+    
+    assert backend.get('imoveis', 'a') is None
+
+def test_memory_backend_lru():
+    """Teste da expulsão LRU por quantidade e por tamanho."""
+    backend = MemoryBackend(ttl=60, max_entries=2, max_bytes=10)
+    backend.set('g', 'a', b'1')
+    backend.set('g', 'b', b'2')
+    backend.get('g', 'a')
+    backend.set('g', 'c', b'3')
+    
+    assert backend.get('g', 'b') is None
+    assert backend.get('g', 'a') == b'1'
+    
+    backend.set('g', 'd', b'123456789')
+    assert backend.info()['bytes'] <= 10
+    assert backend.info()['evictions'] == 2
+
+def test_file_backend_limite(tmp_path):
+    """Teste se o backend em arquivos respeita o limite de entradas."""
+    backend = FileBackend(str(tmp_path), ttl=60, max_entries=5, max_bytes=1024)
+    for i in range(100):
+        backend.set('g', str(i), b'x')
+        time.sleep(0.001)
+    
+    assert backend.info()['entries'] <= 5
+    assert backend.get('g', '99') == b'x'
+
+def test_file_backend_grupo_invalidado_na_contagem(tmp_path, monkeypatch):
+    """Teste se a contagem ignora um grupo invalidado por outro worker durante a listagem."""
+    backend = FileBackend(str(tmp_path), ttl=60, max_entries=5, max_bytes=1024)
+    backend.set('a', '1', b'x')
+    backend.set('b', '1', b'y')
+    scandir = os.scandir
+
+    def listar(path):
+        entradas = list(scandir(path))
+        if path == str(tmp_path):
+            # Primeiro passo da invalidação: a pasta do grupo sai do lugar
+            os.rename(backend._path('a'), backend._path('a') + '.del-1')
+        return entradas
+
+    monkeypatch.setattr(os, 'scandir', listar)
+    assert backend.info()['entries'] == 1
+
+def test_file_backend_grupo_invalidado_na_gravacao(tmp_path, monkeypatch):
+    """Teste se a gravação desiste, sem erro, quando a pasta do grupo é invalidada no meio."""
+    backend = FileBackend(str(tmp_path), ttl=60, max_entries=5, max_bytes=1024)
+
+    def makedirs(path, exist_ok=False):
+        # A pasta existia no mkdir, mas já foi renomeada no isdir
+        raise FileExistsError(path)
+
+    monkeypatch.setattr(os, 'makedirs', makedirs)
+    backend.set('g', '1', b'x')
+    monkeypatch.undo()
+
+    assert backend.get('g', '1') is None
@@ -0,0 +1,43 @@
+import pytest
+from flask import url_for
+from app.api.utils.hypermedia import HypermediaBuilder
+
+def links_com_url_for(resource_id, tipo, cidade):
+    """Links montados diretamente com url_for, como referência."""
+    return {
+        'self': {'href': url_for('api.get_imovel', id=resource_id, _external=True), 'method': 'GET'},
+        'update': {'href': url_for('api.update_imovel', id=resource_id, _external=True), 'method': 'PUT'},
+        'delete': {'href': url_for('api.delete_imovel', id=resource_id, _external=True), 'method': 'DELETE'},
+        'collection': {'href': url_for('api.list_imoveis', _external=True), 'method': 'GET'},
+        'filtrar_por_tipo': {'href': url_for('api.list_imoveis_by_tipo', tipo=tipo, _external=True), 'method': 'GET'},
+        'filtrar_por_cidade': {'href': url_for('api.list_imoveis_by_cidade', cidade=cidade, _external=True), 'method': 'GET'},
+    }
+
+@pytest.mark.parametrize('tipo, cidade', [
+    ('casa', 'São Paulo'),
+    ('casa em condominio', 'Rio de Janeiro'),
+    ('a/b?c#d%e', '{cidade}'),
+])
+def test_add_links_igual_url_for(app, tipo, cidade):
+    """Teste se os links gerados por modelo são idênticos aos do url_for."""
+    with app.test_request_context('/api/imoveis', base_url='http://exemplo.com:8080'):
+        resource = {'id': 42, 'tipo': tipo, 'cidade': cidade}
+        HypermediaBuilder.add_links(resource, 42, 'imoveis')
+        
+        assert resource['_links'] == links_com_url_for(42, tipo, cidade)
+
+def test_add_links_sem_tipo(app):
+    """Teste se imóveis sem tipo não recebem link de filtro por tipo."""
+    with app.test_request_context('/api/imoveis'):
+        resource = HypermediaBuilder.add_links({'id': 1, 'tipo': None, 'cidade': 'Curitiba'}, 1, 'imoveis')
+        
+        assert 'filtrar_por_tipo' not in resource['_links']
+        assert 'filtrar_por_cidade' in resource['_links']
+
+def test_parse_links_mode_invalido(app):
+    """Teste de modo de links desconhecido."""
+    from marshmallow import ValidationError
+    
+    with app.test_request_context('/api/imoveis?links=todos'):
+        with pytest.raises(ValidationError):
+            HypermediaBuilder.parse_links_mode()
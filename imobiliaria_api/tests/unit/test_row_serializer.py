@@ -0,0 +1,35 @@
+from datetime import date
+from sqlalchemy import select
+from app.extensions import db
+from app.models.imovel import Imovel
+from app.api.schemas import ImovelSchema, RowSerializer
+
+def test_row_serializer_igual_ao_schema(app):
+    """Teste se o serializador compilado produz a mesma saída do ImovelSchema."""
+    db.session.add_all([
+        Imovel(logradouro='Rua Completa', tipo_logradouro='Rua', bairro='Centro',
+               cidade='São Paulo', cep='01001-000', tipo='casa',
+               valor=500000.5, data_aquisicao=date(2020, 1, 31)),
+        Imovel(logradouro='Rua Parcial', cidade='Curitiba', valor=100000),
+        Imovel(logradouro='Rua Vazia', cidade='Recife', tipo='', valor=0),
+    ])
+    db.session.commit()
+    
+    schema = ImovelSchema()
+    serializer = RowSerializer(schema, Imovel)
+    
+    esperado = ImovelSchema(many=True).dump(Imovel.query.order_by(Imovel.id).all())
+    rows = db.session.execute(select(*serializer.columns).order_by(Imovel.id)).all()
+    obtido = serializer.dump_many(rows)
+    
+    assert obtido == esperado
+    assert [list(item) for item in obtido] == [list(item) for item in esperado]
+    assert all(type(a['valor']) is type(b['valor']) for a, b in zip(obtido, esperado))
+    assert obtido[0]['data_aquisicao'] == '2020-01-31'
+
+def test_row_serializer_ignora_campos_sem_coluna():
+    """Teste se campos sem coluna no modelo (como _links) não são selecionados."""
+    serializer = RowSerializer(ImovelSchema(), Imovel)
+    
+    assert Imovel.id in serializer.columns
+    assert all(coluna.key != '_links' for coluna in serializer.columns)
@@ -0,0 +1,5 @@
+import os
+from app import create_app
+
+# Aplicação WSGI de produção: gunicorn -c gunicorn.conf.py
+app = create_app(os.environ.get('FLASK_ENV', 'production'))